@@ -4,12 +4,18 @@ Loads configuration from environment variables with sensible defaults.
 Uses pydantic-settings for validation and type safety.
 """
 
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Content type directories under the content library
+CONTENT_TYPES = ("blog", "video", "podcast", "social", "research", "content-plans", "website-content")
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -30,20 +36,38 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Argon2id cost (OWASP baseline: 19 MiB, 2 iterations, 1 lane); raise
+    # per host when login latency allows
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456
+    ARGON2_PARALLELISM: int = 1
+
     # CORS
-    ALLOWED_ORIGINS: List[str] = [
+    ALLOWED_ORIGINS: Tuple[str, ...] = (
         "http://localhost:3000",
         "http://127.0.0.1:3000",
         "http://frontend:3000",
-    ]
+    )
 
     # Pagination
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 200
 
+    # fsync each content file before swapping it in, so a saved item
+    # survives power loss; turn off only where that doesn't matter (tests)
+    DURABLE_WRITES: bool = True
+
     # Export
     EXPORT_CLEANUP_HOURS: int = 1
     MAX_EXPORT_ITEMS: int = 1000
+    # Worker processes for rendering DOCX reports. 1 (the default) renders
+    # in-process; more starts a spawn process pool on the first export over
+    # DOCX_CHUNK_SIZE items, which only pays off on hosts that regularly
+    # export thousands of items (0 = one per CPU)
+    DOCX_RENDER_WORKERS: int = 1
+    # Worker processes for parsing markdown during index rebuilds (0 = one
+    # per CPU; 1 parses in-process)
+    INDEX_PARSE_WORKERS: int = 0
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -52,21 +76,63 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once.
+
+    Use as a FastAPI dependency (``Depends(get_settings)``) in routers so
+    tests can swap settings via ``app.dependency_overrides``.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 
-# Ensure required directories exist
 def ensure_directories():
-    """Create required directories if they don't exist."""
-    settings.CONTENT_LIBRARY_PATH.mkdir(parents=True, exist_ok=True)
+    """Create required directories if they don't exist.
+
+    Called once from the application lifespan. Existing content type
+    directories are detected with a single scandir so only missing ones
+    cost a mkdir syscall.
+    """
     settings.EXPORTS_PATH.mkdir(parents=True, exist_ok=True)
-    (settings.EXPORTS_PATH / "templates").mkdir(parents=True, exist_ok=True)
+    (settings.EXPORTS_PATH / "templates").mkdir(exist_ok=True)
+
+    content_library = settings.CONTENT_LIBRARY_PATH
+    if content_library.is_dir():
+        with os.scandir(content_library) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+    else:
+        content_library.mkdir(parents=True, exist_ok=True)
+        existing = set()
 
     # Create content type directories
-    content_types = ["blog", "video", "podcast", "social", "research", "content-plans", "website-content"]
-    for content_type in content_types:
-        (settings.CONTENT_LIBRARY_PATH / content_type).mkdir(parents=True, exist_ok=True)
+    for content_type in CONTENT_TYPES:
+        if content_type not in existing:
+            (content_library / content_type).mkdir(exist_ok=True)
+
+
+def ensure_dir(path: "str | os.PathLike[str]") -> str:
+    """Create a directory (and parents) the first time a path is seen.
+
+    Later calls for the same path skip the mkdir syscall entirely, so
+    callers that write into it must recreate the directory themselves if
+    it can be removed at runtime (see ``write_content_file`` and
+    ``export_service._write_export_file``).
+
+    Args:
+        path: Directory path (str or Path; both share one cache entry)
+
+    Returns:
+        The path as a str, for use inline
+    """
+    return _ensure_dir(os.fspath(path))
 
 
-ensure_directories()
+@lru_cache(maxsize=64)
+def _ensure_dir(path: str) -> str:
+    """Create ``path`` once per process (see ``ensure_dir``)."""
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -10,6 +10,151 @@ from pathlib import Path
 from app.config import settings
 
 
+# Per-connection tuning. journal_mode=WAL persists in the database file, but
+# synchronous/cache/temp_store/mmap settings must be reapplied on every
+# connection, so every sqlite3.connect site should call apply_pragmas().
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA foreign_keys=ON;
+    PRAGMA busy_timeout=5000;
+"""
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply performance PRAGMAs to a freshly opened SQLite connection.
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        The same connection, for chaining
+    """
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+# Secondary indexes on content_items (name -> columns). Kept in one place so
+# bulk reindexing can drop them and recreate them identically afterwards.
+# Listings are ordered by (updated_date, id), so the equality filters carry
+# those columns too: a filtered page walks the index in order and stops at
+# LIMIT instead of sorting every match.
+CONTENT_INDEXES = {
+    "idx_updated": "updated_date, id",
+    "idx_content_type_updated": "content_type, updated_date, id",
+    "idx_status_updated": "status, updated_date, id",
+    # content_type rides along so a client + type filter is checked from the
+    # index (and counted without touching the table)
+    "idx_client_updated_type": "client, updated_date, id, content_type",
+    "idx_created_date": "created_date",
+    "idx_publish_date": "publish_date",
+    # Serves the author filter dropdown (SELECT DISTINCT author)
+    "idx_author": "author",
+}
+
+# Earlier indexes superseded by the composite ones above
+LEGACY_CONTENT_INDEXES = ("idx_content_type", "idx_status", "idx_client", "idx_client_updated")
+
+
+def create_content_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create the secondary indexes on content_items if missing."""
+    for index_name, column in CONTENT_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON content_items({column})")
+
+
+def drop_content_indexes(cursor: sqlite3.Cursor) -> None:
+    """Drop the secondary indexes on content_items (used around bulk loads)."""
+    for index_name in CONTENT_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+# Triggers keeping content_fts in sync with content_items (name -> body).
+# The delete trigger also drops the item's tag/category rows, so removing an
+# item is one statement. Bulk reindexing drops them and rebuilds the FTS
+# index (and clears the junction tables) in one pass instead.
+CONTENT_FTS_TRIGGERS = {
+    "content_items_ai": """AFTER INSERT ON content_items BEGIN
+            INSERT INTO content_fts (rowid, title, description, body, tags)
+            VALUES (new.rowid, new.title, new.description, new.body, new.tags);
+        END""",
+    "content_items_ad": """AFTER DELETE ON content_items BEGIN
+            INSERT INTO content_fts (content_fts, rowid, title, description, body, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.body, old.tags);
+            DELETE FROM content_tags WHERE content_id = old.id;
+            DELETE FROM content_categories WHERE content_id = old.id;
+        END""",
+    "content_items_au": """AFTER UPDATE ON content_items BEGIN
+            INSERT INTO content_fts (content_fts, rowid, title, description, body, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.body, old.tags);
+            INSERT INTO content_fts (rowid, title, description, body, tags)
+            VALUES (new.rowid, new.title, new.description, new.body, new.tags);
+        END""",
+}
+
+
+def create_fts_triggers(cursor: sqlite3.Cursor) -> None:
+    """Create the content_fts sync triggers, replacing outdated definitions."""
+    existing = dict(cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'content_items'"
+    ).fetchall())
+    for trigger_name, body in CONTENT_FTS_TRIGGERS.items():
+        sql = f"CREATE TRIGGER {trigger_name} {body}"
+        if existing.get(trigger_name) == sql:
+            continue
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+        cursor.execute(sql)
+
+
+def drop_fts_triggers(cursor: sqlite3.Cursor) -> None:
+    """Drop the content_fts sync triggers (used around bulk loads)."""
+    for trigger_name in CONTENT_FTS_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+
+def _backfill_junction_tables(cursor: sqlite3.Cursor) -> None:
+    """Populate empty tag/category tables from the legacy JSON columns."""
+    for table, column, json_column in (
+        ("content_tags", "tag", "tags_json"),
+        ("content_categories", "category", "categories_json"),
+    ):
+        cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        if cursor.fetchone():
+            continue
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {table} (content_id, {column}, position)
+            SELECT content_items.id, json_each.value, json_each.key
+            FROM content_items, json_each(content_items.{json_column})
+            WHERE content_items.{json_column} IS NOT NULL
+        """)
+
+
+def _migrate_standalone_fts(cursor: sqlite3.Cursor) -> bool:
+    """
+    Replace a pre-trigger standalone content_fts table, if present.
+
+    Body text only lived in the old FTS table, so it is copied onto
+    content_items (along with space-joined tags) before the table is dropped.
+
+    Returns:
+        True if an old table was dropped and the new index needs a rebuild
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'content_fts'")
+    row = cursor.fetchone()
+    if row is None or "content_items" in row[0]:
+        return False
+
+    cursor.execute("""
+        UPDATE content_items SET
+            body = (SELECT body FROM content_fts WHERE content_fts.id = content_items.id LIMIT 1),
+            tags = (SELECT group_concat(value, ' ') FROM json_each(content_items.tags_json))
+    """)
+    cursor.execute("DROP TABLE content_fts")
+    return True
+
+
 def create_content_index_db():
     """Create content metadata index database with FTS5 support."""
     db_path = settings.DATABASE_URL.replace("sqlite:///", "")
@@ -17,6 +162,7 @@ def create_content_index_db():
     db_file.parent.mkdir(parents=True, exist_ok=True)
 
     conn = sqlite3.connect(db_file)
+    apply_pragmas(conn)
     cursor = conn.cursor()
 
     # Create main content metadata table
@@ -37,52 +183,62 @@ def create_content_index_db():
             categories_json TEXT,
             tags_json TEXT,
             custom_fields_json TEXT,
-            body_preview TEXT,
+            body TEXT,
+            tags TEXT,
             last_indexed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
 
-    # Create indexes for common queries
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_content_type
-        ON content_items(content_type)
-    """)
-
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_status
-        ON content_items(status)
-    """)
+    # Columns added after the initial schema (indexed by content_fts)
+    cursor.execute("PRAGMA table_info(content_items)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column in ("body", "tags"):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE content_items ADD COLUMN {column} TEXT")
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_created_date
-        ON content_items(created_date)
-    """)
+    # body_preview was never read; the full body column (shared with
+    # content_fts as its external content) replaced it
+    if "body_preview" in existing_columns:
+        cursor.execute("ALTER TABLE content_items DROP COLUMN body_preview")
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_publish_date
-        ON content_items(publish_date)
-    """)
+    # Create indexes for common queries
+    for index_name in LEGACY_CONTENT_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    create_content_indexes(cursor)
 
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_client
-        ON content_items(client)
-    """)
+    # Normalized tag/category tables so list and filter queries avoid
+    # parsing the *_json columns. position preserves the original order.
+    for table, column in (("content_tags", "tag"), ("content_categories", "category")):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                content_id TEXT NOT NULL,
+                {column} TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (content_id, {column})
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})")
+    _backfill_junction_tables(cursor)
 
-    # Create FTS5 virtual table for full-text search
-    # Note: This is a standalone FTS table, not linked to content_items
-    # Index is managed manually by search_service.py
+    # Create FTS5 virtual table for full-text search. It is an external
+    # content table over content_items (body/tags columns), kept in sync
+    # by triggers so the text is stored once and never drifts.
+    fts_migrated = _migrate_standalone_fts(cursor)
     cursor.execute("""
         CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
-            id UNINDEXED,
             title,
             description,
             body,
-            tags
+            tags,
+            content='content_items',
+            content_rowid='rowid'
         )
     """)
 
-    # Note: FTS index is managed manually by search_service.py
-    # Triggers are not used to avoid complexity with body content syncing
+    create_fts_triggers(cursor)
+
+    if fts_migrated:
+        cursor.execute("INSERT INTO content_fts (content_fts) VALUES ('rebuild')")
 
     conn.commit()
     conn.close()
@@ -97,6 +253,7 @@ def create_users_db():
     db_file.parent.mkdir(parents=True, exist_ok=True)
 
     conn = sqlite3.connect(db_file)
+    apply_pragmas(conn)
     cursor = conn.cursor()
 
     # Create users table
@@ -113,11 +270,9 @@ def create_users_db():
         )
     """)
 
-    # Create indexes
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_user_email
-        ON users(email)
-    """)
+    # Create indexes. Email lookups use the UNIQUE constraint's own index;
+    # a separate idx_user_email only duplicated it and slowed every write.
+    cursor.execute("DROP INDEX IF EXISTS idx_user_email")
 
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_user_role
@@ -130,6 +285,62 @@ def create_users_db():
     print(f"[OK] Users database created at {db_file}")
 
 
+# Rows sampled per index when gathering missing statistics, so the first
+# ANALYZE of a large library stays fast (statistics are approximate)
+ANALYSIS_LIMIT = 1000
+
+
+def _analyze_unanalyzed_tables(conn: sqlite3.Connection) -> None:
+    """ANALYZE indexed tables that have no planner statistics yet.
+
+    PRAGMA optimize only revisits tables the current connection has
+    queried, so a database filled incrementally would otherwise never get
+    statistics. Without them SQLite can't use skip-ahead DISTINCT, and the
+    filter dropdowns read every index entry instead of one per value.
+    """
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    analyzed = (
+        {row[0] for row in conn.execute("SELECT DISTINCT tbl FROM sqlite_stat1")}
+        if has_stats else set()
+    )
+    tables = [
+        row[0] for row in conn.execute(
+            "SELECT DISTINCT tbl_name FROM sqlite_master"
+            " WHERE type = 'index' AND sql IS NOT NULL"
+        )
+        if row[0] not in analyzed
+    ]
+    if not tables:
+        return
+
+    conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+    for table in tables:
+        conn.execute(f'ANALYZE "{table}"')
+    conn.commit()
+
+
+def optimize_databases():
+    """Run PRAGMA optimize on both databases to refresh query planner stats.
+
+    Tables that were never analyzed are analyzed first. Cheap when
+    statistics are already current, so it is safe to call on startup,
+    shutdown and periodically from a background task.
+    """
+    for db_url in (settings.DATABASE_URL, settings.USERS_DATABASE_URL):
+        db_file = Path(db_url.replace("sqlite:///", ""))
+        if not db_file.exists():
+            continue
+
+        conn = sqlite3.connect(db_file)
+        try:
+            _analyze_unanalyzed_tables(conn)
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+
+
 async def init_database():
     """Initialize all required databases.
 
@@ -7,6 +7,7 @@ import sqlite3
 from pathlib import Path
 
 from app.config import settings
+from app.db.init_db import apply_pragmas, create_content_indexes
 
 
 def migrate_add_client_column():
@@ -19,6 +20,7 @@ def migrate_add_client_column():
         return
 
     conn = sqlite3.connect(db_file)
+    apply_pragmas(conn)
     cursor = conn.cursor()
 
     # Check if client column already exists
@@ -38,17 +40,24 @@ def migrate_add_client_column():
         ADD COLUMN client TEXT
     """)
 
-    # Create index for client column
+    # Items created before the column kept the client in custom_fields;
+    # copy it across once so the indexed column serves filters and dropdowns
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_client
-        ON content_items(client)
+        UPDATE content_items
+        SET client = json_extract(custom_fields_json, '$.client')
+        WHERE json_valid(custom_fields_json)
+          AND json_type(custom_fields_json, '$.client') = 'text'
     """)
+    backfilled = cursor.rowcount
+
+    # Create the client index (and any other missing ones)
+    create_content_indexes(cursor)
 
     conn.commit()
     conn.close()
 
     print("[OK] Client column added successfully!")
-    print("[INFO] Existing content items will have NULL client values until updated.")
+    print(f"[INFO] Copied client from custom fields for {backfilled} existing item(s); others stay NULL until updated.")
 
 
 if __name__ == "__main__":
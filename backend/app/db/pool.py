@@ -0,0 +1,168 @@
+"""SQLite connection pooling.
+
+Keeps a bounded set of open, PRAGMA-configured connections per database
+file so request handlers don't pay for connect() and PRAGMA setup on every
+call. Reads borrow any idle (query-only) connection; writes go through one
+dedicated writer connection serialized by a lock, matching SQLite's
+single-writer model.
+"""
+
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.db.init_db import apply_pragmas
+
+# Idle reader connections kept per database
+DEFAULT_POOL_SIZE = 8
+
+# Prepared statements cached per connection (sqlite3 defaults to 128)
+CACHED_STATEMENTS = 256
+
+# Databases with live pools; least recently used pools are closed beyond this
+MAX_POOLS = 4
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections for a single database file."""
+
+    def __init__(self, db_path: str, size: int = DEFAULT_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self, read_only: bool = True) -> sqlite3.Connection:
+        """Open a new connection usable from any thread.
+
+        Reader connections refuse writes (PRAGMA query_only), so a write
+        can't bypass the writer lock. They aren't opened with a
+        ``mode=ro`` URI: that can't switch a new database to WAL.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+        apply_pragmas(conn)
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def warm(self) -> None:
+        """Pre-open idle reader connections up to the pool size."""
+        while self._idle.qsize() < self.size:
+            self._idle.put(self._connect())
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a reader connection; pair with ``release()``."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a reader connection to the pool (or close it if full)."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed or self._idle.qsize() >= self.size:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def acquire_writer(self) -> sqlite3.Connection:
+        """Take the lock and the single writer connection; pair with ``release_writer()``."""
+        self._write_lock.acquire()
+        try:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            return self._writer
+        except Exception:
+            self._write_lock.release()
+            raise
+
+    def release_writer(self, conn: sqlite3.Connection) -> None:
+        """Roll back anything left uncommitted and release the writer lock."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection for the duration of a ``with`` block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer connection for the duration of a ``with`` block."""
+        conn = self.acquire_writer()
+        try:
+            yield conn
+        finally:
+            self.release_writer(conn)
+
+    def close(self) -> None:
+        """Close all idle connections and the writer."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_pools: "OrderedDict[str, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Return the shared pool for a database file, creating it on first use.
+
+    Args:
+        db_path: Filesystem path of the SQLite database
+
+    Returns:
+        ConnectionPool for that database
+    """
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+            while len(_pools) > MAX_POOLS:
+                _, evicted = _pools.popitem(last=False)
+                evicted.close()
+        else:
+            _pools.move_to_end(db_path)
+        return pool
+
+
+def close_pool(db_path: str) -> None:
+    """Close and forget the shared pool for one database file, if open.
+
+    Args:
+        db_path: Filesystem path of the SQLite database
+    """
+    with _pools_lock:
+        pool = _pools.pop(db_path, None)
+    if pool is not None:
+        pool.close()
+
+
+def close_pools() -> None:
+    """Close every pool (called on application shutdown)."""
+    with _pools_lock:
+        while _pools:
+            _, pool = _pools.popitem()
+            pool.close()
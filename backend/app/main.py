@@ -4,14 +4,52 @@ This module initializes the FastAPI application, configures CORS,
 registers all routers, and sets up application lifecycle events.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.config import settings
-from app.db.init_db import init_database
+from app.config import ensure_directories, settings
+from app.db.init_db import init_database, optimize_databases
+from app.db.pool import close_pools
+
+logger = logging.getLogger(__name__)
+
+# Re-run PRAGMA optimize this often for long-running instances
+OPTIMIZE_INTERVAL_SECONDS = 4 * 60 * 60
+
+
+async def _periodic_optimize() -> None:
+    """Keep query planner statistics fresh while the app is running."""
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        # ANALYZE can wait on the write lock (e.g. during a reindex), so run
+        # it off the event loop; a failed run is retried next interval
+        try:
+            await asyncio.to_thread(optimize_databases)
+        except Exception:
+            logger.exception("Periodic database optimize failed")
+
+
+async def _periodic_export_cleanup() -> None:
+    """Delete expired export files so downloads auto-expire without an admin call."""
+    from app.services import export_service
+
+    interval_seconds = settings.EXPORT_CLEANUP_HOURS * 60 * 60
+    while True:
+        await asyncio.sleep(interval_seconds)
+        # A failed sweep (e.g. an OSError) is retried next interval
+        try:
+            deleted_count = await export_service.cleanup_old_exports(settings.EXPORT_CLEANUP_HOURS)
+        except Exception:
+            logger.exception("Periodic export cleanup failed")
+            continue
+        if deleted_count:
+            logger.info("Removed %d expired export files", deleted_count)
 
 
 @asynccontextmanager
@@ -21,15 +59,35 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     Handles startup and shutdown events for the application.
     Initializes database and other resources on startup.
     """
-    # Startup: Initialize database
+    # Startup: Create library directories and initialize database
+    ensure_directories()
     await init_database()
     print(f"[OK] Database initialized at {settings.DATABASE_URL}")
     print(f"[OK] Content library path: {settings.CONTENT_LIBRARY_PATH}")
+    optimize_databases()
+    background_tasks = [
+        asyncio.create_task(_periodic_optimize()),
+        asyncio.create_task(_periodic_export_cleanup()),
+    ]
+
+    # Open pooled index connections up front so first requests skip connect()
+    from app.services import search_service
+    app.state.db_pool = search_service.get_db_pool()
+    app.state.db_pool.warm()
 
     yield
 
     # Shutdown: Clean up resources
     print("Application shutting down...")
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    close_pools()
+    from app.services import export_service
+    export_service.shutdown_render_pool()
+    optimize_databases()
 
 
 # Initialize FastAPI application
@@ -38,6 +96,7 @@ app = FastAPI(
     description="REST API for managing content library with markdown-based storage",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -4,6 +4,7 @@ Defines the structure for content items stored as markdown files
 with YAML frontmatter and used throughout the API.
 """
 
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
@@ -65,6 +66,33 @@ class ContentResponse(ContentBase):
     model_config = {"from_attributes": True}
 
 
+@dataclass(slots=True, kw_only=True)
+class ContentHit:
+    """Search result row with the same fields as ContentResponse.
+
+    Built from the search index, whose values were validated when the item
+    was saved, so rows skip pydantic validation. orjson serializes it
+    directly, producing the same JSON as ContentResponse.
+    """
+
+    title: str
+    content_type: str
+    status: str = "draft"
+    description: Optional[str] = None
+    author: Optional[str] = None
+    url: Optional[str] = None
+    publish_date: Optional[date] = None
+    client: Optional[str] = None
+    categories: List[str] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    custom_fields: Dict[str, Any] = field(default_factory=dict)
+    id: str
+    created_date: date
+    updated_date: date
+    file_path: str
+    body: str = ""
+
+
 class ContentListItem(ContentBase):
     """Lightweight model for content list views (without body)."""
 
@@ -5,9 +5,9 @@ Post-MVP implementation.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 
 
 class UserRole:
@@ -18,6 +18,14 @@ class UserRole:
     VIEWER = "viewer"
 
 
+# Privilege level per role; higher levels include lower-level permissions
+ROLE_LEVELS = {
+    UserRole.ADMIN: 3,
+    UserRole.EDITOR: 2,
+    UserRole.VIEWER: 1,
+}
+
+
 class UserBase(BaseModel):
     """Base user model with common fields."""
 
@@ -56,6 +64,10 @@ class UserResponse(UserBase):
     model_config = {"from_attributes": True}
 
 
+# Serializes a whole user listing in one pydantic-core call
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+
+
 class UserInDB(UserResponse):
     """User model with password hash (for internal use only)."""
 
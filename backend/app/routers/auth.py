@@ -5,13 +5,15 @@ Implements JWT-based authentication.
 """
 
 from datetime import timedelta
+from functools import lru_cache
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
-from app.config import settings
-from app.models.user import Token, UserCreate, UserResponse, UserRole
+from app.config import Settings, get_settings
+from app.models.user import ROLE_LEVELS, USER_LIST_ADAPTER, Token, UserCreate, UserResponse, UserRole
 from app.services import auth_service
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -59,22 +61,22 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     return user
 
 
+@lru_cache(maxsize=None)
 def require_role(required_role: str):
     """Dependency factory to require specific role.
 
+    Cached so each role maps to one stable dependency callable.
+
     Args:
         required_role: Required role (admin, editor, viewer)
 
     Returns:
         Dependency function that checks user role
     """
-    async def role_checker(current_user: Annotated[UserResponse, Depends(get_current_user)]) -> UserResponse:
-        role_hierarchy = {UserRole.ADMIN: 3, UserRole.EDITOR: 2, UserRole.VIEWER: 1}
-
-        user_level = role_hierarchy.get(current_user.role, 0)
-        required_level = role_hierarchy.get(required_role, 999)
+    required_level = ROLE_LEVELS.get(required_role, 999)
 
-        if user_level < required_level:
+    async def role_checker(current_user: Annotated[UserResponse, Depends(get_current_user)]) -> UserResponse:
+        if ROLE_LEVELS.get(current_user.role, 0) < required_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions. {required_role} role required."
@@ -86,11 +88,17 @@ def require_role(required_role: str):
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+async def login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    settings: Annotated[Settings, Depends(get_settings)],
+    background_tasks: BackgroundTasks
+):
     """Authenticate user and return JWT token.
 
     Args:
         form_data: OAuth2 password form with username (email) and password
+        settings: Application settings
+        background_tasks: Runs the last_login update after the response
 
     Returns:
         JWT access token
@@ -98,7 +106,9 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
     Raises:
         HTTPException: If credentials are invalid
     """
-    user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    user = await auth_service.authenticate_user(
+        form_data.username, form_data.password, background_tasks
+    )
 
     if not user:
         raise HTTPException(
@@ -159,7 +169,7 @@ async def get_current_user_info(
     return current_user
 
 
-@router.get("/users", response_model=list[UserResponse])
+@router.get("/users", response_model=list[UserResponse], response_class=ORJSONResponse)
 async def list_users(
     current_user: Annotated[UserResponse, Depends(require_role(UserRole.ADMIN))]
 ):
@@ -171,7 +181,9 @@ async def list_users(
     Returns:
         List of all users
     """
-    return await auth_service.list_users()
+    users = await auth_service.list_users()
+    # Serialize the list in one pass instead of validating each item again
+    return ORJSONResponse(USER_LIST_ADAPTER.dump_python(users, mode="json"))
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -4,7 +4,10 @@ This module provides REST API endpoints for creating, reading,
 updating, and deleting content items, plus list/search functionality.
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional
 
 from app.models.content import ContentCreate, ContentUpdate, ContentResponse
@@ -32,19 +35,32 @@ async def create_content(content_data: ContentCreate):
 
 
 @router.get("/{content_id}", response_model=ContentResponse)
-async def get_content(content_id: str):
+async def get_content(
+    content_id: str,
+    stream: bool = Query(False, description="Stream only the markdown body in chunks")
+):
     """
     Retrieve content item by ID.
 
     Args:
         content_id: UUID of the content item
+        stream: Return just the markdown body as a chunked stream
 
     Returns:
-        Content item with all metadata and body
+        Content item with all metadata and body, or the streamed body
 
     Raises:
         HTTPException: 404 if content not found
     """
+    if stream:
+        chunks = await asyncio.to_thread(search_service.open_body_stream, content_id)
+        if chunks is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Content item with ID '{content_id}' not found"
+            )
+        return StreamingResponse(chunks, media_type="text/markdown; charset=utf-8")
+
     content = await markdown_service.get_content_item(content_id)
     if not content:
         raise HTTPException(
@@ -104,7 +120,7 @@ async def delete_content(content_id: str):
     return None
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, response_class=ORJSONResponse)
 async def list_content(
     q: Optional[str] = Query(None, description="Search query"),
     content_type: Optional[List[str]] = Query(None),
@@ -114,7 +130,8 @@ async def list_content(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
-    per_page: int = Query(50, ge=1, le=100)
+    per_page: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor")
 ):
     """
     List and filter content items.
@@ -131,13 +148,27 @@ async def list_content(
         date_to: Filter by created_date <= this date (YYYY-MM-DD)
         page: Page number (1-indexed)
         per_page: Items per page (max 100)
+        cursor: Keyset cursor; when given, returns the page after it instead of using page/offset
 
     Returns:
         Dictionary with 'items' list and 'pagination' metadata
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
     """
+    keyset = None
+    if cursor:
+        try:
+            keyset = search_service.decode_cursor(cursor)
+        except ValueError as e:
+            # 'status' is shadowed by the query parameter here
+            raise HTTPException(status_code=400, detail=str(e))
+
     offset = (page - 1) * per_page
 
-    results, total = search_service.search_content(
+    # SQLite calls block, so run them off the event loop
+    results, total = await asyncio.to_thread(
+        search_service.search_content,
         query=q,
         content_types=content_type,
         statuses=status,
@@ -146,15 +177,25 @@ async def list_content(
         date_from=date_from,
         date_to=date_to,
         limit=per_page,
-        offset=offset
+        offset=offset,
+        cursor=keyset
     )
 
-    return {
+    if total == 0:
+        return ORJSONResponse({
+            "items": [],
+            "pagination": {"page": page, "per_page": per_page, "total": 0, "pages": 0, "next_cursor": None}
+        })
+
+    # orjson serializes the result dataclasses directly instead of FastAPI's
+    # per-item validation
+    return ORJSONResponse({
         "items": results,
         "pagination": {
             "page": page,
             "per_page": per_page,
             "total": total,
-            "pages": (total + per_page - 1) // per_page  # Ceiling division
+            "pages": -(-total // per_page),  # Ceiling division
+            "next_cursor": search_service.encode_cursor(results[-1]) if len(results) == per_page else None
         }
-    }
+    })
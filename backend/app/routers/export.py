@@ -3,11 +3,18 @@
 Provides endpoints for exporting filtered content items to various formats.
 """
 
+import asyncio
+import re
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+
 from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import FileResponse
-from typing import List, Optional
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import IO, Iterator, List, Optional
 from pydantic import BaseModel
 
+from app.config import Settings, get_settings
 from app.models.content import ContentResponse
 from app.services import search_service, export_service
 from app.routers.auth import get_current_user
@@ -42,6 +49,71 @@ class ExportResponse(BaseModel):
     message: str
 
 
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "html": "text/html",
+}
+
+
+@lru_cache(maxsize=8)
+def _exports_root(exports_path: str) -> Path:
+    """Resolve the exports directory once per configured path."""
+    return Path(exports_path).resolve()
+
+
+class _ExportItems:
+    """Streamed export rows, counted as the exporter consumes them."""
+
+    def __init__(self, first: ContentResponse, rest: Iterator[ContentResponse]):
+        self._items = chain([first], rest)
+        self._rest = rest
+        self.count = 0
+
+    def __iter__(self) -> Iterator[ContentResponse]:
+        for item in self._items:
+            self.count += 1
+            yield item
+
+    def close(self) -> None:
+        """Release the search's pooled connection."""
+        self._rest.close()
+
+
+async def _search_for_export(request: ExportRequest) -> _ExportItems:
+    """Start streaming the export's search results, raising 404 when nothing matches."""
+    items = search_service.iter_search_content(
+        query=request.query,
+        content_types=request.content_types,
+        statuses=request.statuses,
+        tags=request.tags,
+        client=request.client,
+        date_from=request.date_from,
+        date_to=request.date_to,
+        limit=get_settings().MAX_EXPORT_ITEMS,
+        # Only read the columns the document will render
+        columns=(
+            request.include_fields if request.include_fields is not None
+            else export_service.DEFAULT_EXPORT_FIELDS
+        )
+    )
+
+    first = await asyncio.to_thread(next, items, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail="No content items found matching filters")
+    return _ExportItems(first, items)
+
+
+def _attachment(buffer: IO[bytes], title: str, extension: str) -> StreamingResponse:
+    """Wrap an export buffer as a chunked file download response."""
+    filename = re.sub(r'[^A-Za-z0-9._-]+', '_', title).strip('_') or "export"
+    return StreamingResponse(
+        export_service.iter_export_chunks(buffer),
+        media_type=MEDIA_TYPES[extension],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
 @router.post("/docx", response_model=ExportResponse)
 async def export_docx(
     request: ExportRequest,
@@ -55,35 +127,42 @@ async def export_docx(
     Requires authentication. All user roles can export.
     """
     try:
-        # Get filtered content items
-        content_items, total = search_service.search_content(
-            query=request.query,
-            content_types=request.content_types,
-            statuses=request.statuses,
-            tags=request.tags,
-            client=request.client,
-            date_from=request.date_from,
-            date_to=request.date_to,
-            limit=1000,  # Max items for export
-            offset=0
+        # Identical requests against an unchanged index reuse the rendered file
+        cache_key = export_service.export_cache_key(
+            {"format": "docx", **request.model_dump()},
+            search_service.index_generation()
         )
+        cached = export_service.get_cached_export(cache_key)
+        if cached is not None:
+            file_path, item_count = cached
+            return ExportResponse(
+                file_path=file_path,
+                format="docx",
+                item_count=item_count,
+                message=f"Successfully exported {item_count} items to DOCX"
+            )
 
-        if not content_items:
-            raise HTTPException(status_code=404, detail="No content items found matching filters")
+        # Get filtered content items
+        content_items = await _search_for_export(request)
 
         # Generate DOCX
-        file_path = await export_service.export_to_docx(
-            content_items=content_items,
-            title=request.title,
-            include_fields=request.include_fields,
-            template_name=request.template_name
-        )
+        try:
+            file_path = await export_service.export_to_docx(
+                content_items=content_items,
+                title=request.title,
+                include_fields=request.include_fields,
+                template_name=request.template_name,
+                export_id=cache_key
+            )
+        finally:
+            content_items.close()
+        export_service.cache_export(cache_key, file_path, content_items.count)
 
         return ExportResponse(
             file_path=file_path,
             format="docx",
-            item_count=len(content_items),
-            message=f"Successfully exported {len(content_items)} items to DOCX"
+            item_count=content_items.count,
+            message=f"Successfully exported {content_items.count} items to DOCX"
         )
 
     except HTTPException:
@@ -106,35 +185,42 @@ async def export_pdf(
     Requires authentication. All user roles can export.
     """
     try:
-        # Get filtered content items
-        content_items, total = search_service.search_content(
-            query=request.query,
-            content_types=request.content_types,
-            statuses=request.statuses,
-            tags=request.tags,
-            client=request.client,
-            date_from=request.date_from,
-            date_to=request.date_to,
-            limit=1000,  # Max items for export
-            offset=0
+        # Identical requests against an unchanged index reuse the rendered file
+        cache_key = export_service.export_cache_key(
+            {"format": "pdf", **request.model_dump()},
+            search_service.index_generation()
         )
+        cached = export_service.get_cached_export(cache_key)
+        if cached is not None:
+            file_path, item_count = cached
+            return ExportResponse(
+                file_path=file_path,
+                format="pdf",
+                item_count=item_count,
+                message=f"Successfully exported {item_count} items to PDF"
+            )
 
-        if not content_items:
-            raise HTTPException(status_code=404, detail="No content items found matching filters")
+        # Get filtered content items
+        content_items = await _search_for_export(request)
 
         # Generate PDF
-        file_path = await export_service.export_to_pdf(
-            content_items=content_items,
-            title=request.title,
-            include_fields=request.include_fields,
-            template_name=request.template_name
-        )
+        try:
+            file_path = await export_service.export_to_pdf(
+                content_items=content_items,
+                title=request.title,
+                include_fields=request.include_fields,
+                template_name=request.template_name,
+                export_id=cache_key
+            )
+        finally:
+            content_items.close()
+        export_service.cache_export(cache_key, file_path, content_items.count)
 
         return ExportResponse(
             file_path=file_path,
             format="pdf",
-            item_count=len(content_items),
-            message=f"Successfully exported {len(content_items)} items to PDF"
+            item_count=content_items.count,
+            message=f"Successfully exported {content_items.count} items to PDF"
         )
 
     except HTTPException:
@@ -144,38 +230,100 @@ async def export_pdf(
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
+@router.post("/docx/stream")
+async def export_docx_stream(
+    request: ExportRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Export content items to DOCX and return the document directly.
+
+    Unlike ``/export/docx`` nothing is written to the exports directory, so
+    no follow-up ``/export/download`` request is needed.
+
+    Requires authentication. All user roles can export.
+    """
+    try:
+        content_items = await _search_for_export(request)
+        try:
+            buffer = await export_service.export_to_docx_buffer(
+                content_items=content_items,
+                title=request.title,
+                include_fields=request.include_fields,
+                template_name=request.template_name
+            )
+        finally:
+            content_items.close()
+        return _attachment(buffer, request.title, "docx")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
+@router.post("/pdf/stream")
+async def export_pdf_stream(
+    request: ExportRequest,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Export content items to PDF and return the document directly.
+
+    Falls back to an HTML document when WeasyPrint is unavailable.
+
+    Requires authentication. All user roles can export.
+    """
+    try:
+        content_items = await _search_for_export(request)
+        try:
+            buffer, extension = await export_service.export_to_pdf_buffer(
+                content_items=content_items,
+                title=request.title,
+                include_fields=request.include_fields,
+                template_name=request.template_name
+            )
+        finally:
+            content_items.close()
+        return _attachment(buffer, request.title, extension)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
 @router.get("/download/{filename}")
 async def download_export(
     filename: str,
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Download a generated export file.
 
     Args:
         filename: Name of the file to download (with extension)
+        settings: Application settings
 
     Returns:
         File download response
 
     Requires authentication. Files auto-delete after 1 hour.
     """
-    from pathlib import Path
-    from app.config import settings
+    exports_root = _exports_root(str(settings.EXPORTS_PATH))
+    file_path = (exports_root / filename).resolve()
 
-    file_path = Path(settings.EXPORTS_PATH) / filename
+    # Validate file is in exports directory (security). Checked before
+    # exists() so nothing is revealed about paths outside the root.
+    if not file_path.is_relative_to(exports_root):
+        raise HTTPException(status_code=403, detail="Access denied")
 
-    if not file_path.exists():
+    if not file_path.is_file():
         raise HTTPException(status_code=404, detail="Export file not found or expired")
 
-    # Validate file is in exports directory (security)
-    if not str(file_path.resolve()).startswith(str(Path(settings.EXPORTS_PATH).resolve())):
-        raise HTTPException(status_code=403, detail="Access denied")
-
     # Determine media type
-    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    if filename.endswith('.pdf'):
-        media_type = "application/pdf"
+    media_type = MEDIA_TYPES.get(file_path.suffix.lstrip('.'), MEDIA_TYPES["docx"])
 
     return FileResponse(
         path=file_path,
@@ -4,7 +4,10 @@ This module provides dedicated search endpoints for finding content
 across the library using full-text search and advanced filtering.
 """
 
+import asyncio
+
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 
 from app.models.content import ContentResponse
@@ -14,7 +17,7 @@ from app.services import search_service
 router = APIRouter(prefix="/search", tags=["search"])
 
 
-@router.get("", response_model=List[ContentResponse])
+@router.get("", response_model=List[ContentResponse], response_class=ORJSONResponse)
 async def search(
     q: str = Query(..., min_length=1, description="Search query"),
     content_type: Optional[List[str]] = Query(None),
@@ -27,7 +30,8 @@ async def search(
     Full-text search across content items.
 
     Searches title, description, body, and tags for the provided query.
-    Results can be filtered by content type, status, tags, and client.
+    Results can be filtered by content type, status, tags, and client, and
+    are ordered by relevance (best match first).
 
     Args:
         q: Search query (required)
@@ -40,17 +44,20 @@ async def search(
     Returns:
         List of matching content items
     """
-    results, _ = search_service.search_content(
+    results, _ = await asyncio.to_thread(
+        search_service.search_content,
         query=q,
         content_types=content_type,
         statuses=status,
         tags=tags,
         client=client,
         limit=limit,
-        offset=0
+        offset=0,
+        ranked=True
     )
 
-    return results
+    # orjson serializes the result dataclasses directly, with no validation pass
+    return ORJSONResponse(results)
 
 
 @router.get("/filters", response_model=dict)
@@ -64,12 +71,16 @@ async def get_filter_options():
     Returns:
         Dictionary with filter options for each field
     """
-    return {
-        "content_types": search_service.get_unique_values("content_type"),
-        "statuses": search_service.get_unique_values("status"),
-        "authors": search_service.get_unique_values("author"),
-        "clients": search_service.get_unique_values("client")
-    }
+    def load_filter_options() -> dict:
+        return {
+            "content_types": search_service.get_unique_values("content_type"),
+            "statuses": search_service.get_unique_values("status"),
+            "authors": search_service.get_unique_values("author"),
+            "clients": search_service.get_unique_values("client")
+        }
+
+    # SQLite calls block, so run them off the event loop
+    return await asyncio.to_thread(load_filter_options)
 
 
 @router.post("/rebuild-index")
@@ -83,7 +94,7 @@ async def rebuild_index():
     Returns:
         Dictionary with count of indexed files
     """
-    count = search_service.rebuild_index_from_files()
+    count = await asyncio.to_thread(search_service.rebuild_index_from_files)
     return {
         "message": "Index rebuilt successfully",
         "files_indexed": count
@@ -32,6 +32,10 @@ async def create_admin_user():
         print("Error: Password must be at least 8 characters")
         sys.exit(1)
 
+    # Start hashing in a worker thread while the confirmation is typed
+    loop = asyncio.get_running_loop()
+    password_hash = loop.run_in_executor(None, auth_service.get_password_hash, password)
+
     password_confirm = getpass("Confirm password: ")
     if password != password_confirm:
         print("Error: Passwords do not match")
@@ -46,7 +50,7 @@ async def create_admin_user():
     )
 
     try:
-        user = await auth_service.create_user(user_data)
+        user = await auth_service.create_user(user_data, await password_hash)
         print()
         print("✓ Admin user created successfully!")
         print(f"  Email: {user.email}")
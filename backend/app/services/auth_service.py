@@ -4,19 +4,92 @@ Handles user authentication, JWT token generation, and password hashing.
 Implements role-based access control for admin/editor/viewer roles.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Type
+import os
 import sqlite3
-from uuid import uuid4
+import threading
+import time
+from uuid import UUID
 
+from cachetools import TTLCache
+from fastapi import BackgroundTasks
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.db.init_db import apply_pragmas
+from app.db.pool import ConnectionPool, get_pool
 from app.models.user import UserCreate, UserResponse, UserInDB
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. New hashes use Argon2id with the configured cost;
+# existing bcrypt hashes (and Argon2 hashes with outdated parameters) still
+# verify and are upgraded on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+# Minimum interval between last_login writes for the same user
+LAST_LOGIN_RESOLUTION = timedelta(seconds=60)
+
+# Columns returned as UserResponse (no password hash)
+USER_COLUMNS = "id, email, full_name, role, created_at, last_login, is_active"
+
+
+# Verified token payloads, so repeat requests with the same bearer token skip
+# signature verification. Entries never outlive the token's own expiry, and
+# user revocation (is_active) is still checked against the database per request.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
+
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so new IDs sort
+    after existing ones and inserts append to the end of the primary key
+    B-tree instead of splitting random pages.
+
+    Returns:
+        New UUIDv7
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return UUID(int=value)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a SQLite TIMESTAMP column value."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _user_from_row(row: sqlite3.Row, model: Type[UserResponse] = UserResponse) -> UserResponse:
+    """Build a user model from a users row without re-running validation.
+
+    Rows come from our own schema, so the field values are already valid;
+    only the SQLite representations (timestamps, 0/1 flags) are converted.
+
+    Args:
+        row: Row selected with ``USER_COLUMNS`` (plus password_hash for UserInDB)
+        model: UserResponse or UserInDB
+
+    Returns:
+        Constructed user model
+    """
+    fields = dict(row)
+    fields["created_at"] = _parse_timestamp(row["created_at"])
+    fields["last_login"] = _parse_timestamp(row["last_login"])
+    fields["is_active"] = bool(row["is_active"])
+    return model.model_construct(**fields)
 
 
 def get_users_db_connection():
@@ -27,10 +100,20 @@ def get_users_db_connection():
     """
     db_path = settings.USERS_DATABASE_URL.replace("sqlite:///", "")
     conn = sqlite3.connect(db_path)
+    apply_pragmas(conn)
     conn.row_factory = sqlite3.Row
     return conn
 
 
+def get_users_db_pool() -> ConnectionPool:
+    """Get the shared connection pool for the users database.
+
+    Returns:
+        ConnectionPool: Pool of PRAGMA-configured connections
+    """
+    return get_pool(settings.USERS_DATABASE_URL.replace("sqlite:///", ""))
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash.
 
@@ -45,7 +128,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt.
+    """Hash a password using Argon2id.
 
     Args:
         password: Plain text password
@@ -86,18 +169,38 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    # Keyed by signing key too, so rotating SECRET_KEY retires cached tokens
+    cache_key = (settings.SECRET_KEY, settings.ALGORITHM, token)
+    with _token_cache_lock:
+        payload = _token_cache.get(cache_key)
+
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return dict(payload)
+        with _token_cache_lock:
+            _token_cache.pop(cache_key, None)
+        return None
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    with _token_cache_lock:
+        _token_cache[cache_key] = payload
+    return dict(payload)
+
 
-async def create_user(user_data: UserCreate) -> UserResponse:
+async def create_user(
+    user_data: UserCreate,
+    password_hash: Optional[str] = None,
+) -> UserResponse:
     """Create a new user account.
 
     Args:
         user_data: User registration data
+        password_hash: Precomputed hash of ``user_data.password``; hashed
+            here when omitted
 
     Returns:
         Created user (without password hash)
@@ -105,7 +208,20 @@ async def create_user(user_data: UserCreate) -> UserResponse:
     Raises:
         ValueError: If email already exists
     """
-    conn = get_users_db_connection()
+    # Hashing is deliberately slow; keep it off the event loop and outside
+    # the writer lock
+    if password_hash is None:
+        password_hash = await asyncio.to_thread(get_password_hash, user_data.password)
+
+    # Pooled SQLite calls block (and the insert waits on the writer lock),
+    # so they run in a worker thread like the hashing above
+    return await asyncio.to_thread(_insert_user, user_data, password_hash)
+
+
+def _insert_user(user_data: UserCreate, password_hash: str) -> UserResponse:
+    """Insert a user row and return it (blocking; see ``create_user``)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
@@ -114,8 +230,7 @@ async def create_user(user_data: UserCreate) -> UserResponse:
         if cursor.fetchone():
             raise ValueError(f"User with email {user_data.email} already exists")
 
-        user_id = str(uuid4())
-        password_hash = get_password_hash(user_data.password)
+        user_id = str(uuid7())
 
         cursor.execute("""
             INSERT INTO users (id, email, password_hash, full_name, role, is_active)
@@ -131,21 +246,13 @@ async def create_user(user_data: UserCreate) -> UserResponse:
         conn.commit()
 
         # Fetch created user
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
         row = cursor.fetchone()
 
-        return UserResponse(
-            id=row["id"],
-            email=row["email"],
-            full_name=row["full_name"],
-            role=row["role"],
-            created_at=row["created_at"],
-            last_login=row["last_login"],
-            is_active=bool(row["is_active"]),
-        )
+        return _user_from_row(row)
 
     finally:
-        conn.close()
+        pool.release_writer(conn)
 
 
 async def get_user_by_email(email: str) -> Optional[UserInDB]:
@@ -157,29 +264,28 @@ async def get_user_by_email(email: str) -> Optional[UserInDB]:
     Returns:
         User with password hash or None if not found
     """
-    conn = get_users_db_connection()
+    return await asyncio.to_thread(_select_user_by_email, email)
+
+
+def _select_user_by_email(email: str) -> Optional[UserInDB]:
+    """Read a user and password hash by email (blocking)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire()
     cursor = conn.cursor()
 
     try:
-        cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
+        cursor.execute(
+            f"SELECT {USER_COLUMNS}, password_hash FROM users WHERE email = ?", (email,)
+        )
         row = cursor.fetchone()
 
         if not row:
             return None
 
-        return UserInDB(
-            id=row["id"],
-            email=row["email"],
-            password_hash=row["password_hash"],
-            full_name=row["full_name"],
-            role=row["role"],
-            created_at=row["created_at"],
-            last_login=row["last_login"],
-            is_active=bool(row["is_active"]),
-        )
+        return _user_from_row(row, UserInDB)
 
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 async def get_user_by_id(user_id: str) -> Optional[UserResponse]:
@@ -191,36 +297,40 @@ async def get_user_by_id(user_id: str) -> Optional[UserResponse]:
     Returns:
         User (without password hash) or None if not found
     """
-    conn = get_users_db_connection()
+    return await asyncio.to_thread(_select_user_by_id, user_id)
+
+
+def _select_user_by_id(user_id: str) -> Optional[UserResponse]:
+    """Read a user by ID (blocking)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire()
     cursor = conn.cursor()
 
     try:
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
         row = cursor.fetchone()
 
         if not row:
             return None
 
-        return UserResponse(
-            id=row["id"],
-            email=row["email"],
-            full_name=row["full_name"],
-            role=row["role"],
-            created_at=row["created_at"],
-            last_login=row["last_login"],
-            is_active=bool(row["is_active"]),
-        )
+        return _user_from_row(row)
 
     finally:
-        conn.close()
+        pool.release(conn)
 
 
-async def authenticate_user(email: str, password: str) -> Optional[UserInDB]:
+async def authenticate_user(
+    email: str,
+    password: str,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> Optional[UserInDB]:
     """Authenticate user with email and password.
 
     Args:
         email: User email
         password: Plain text password
+        background_tasks: Request background tasks; when given, the
+            last_login update runs after the response instead of inline
 
     Returns:
         User if authentication successful, None otherwise
@@ -230,22 +340,63 @@ async def authenticate_user(email: str, password: str) -> Optional[UserInDB]:
         return None
     if not user.is_active:
         return None
-    if not verify_password(password, user.password_hash):
+
+    # Hash verification is deliberately slow; keep it off the event loop
+    verified, new_hash = await asyncio.to_thread(
+        pwd_context.verify_and_update, password, user.password_hash
+    )
+    if not verified:
         return None
 
-    # Update last login timestamp
-    conn = get_users_db_connection()
+    # Rapid repeat logins (scripts, token refresh loops) don't need a write
+    # per call; last_login is only advanced once per LAST_LOGIN_RESOLUTION
+    if new_hash is None and user.last_login is not None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # SQLite stores UTC
+        if now - user.last_login < LAST_LOGIN_RESOLUTION:
+            return user
+
+    # The last_login write doesn't affect the response, so callers with a
+    # request context defer it until after the response is sent
+    if background_tasks is not None:
+        background_tasks.add_task(record_login, user.id, new_hash)
+    else:
+        await asyncio.to_thread(record_login, user.id, new_hash)
+
+    return user
+
+
+def record_login(user_id: str, new_hash: Optional[str] = None) -> None:
+    """Update a user's last login timestamp.
+
+    The timestamp is left alone if it already moved within
+    ``LAST_LOGIN_RESOLUTION``, unless a rehashed password must be stored.
+
+    Args:
+        user_id: User UUID
+        new_hash: Replacement password hash when the stored one used
+            deprecated hashing settings (e.g. legacy bcrypt)
+    """
+    pool = get_users_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
     try:
-        cursor.execute(
-            "UPDATE users SET last_login = datetime('now') WHERE id = ?",
-            (user.id,)
-        )
+        if new_hash:
+            cursor.execute(
+                "UPDATE users SET last_login = datetime('now'), password_hash = ? WHERE id = ?",
+                (new_hash, user_id)
+            )
+        else:
+            # Guarded so concurrent logins don't each rewrite the row
+            cursor.execute(
+                """
+                UPDATE users SET last_login = datetime('now')
+                WHERE id = ? AND (last_login IS NULL OR last_login < datetime('now', ?))
+                """,
+                (user_id, f"-{int(LAST_LOGIN_RESOLUTION.total_seconds())} seconds")
+            )
         conn.commit()
     finally:
-        conn.close()
-
-    return user
+        pool.release_writer(conn)
 
 
 async def update_user(user_id: str, **updates) -> Optional[UserResponse]:
@@ -258,7 +409,13 @@ async def update_user(user_id: str, **updates) -> Optional[UserResponse]:
     Returns:
         Updated user or None if not found
     """
-    conn = get_users_db_connection()
+    return await asyncio.to_thread(_update_user, user_id, updates)
+
+
+def _update_user(user_id: str, updates: dict) -> Optional[UserResponse]:
+    """Apply allowed field updates to a user row (blocking)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
@@ -266,23 +423,21 @@ async def update_user(user_id: str, **updates) -> Optional[UserResponse]:
         allowed_fields = ["role", "full_name", "is_active"]
         update_fields = {k: v for k, v in updates.items() if k in allowed_fields}
 
-        if not update_fields:
-            # No valid updates provided, just return current user
-            return await get_user_by_id(user_id)
+        if update_fields:
+            set_clause = ", ".join([f"{field} = ?" for field in update_fields.keys()])
+            values = list(update_fields.values()) + [user_id]
 
-        set_clause = ", ".join([f"{field} = ?" for field in update_fields.keys()])
-        values = list(update_fields.values()) + [user_id]
+            cursor.execute(f"UPDATE users SET {set_clause} WHERE id = ?", values)
+            conn.commit()
 
-        cursor.execute(f"UPDATE users SET {set_clause} WHERE id = ?", values)
-        conn.commit()
-
-        if cursor.rowcount == 0:
-            return None
+        # Read back on the writer connection rather than taking a second one
+        cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
+        row = cursor.fetchone()
 
-        return await get_user_by_id(user_id)
+        return _user_from_row(row) if row else None
 
     finally:
-        conn.close()
+        pool.release_writer(conn)
 
 
 async def list_users() -> list[UserResponse]:
@@ -291,28 +446,23 @@ async def list_users() -> list[UserResponse]:
     Returns:
         List of all users in system
     """
-    conn = get_users_db_connection()
+    return await asyncio.to_thread(_select_users)
+
+
+def _select_users() -> list[UserResponse]:
+    """Read every user, newest first (blocking)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire()
     cursor = conn.cursor()
 
     try:
-        cursor.execute("SELECT * FROM users ORDER BY created_at DESC")
+        cursor.execute(f"SELECT {USER_COLUMNS} FROM users ORDER BY created_at DESC")
         rows = cursor.fetchall()
 
-        return [
-            UserResponse(
-                id=row["id"],
-                email=row["email"],
-                full_name=row["full_name"],
-                role=row["role"],
-                created_at=row["created_at"],
-                last_login=row["last_login"],
-                is_active=bool(row["is_active"]),
-            )
-            for row in rows
-        ]
+        return [_user_from_row(row) for row in rows]
 
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 async def delete_user(user_id: str) -> bool:
@@ -324,7 +474,13 @@ async def delete_user(user_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    conn = get_users_db_connection()
+    return await asyncio.to_thread(_delete_user, user_id)
+
+
+def _delete_user(user_id: str) -> bool:
+    """Delete a user row (blocking)."""
+    pool = get_users_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
@@ -333,4 +489,4 @@ async def delete_user(user_id: str) -> bool:
         return cursor.rowcount > 0
 
     finally:
-        conn.close()
+        pool.release_writer(conn)
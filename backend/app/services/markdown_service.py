@@ -5,16 +5,55 @@ with YAML frontmatter. Each content item is stored as a separate .md file
 with metadata in the frontmatter and body content in markdown format.
 """
 
+import asyncio
+import copy
+import json
 import os
+import re
+import threading
+import weakref
+import orjson
 import yaml
-from pathlib import Path
+from collections import OrderedDict
+from contextlib import suppress
 from datetime import date
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from app.config import settings
+from app.config import CONTENT_TYPES, ensure_dir, settings
 from app.models.content import ContentCreate, ContentUpdate, ContentResponse
 
+# Buffer size for content file writes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Frontmatter fields holding ISO dates (stored as strings, parsed by the models)
+DATE_FIELDS = ('created_date', 'updated_date', 'publish_date')
+
+# Files read or written at once by bulk operations (independent and I/O-bound)
+BULK_READ_CONCURRENCY = 32
+
+# Parsed-file cache budget, counted in file bytes; larger files aren't cached
+PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PARSE_CACHE_MAX_FILE_BYTES = PARSE_CACHE_MAX_BYTES // 16
+
+# path -> ((inode, mtime_ns, size), parsed data), least recently used first
+_parse_cache: "OrderedDict[str, Tuple[Tuple[int, int, int], Dict]]" = OrderedDict()
+_parse_cache_bytes = 0
+_parse_cache_lock = threading.Lock()
+
+# content_id -> lock serializing updates and deletes of that item. An update
+# awaits worker threads between reading and writing the file, so without it
+# concurrent requests could overwrite each other's changes or undo a delete.
+# Entries vanish once no request holds or waits on the lock.
+_item_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# libyaml bindings parse/emit frontmatter several times faster than the
+# pure-Python implementation; PyYAML builds without them fall back
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 
 def _get_content_file_path(content_id: str, content_type: str) -> str:
     """
@@ -27,15 +66,114 @@ def _get_content_file_path(content_id: str, content_type: str) -> str:
     Returns:
         Absolute path to markdown file
     """
-    content_dir = Path(settings.CONTENT_LIBRARY_PATH) / content_type
-    content_dir.mkdir(parents=True, exist_ok=True)
-    return str(content_dir / f"{content_id}.md")
+    content_dir = ensure_dir(os.path.join(settings.CONTENT_LIBRARY_PATH, content_type))
+    return os.path.join(content_dir, f"{content_id}.md")
+
+
+def _load_frontmatter(text: str) -> Dict:
+    """
+    Parse a frontmatter block.
+
+    JSON is valid YAML, so files whose frontmatter is a JSON object (as some
+    exporting tools write it) are parsed with orjson; everything else, and
+    flow-style YAML that isn't strict JSON, goes through the YAML loader.
+    """
+    stripped = text.strip()
+    if stripped.startswith('{'):
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+    return yaml.load(text, Loader=SafeLoader) or {}
+
+
+def _parse_content_file(file_path: str) -> Dict:
+    """Read and parse a markdown file into frontmatter fields + 'body'."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Split frontmatter and body at the closing delimiter line. One find()
+    # replaces splitting the whole file, and a "---" inside a frontmatter
+    # value no longer ends the block early.
+    if content.startswith('---'):
+        end = content.find('\n---', 3)
+        if end != -1:
+            frontmatter = _load_frontmatter(content[3:end])
+            # Dates are kept as ISO strings; hand-edited files may have
+            # unquoted ones that YAML typed as dates
+            for key in DATE_FIELDS:
+                if isinstance(frontmatter.get(key), date):
+                    frontmatter[key] = frontmatter[key].isoformat()
+            body = content[end + 4:].strip()
+            return {**frontmatter, 'body': body}
+
+    # No frontmatter, entire content is body
+    return {'body': content}
+
+
+def _cached_parse(file_path: str, st: os.stat_result) -> Dict:
+    """
+    Parse a file, reusing the cached result while its version is unchanged.
+
+    One entry is kept per path, tagged with the (inode, mtime, size) it was
+    read at; os.replace gives every rewrite a new inode, so same-size writes
+    within the mtime granularity are still seen. The cache is bounded by the
+    total size of the files it holds, and files too large to share the
+    budget are parsed on every read instead of being kept.
+    """
+    global _parse_cache_bytes
+    version = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _parse_cache_lock:
+        entry = _parse_cache.get(file_path)
+        if entry is not None and entry[0] == version:
+            _parse_cache.move_to_end(file_path)
+            return entry[1]
+
+    parsed = _parse_content_file(file_path)
+
+    with _parse_cache_lock:
+        stale = _parse_cache.pop(file_path, None)
+        if stale is not None:
+            _parse_cache_bytes -= stale[0][2]
+        if st.st_size <= PARSE_CACHE_MAX_FILE_BYTES:
+            _parse_cache[file_path] = (version, parsed)
+            _parse_cache_bytes += st.st_size
+            while _parse_cache_bytes > PARSE_CACHE_MAX_BYTES:
+                _, (evicted_version, _) = _parse_cache.popitem(last=False)
+                _parse_cache_bytes -= evicted_version[2]
+    return parsed
+
+
+# Frontmatter values that are safe to share between copies
+_IMMUTABLE_SCALARS = (str, int, float, bool, type(None))
+
+
+def _copy_parsed(data: Dict) -> Dict:
+    """
+    Copy a cached parse result so the caller can modify it.
+
+    Lists and mappings of scalars (tags, categories, flat custom_fields)
+    get a shallow copy; only nested structures pay for a deepcopy.
+    """
+    result = data.copy()
+    for key, value in data.items():
+        if isinstance(value, list):
+            flat = all(isinstance(item, _IMMUTABLE_SCALARS) for item in value)
+        elif isinstance(value, dict):
+            flat = all(isinstance(item, _IMMUTABLE_SCALARS) for item in value.values())
+        else:
+            continue
+        result[key] = value.copy() if flat else copy.deepcopy(value)
+    return result
 
 
 def read_content_file(file_path: str) -> Dict:
     """
     Read markdown file and parse YAML frontmatter.
 
+    Parsed files are cached per version (see ``_cached_parse``); callers
+    get their own copy and may modify it.
+
     Args:
         file_path: Absolute path to markdown file
 
@@ -47,59 +185,157 @@ def read_content_file(file_path: str) -> Dict:
         yaml.YAMLError: If frontmatter is invalid
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Split frontmatter and body
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                frontmatter = yaml.safe_load(parts[1]) or {}
-                body = parts[2].strip()
-                return {**frontmatter, 'body': body}
-
-        # No frontmatter, entire content is body
-        return {'body': content}
+        st = os.stat(file_path)
+        return _copy_parsed(_cached_parse(file_path, st))
 
     except Exception as e:
         raise Exception(f"Failed to read {file_path}: {e}")
 
 
-def write_content_file(file_path: str, frontmatter: Dict, body: str) -> None:
-    """
-    Write markdown file with YAML frontmatter.
-
-    Args:
-        file_path: Absolute path to markdown file
-        frontmatter: Dictionary of metadata fields
-        body: Markdown body content
-    """
-    # Ensure dates are in ISO format
-    frontmatter_copy = frontmatter.copy()
-    for key in ['created_date', 'updated_date', 'publish_date']:
-        if key in frontmatter_copy and frontmatter_copy[key] is not None:
-            if isinstance(frontmatter_copy[key], date):
-                frontmatter_copy[key] = frontmatter_copy[key].isoformat()
+# Strings that YAML reads back unchanged without quoting
+_PLAIN_SCALAR = re.compile(r"[A-Za-z][A-Za-z0-9 _.,/()'&+-]*")
+# Words YAML 1.1 resolves to booleans/null when unquoted
+_YAML_KEYWORDS = frozenset({'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off', 'null'})
+# Characters json.dumps(ensure_ascii=False) leaves raw that YAML can't hold
+# in a double-quoted scalar: DEL and C1 controls, BOM/non-characters, and
+# the YAML 1.1 line breaks (NEL, U+2028/2029) that would be folded
+_YAML_UNSAFE = re.compile('[\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]')
+
+
+def _yaml_scalar(value) -> Optional[str]:
+    """Format a scalar for frontmatter, or None if it needs the full dumper."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, date):
+        # Quoted so YAML reads dates back as ISO strings, not date objects
+        return f'"{value.isoformat()}"'
+    if isinstance(value, str):
+        if (
+            _PLAIN_SCALAR.fullmatch(value)
+            and not value.endswith(' ')
+            and value.lower() not in _YAML_KEYWORDS
+        ):
+            return value
+        # A JSON string is a valid YAML double-quoted scalar (json escapes
+        # quotes, backslashes and C0 controls). Non-ASCII stays raw: escaping
+        # it would turn astral characters into surrogate pairs, which YAML
+        # rejects. The few characters YAML can't embed are escaped here.
+        return _YAML_UNSAFE.sub(
+            lambda match: f"\\u{ord(match.group()):04x}",
+            json.dumps(value, ensure_ascii=False),
+        )
+    return None
 
-    frontmatter_yaml = yaml.dump(frontmatter_copy, default_flow_style=False, allow_unicode=True)
 
-    content = f"---\n{frontmatter_yaml}---\n\n{body}"
+def _dump_frontmatter(frontmatter: Dict) -> str:
+    """
+    Emit YAML for the flat frontmatter schema without walking it in PyYAML.
 
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    Scalars, lists of scalars and flat mappings are formatted directly (keys
+    sorted, like ``yaml.dump``); anything else, e.g. a nested custom_fields
+    mapping, is handed to the dumper.
 
+    Args:
+        frontmatter: Metadata fields
 
-async def create_content_item(content_data: ContentCreate) -> ContentResponse:
+    Returns:
+        YAML document text
     """
-    Create new content item (markdown file + database index entry).
+    lines = []
+    for key in sorted(frontmatter):
+        value = frontmatter[key]
+        scalar = _yaml_scalar(value)
+        if scalar is not None:
+            lines.append(f"{key}: {scalar}\n")
+            continue
+
+        if isinstance(value, (list, dict)) and not value:
+            lines.append(f"{key}: {'[]' if isinstance(value, list) else '{}'}\n")
+            continue
+
+        if isinstance(value, list):
+            items = [_yaml_scalar(item) for item in value]
+            if None not in items:
+                lines.append(f"{key}:\n")
+                lines.extend(f"- {item}\n" for item in items)
+                continue
+
+        if isinstance(value, dict) and all(isinstance(name, str) for name in value):
+            # Flat custom_fields, indented the way yaml.dump would emit them
+            entries = [(_yaml_scalar(name), _yaml_scalar(value[name])) for name in sorted(value)]
+            if all(name is not None and item is not None for name, item in entries):
+                lines.append(f"{key}:\n")
+                lines.extend(f"  {name}: {item}\n" for name, item in entries)
+                continue
+
+        lines.append(yaml.dump(
+            {key: value}, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True
+        ))
+    return ''.join(lines)
+
+
+def write_content_file(
+    file_path: str,
+    frontmatter: Dict,
+    body: str,
+    replace_only: bool = False
+) -> bool:
+    """
+    Write markdown file with YAML frontmatter (atomically replacing it).
 
     Args:
-        content_data: Content creation data
+        file_path: Absolute path to markdown file
+        frontmatter: Dictionary of metadata fields
+        body: Markdown body content
+        replace_only: Only replace an existing file; if it was deleted in
+            the meantime, discard the new content instead of recreating it
 
     Returns:
-        Created content item with generated ID
+        True if the file was written, False if ``replace_only`` found it gone
     """
+    frontmatter_yaml = _dump_frontmatter(frontmatter)
+
+    # Write a sibling temp file and swap it in, so readers and crashes never
+    # see a partially written item. The parts go out through one buffered
+    # writer instead of being concatenated first. os.open (unlike mkstemp)
+    # keeps the usual umask-derived file mode.
+    content_dir = ensure_dir(os.path.dirname(file_path))
+    tmp_path = f"{file_path}.{uuid4().hex}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    try:
+        fd = os.open(tmp_path, flags, 0o666)
+    except FileNotFoundError:
+        # ensure_dir() remembers directories it created; this one was
+        # removed since, so create it again
+        os.makedirs(content_dir, exist_ok=True)
+        fd = os.open(tmp_path, flags, 0o666)
+    try:
+        with open(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(b'---\n')
+            f.write(frontmatter_yaml.encode('utf-8'))
+            f.write(b'---\n\n')
+            f.write(body.encode('utf-8'))
+            if settings.DURABLE_WRITES:
+                f.flush()
+                os.fsync(f.fileno())
+        # Checked as late as possible, right before the swap
+        if replace_only and not os.path.exists(file_path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, file_path)
+        return True
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def _new_content_item(content_data: ContentCreate) -> Tuple[Dict, ContentResponse]:
+    """Assign an ID and path to new content; return its frontmatter and model."""
     content_id = str(uuid4())
     file_path = _get_content_file_path(content_id, content_data.content_type)
 
@@ -121,8 +357,6 @@ async def create_content_item(content_data: ContentCreate) -> ContentResponse:
         'custom_fields': content_data.custom_fields,
     }
 
-    write_content_file(file_path, frontmatter, content_data.body)
-
     result = ContentResponse(
         id=content_id,
         file_path=file_path,
@@ -141,89 +375,188 @@ async def create_content_item(content_data: ContentCreate) -> ContentResponse:
         custom_fields=content_data.custom_fields,
         body=content_data.body
     )
+    return frontmatter, result
 
-    # Add to SQLite index
+
+async def create_content_item(content_data: ContentCreate) -> ContentResponse:
+    """
+    Create new content item (markdown file + database index entry).
+
+    Args:
+        content_data: Content creation data
+
+    Returns:
+        Created content item with generated ID
+    """
+    frontmatter, result = _new_content_item(content_data)
+
+    # The write usually ends in an fsync; run it off the event loop so concurrent
+    # requests (and concurrent creates) overlap their disk waits
+    await asyncio.to_thread(write_content_file, result.file_path, frontmatter, result.body)
+
+    # Add to SQLite index; the pool's writer lock serializes concurrent
+    # creates, so wait for it in a worker thread rather than on the loop
     from app.services import search_service
-    search_service.index_content_item(result)
+    await asyncio.to_thread(search_service.index_content_item, result)
 
     return result
 
 
-async def get_content_item(content_id: str) -> Optional[ContentResponse]:
+async def bulk_create_content_items(items: List[ContentCreate]) -> List[ContentResponse]:
     """
-    Retrieve content item by ID.
+    Create many content items, writing their files concurrently.
+
+    The index entries are added afterwards in a single transaction.
 
     Args:
-        content_id: UUID of content item
+        items: Content creation data for each item
 
     Returns:
-        Content item or None if not found
+        Created content items in the same order
     """
-    # TODO: Query SQLite index for file_path (Phase 3)
-    # For now, search common content_types
-    for content_type in ['blog', 'video', 'podcast', 'social', 'research', 'content-plans', 'website-content']:
+    created = [_new_content_item(content_data) for content_data in items]
+    semaphore = asyncio.Semaphore(BULK_READ_CONCURRENCY)
+
+    async def write(frontmatter: Dict, result: ContentResponse) -> None:
+        async with semaphore:
+            await asyncio.to_thread(write_content_file, result.file_path, frontmatter, result.body)
+
+    await asyncio.gather(*(write(frontmatter, result) for frontmatter, result in created))
+
+    results = [result for _, result in created]
+    from app.services import search_service
+    await asyncio.to_thread(search_service.index_batch, results)
+
+    return results
+
+
+def _load_content_item(file_path: str) -> ContentResponse:
+    """Read a content file into a ContentResponse."""
+    # Date fields are ISO strings; the model parses them
+    data = read_content_file(file_path)
+    return ContentResponse(
+        file_path=file_path,
+        **data
+    )
+
+
+def _locate_content_file(content_id: str) -> Optional[str]:
+    """Return the path of a content item's file, or None if it doesn't exist."""
+    # The index knows the file path; fall back to probing each content type
+    # directory for items that aren't indexed (or whose entry is stale)
+    from app.services import search_service
+    file_path = search_service.get_file_path(content_id)
+    if file_path and os.path.exists(file_path):
+        return file_path
+
+    for content_type in CONTENT_TYPES:
         file_path = _get_content_file_path(content_id, content_type)
         if os.path.exists(file_path):
-            data = read_content_file(file_path)
-
-            # Convert string dates back to date objects
-            for key in ['created_date', 'updated_date', 'publish_date']:
-                if key in data and data[key] is not None:
-                    if isinstance(data[key], str):
-                        data[key] = date.fromisoformat(data[key])
-
-            return ContentResponse(
-                file_path=file_path,
-                **data
-            )
+            return file_path
     return None
 
 
-async def update_content_item(content_id: str, updates: ContentUpdate) -> Optional[ContentResponse]:
+def _find_content_item(content_id: str) -> Optional[ContentResponse]:
+    """Look up and read a content item (blocking file I/O)."""
+    file_path = _locate_content_file(content_id)
+    return _load_content_item(file_path) if file_path else None
+
+
+def _locate_and_read(content_id: str) -> Optional[Tuple[str, Dict]]:
+    """Find a content item's file and parse it (blocking file I/O)."""
+    file_path = _locate_content_file(content_id)
+    return (file_path, read_content_file(file_path)) if file_path else None
+
+
+def _delete_content_file(content_id: str) -> bool:
+    """Delete a content item's file if it exists (blocking file I/O)."""
+    # Only the path is needed, so skip parsing the file
+    file_path = _locate_content_file(content_id)
+    if not file_path:
+        return False
+    os.remove(file_path)
+    return True
+
+
+async def get_content_item(content_id: str) -> Optional[ContentResponse]:
     """
-    Update existing content item.
+    Retrieve content item by ID.
 
     Args:
         content_id: UUID of content item
-        updates: Fields to update
 
     Returns:
-        Updated content item or None if not found
+        Content item or None if not found
     """
-    existing = await get_content_item(content_id)
-    if not existing:
-        return None
+    return await asyncio.to_thread(_find_content_item, content_id)
 
-    data = read_content_file(existing.file_path)
 
-    # Apply updates
-    update_dict = updates.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        if key == 'body':
-            data['body'] = value
-        else:
-            data[key] = value
+async def bulk_get_content_items(content_ids: List[str]) -> List[Optional[ContentResponse]]:
+    """
+    Retrieve many content items, reading their files concurrently.
 
-    data['updated_date'] = date.today().isoformat()
+    Args:
+        content_ids: UUIDs of content items
 
-    body = data.pop('body', '')
-    write_content_file(existing.file_path, data, body)
+    Returns:
+        Content items in the same order (None where not found)
+    """
+    semaphore = asyncio.Semaphore(BULK_READ_CONCURRENCY)
 
-    # Convert string dates back to date objects
-    for key in ['created_date', 'updated_date', 'publish_date']:
-        if key in data and data[key] is not None:
-            if isinstance(data[key], str):
-                data[key] = date.fromisoformat(data[key])
+    async def read(content_id: str) -> Optional[ContentResponse]:
+        async with semaphore:
+            return await asyncio.to_thread(_find_content_item, content_id)
 
-    result = ContentResponse(
-        file_path=existing.file_path,
-        body=body,
-        **data
-    )
+    return await asyncio.gather(*(read(content_id) for content_id in content_ids))
 
-    # Update SQLite index
-    from app.services import search_service
-    search_service.index_content_item(result)
+
+def _item_lock(content_id: str) -> asyncio.Lock:
+    """Return the lock serializing changes to one content item."""
+    lock = _item_locks.get(content_id)
+    if lock is None:
+        lock = _item_locks[content_id] = asyncio.Lock()
+    return lock
+
+
+async def update_content_item(content_id: str, updates: ContentUpdate) -> Optional[ContentResponse]:
+    """
+    Update existing content item.
+
+    Args:
+        content_id: UUID of content item
+        updates: Fields to update
+
+    Returns:
+        Updated content item or None if not found
+    """
+    # Read, merge, write and reindex as one step per item, so concurrent
+    # updates apply on top of each other instead of racing
+    async with _item_lock(content_id):
+        # Parse the file once and update its raw frontmatter directly
+        found = await asyncio.to_thread(_locate_and_read, content_id)
+        if found is None:
+            return None
+        file_path, data = found
+
+        # Apply only the fields the caller set; the body is a plain key here
+        data.update(updates.model_dump(exclude_unset=True))
+        data['updated_date'] = date.today().isoformat()
+
+        body = data.pop('body', '')
+        # The file may still be deleted outside this process; don't bring
+        # it back (or re-add its index entry) if so
+        if not await asyncio.to_thread(write_content_file, file_path, data, body, True):
+            return None
+
+        result = ContentResponse(
+            file_path=file_path,
+            body=body,
+            **data
+        )
+
+        # Update SQLite index
+        from app.services import search_service
+        await asyncio.to_thread(search_service.index_content_item, result)
 
     return result
 
@@ -238,14 +571,14 @@ async def delete_content_item(content_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    existing = await get_content_item(content_id)
-    if not existing:
-        return False
-
-    os.remove(existing.file_path)
-
-    # Remove from SQLite index
-    from app.services import search_service
-    search_service.remove_from_index(content_id)
+    # Shares the update lock, so a delete never lands between an update's
+    # read and its write (which would recreate the file and index entry)
+    async with _item_lock(content_id):
+        if not await asyncio.to_thread(_delete_content_file, content_id):
+            return False
+
+        # Remove from SQLite index
+        from app.services import search_service
+        await asyncio.to_thread(search_service.remove_from_index, content_id)
 
     return True
@@ -4,79 +4,284 @@ This service manages the SQLite index for fast searching and filtering.
 It provides full-text search using FTS5 and metadata-based filtering.
 """
 
+import logging
+import multiprocessing
+import os
 import sqlite3
-import json
-from typing import List, Optional, Dict, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import ContextManager, Iterable, Iterator, List, Optional, Dict, Tuple
 from pathlib import Path
 from datetime import date
 
+from cachetools import TTLCache
+import orjson
+
 from app.config import settings
-from app.models.content import ContentResponse
-from app.services.markdown_service import read_content_file
+from app.db.init_db import (
+    create_content_indexes,
+    create_fts_triggers,
+    drop_content_indexes,
+    drop_fts_triggers,
+)
+from app.db.pool import ConnectionPool, get_pool
+from app.models.content import ContentHit, ContentResponse
+from app.services.markdown_service import BULK_READ_CONCURRENCY, read_content_file
+
+logger = logging.getLogger(__name__)
 
 
-def get_db_connection():
-    """Get SQLite database connection.
+def get_db_connection() -> ContextManager[sqlite3.Connection]:
+    """Borrow a pooled SQLite connection for the duration of a ``with`` block.
 
     Returns:
-        sqlite3.Connection: Database connection with row factory configured
+        Context manager yielding a PRAGMA-configured connection with row
+        factory set; it goes back to the pool on exit
     """
-    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    return conn
+    return get_db_pool().connection()
 
 
-def index_content_item(content: ContentResponse) -> None:
+def get_db_pool() -> ConnectionPool:
+    """Get the shared connection pool for the content index database.
+
+    Returns:
+        ConnectionPool: Pool of PRAGMA-configured connections
     """
-    Add or update content item in SQLite index.
+    return get_pool(settings.DATABASE_URL.replace("sqlite:///", ""))
+
+
+# Multi-row INSERT statements used by the indexer: a prefix plus one
+# placeholder group per row, repeated up to the bound parameter limit.
+# Rows are upserted (not REPLACEd) so the rowid is stable and the
+# content_fts sync triggers see a plain UPDATE. Tags/categories live in the
+# junction tables; the legacy *_json columns are left NULL (and cleared on
+# update) so the text isn't stored twice.
+CONTENT_ITEMS_INSERT = """
+    INSERT INTO content_items (
+        id, file_path, title, content_type, status, created_date, updated_date,
+        publish_date, author, client, url, description,
+        custom_fields_json, body, tags, last_indexed
+    ) VALUES """
+CONTENT_ITEMS_ROW = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))"
+CONTENT_ITEMS_UPSERT = """
+    ON CONFLICT(id) DO UPDATE SET
+        file_path = excluded.file_path,
+        title = excluded.title,
+        content_type = excluded.content_type,
+        status = excluded.status,
+        created_date = excluded.created_date,
+        updated_date = excluded.updated_date,
+        publish_date = excluded.publish_date,
+        author = excluded.author,
+        client = excluded.client,
+        url = excluded.url,
+        description = excluded.description,
+        categories_json = NULL,
+        tags_json = NULL,
+        custom_fields_json = excluded.custom_fields_json,
+        body = excluded.body,
+        tags = excluded.tags,
+        last_indexed = excluded.last_indexed
+"""
+
+# Columns every search result needs (the potentially large body is never read)
+REQUIRED_COLUMNS = ("id", "file_path", "title", "content_type", "status", "created_date", "updated_date")
+
+# Result fields that callers may project away, mapped to their source column
+OPTIONAL_COLUMNS = {
+    "publish_date": "publish_date",
+    "author": "author",
+    "client": "client",
+    "url": "url",
+    "description": "description",
+    "custom_fields": "custom_fields_json",
+}
+
+# Junction tables holding tags/categories (table, value column, item attribute)
+JUNCTION_TABLES = (
+    ("content_tags", "tag", "tags"),
+    ("content_categories", "category", "categories"),
+)
+
+# Per-item junction statements, built once so every call passes the same
+# SQL text and hits the connection's prepared statement cache
+JUNCTION_DELETE_SQL = {
+    table: f"DELETE FROM {table} WHERE content_id = ?" for table, _, _ in JUNCTION_TABLES
+}
+JUNCTION_INSERT_SQL = {
+    table: f"INSERT OR IGNORE INTO {table} (content_id, {column}, position) VALUES (?, ?, ?)"
+    for table, column, _ in JUNCTION_TABLES
+}
+
+# Chunk size for incremental body reads
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Index rebuilds parse in worker processes once a library has this many
+# files (below it, process startup costs more than it saves), handing each
+# worker this many files at a time
+PARALLEL_PARSE_MIN_FILES = 500
+PARSE_CHUNK_SIZE = 32
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER; bounds rows per multi-row INSERT
+SQLITE_MAX_PARAMS = 999
+
+# COUNT(*) results keyed by database + filters. Entries expire quickly and
+# the whole cache is cleared whenever the index is written.
+_count_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+_count_cache_lock = threading.Lock()
+
+# Filter dropdown values keyed by database + field; cleared on the same writes.
+_unique_values_cache: TTLCache = TTLCache(maxsize=32, ttl=60)
+
+# Complete, ordered result ID lists of recent searches keyed like counts, so
+# a follow-up export with the same filters is a primary-key lookup instead of
+# another FTS/filter evaluation. Cleared on the same writes.
+_recent_search_ids: TTLCache = TTLCache(maxsize=1024, ttl=120)
+
+# Bumped on every index write so derived artifacts (e.g. exports) can tell
+# whether they were built from the current index.
+_index_generation = 0
+
+
+def _date_param(value) -> Optional[str]:
+    """Convert a date (or ISO string) to the string stored in SQLite."""
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _content_item_params(content: ContentResponse) -> tuple:
+    """Build the content_items parameter tuple for a content item."""
+    return (
+        content.id,
+        content.file_path,
+        content.title,
+        content.content_type,
+        content.status,
+        _date_param(content.created_date),
+        _date_param(content.updated_date),
+        _date_param(content.publish_date),
+        content.author,
+        content.client,
+        content.url,
+        content.description,
+        # Most items have no custom fields; NULL lets readers skip parsing
+        orjson.dumps(content.custom_fields).decode() if content.custom_fields else None,
+        content.body or '',
+        ' '.join(content.tags),
+    )
+
+
+def _insert_rows(
+    cursor: sqlite3.Cursor,
+    insert_sql: str,
+    row_sql: str,
+    rows: List[tuple],
+    suffix_sql: str = ""
+) -> None:
+    """
+    Insert rows with multi-row ``INSERT ... VALUES (...),(...)`` statements.
+
+    Rows are chunked so each statement stays within SQLite's bound parameter
+    limit. A final partial chunk is split into power-of-two sizes, so only a
+    handful of distinct statements is ever compiled and cached.
 
     Args:
-        content: Content item to index
+        cursor: Cursor on an open transaction
+        insert_sql: Statement prefix ending in ``VALUES``
+        row_sql: Placeholder group for a single row
+        rows: Parameter tuples to insert
+        suffix_sql: Optional clause appended to each statement (e.g. ``ON CONFLICT``)
     """
-    conn = get_db_connection()
+    if not rows:
+        return
+
+    batch_size = max(1, SQLITE_MAX_PARAMS // len(rows[0]))
+
+    start = 0
+    while start < len(rows):
+        remaining = len(rows) - start
+        row_count = batch_size if remaining >= batch_size else 1 << (remaining.bit_length() - 1)
+        batch = rows[start:start + row_count]
+        sql = _multi_row_sql(insert_sql, row_sql, row_count, suffix_sql)
+        cursor.execute(sql, [value for row in batch for value in row])
+        start += row_count
+
+
+@lru_cache(maxsize=64)
+def _multi_row_sql(insert_sql: str, row_sql: str, row_count: int, suffix_sql: str) -> str:
+    """Build (once per size) a multi-row INSERT for ``row_count`` rows."""
+    return insert_sql + ', '.join([row_sql] * row_count) + suffix_sql
+
+
+def index_batch(
+    items: Iterable[ContentResponse],
+    conn: Optional[sqlite3.Connection] = None,
+    commit: bool = True,
+    fresh: bool = False
+) -> int:
+    """
+    Add or update many content items in the SQLite index in one transaction.
+
+    Args:
+        items: Content items to index (any iterable, e.g. a generator)
+        conn: Optional open connection (the pool's writer is used if omitted)
+        commit: Commit when done; pass False to leave the caller's transaction open
+        fresh: The index was just cleared, so there are no old tag/category
+            rows to delete first
+
+    Returns:
+        Number of items indexed
+    """
+    # Items are walked once per table, so one-shot iterables are collected
+    items = items if isinstance(items, list) else list(items)
+
+    pool = get_db_pool() if conn is None else None
+    if pool:
+        conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
-        cursor.execute("""
-            INSERT OR REPLACE INTO content_items (
-                id, file_path, title, content_type, status, created_date, updated_date,
-                publish_date, author, client, url, description, categories_json, tags_json,
-                custom_fields_json, last_indexed
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-        """, (
-            content.id,
-            content.file_path,
-            content.title,
-            content.content_type,
-            content.status,
-            content.created_date.isoformat() if isinstance(content.created_date, date) else content.created_date,
-            content.updated_date.isoformat() if isinstance(content.updated_date, date) else content.updated_date,
-            content.publish_date.isoformat() if content.publish_date and isinstance(content.publish_date, date) else content.publish_date,
-            content.author,
-            content.client,
-            content.url,
-            content.description,
-            json.dumps(content.categories),
-            json.dumps(content.tags),
-            json.dumps(content.custom_fields),
-        ))
-
-        # Update FTS index
-        cursor.execute("""
-            INSERT OR REPLACE INTO content_fts (id, title, description, body, tags)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            content.id,
-            content.title,
-            content.description or '',
-            content.body or '',
-            ' '.join(content.tags),
-        ))
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
 
-        conn.commit()
+        # content_fts is updated by triggers on content_items
+        _insert_rows(cursor, CONTENT_ITEMS_INSERT, CONTENT_ITEMS_ROW,
+                     [_content_item_params(item) for item in items], CONTENT_ITEMS_UPSERT)
+        for table, _, attribute in JUNCTION_TABLES:
+            if not fresh:
+                cursor.executemany(JUNCTION_DELETE_SQL[table], ((item.id,) for item in items))
+            # executemany streams parameter rows from the generators, so no
+            # per-tag list is built for large batches
+            cursor.executemany(
+                JUNCTION_INSERT_SQL[table],
+                (
+                    (item.id, value, position)
+                    for item in items
+                    for position, value in enumerate(getattr(item, attribute))
+                ),
+            )
+
+        if commit:
+            conn.commit()
+            _invalidate_count_cache()
+        return len(items)
+    except Exception:
+        if commit:
+            conn.rollback()
+        raise
     finally:
-        conn.close()
+        if pool:
+            pool.release_writer(conn)
+
+
+def index_content_item(content: ContentResponse) -> None:
+    """
+    Add or update content item in SQLite index.
+
+    Args:
+        content: Content item to index
+    """
+    index_batch([content])
 
 
 def remove_from_index(content_id: str) -> None:
@@ -85,15 +290,482 @@ def remove_from_index(content_id: str) -> None:
     Args:
         content_id: UUID of content item to remove
     """
-    conn = get_db_connection()
+    pool = get_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
+        # content_fts and the tag/category rows are cleaned up by the
+        # content_items delete trigger
         cursor.execute("DELETE FROM content_items WHERE id = ?", (content_id,))
-        cursor.execute("DELETE FROM content_fts WHERE id = ?", (content_id,))
         conn.commit()
+        _invalidate_count_cache()
+    finally:
+        pool.release_writer(conn)
+
+
+def get_file_path(content_id: str) -> Optional[str]:
+    """Look up the markdown file path of an indexed content item.
+
+    Args:
+        content_id: UUID of content item
+
+    Returns:
+        Indexed file path, or None if the item isn't indexed
+    """
+    pool = get_db_pool()
+    conn = pool.acquire()
+
+    try:
+        row = conn.execute(
+            "SELECT file_path FROM content_items WHERE id = ?", (content_id,)
+        ).fetchone()
+        return row[0] if row else None
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+def open_body_stream(content_id: str) -> Optional[Iterator[bytes]]:
+    """
+    Open an incremental reader over an item's indexed markdown body.
+
+    The body is read with SQLite blob I/O in fixed-size chunks, so a long
+    article is never materialized as a single Python string.
+
+    Args:
+        content_id: UUID of content item
+
+    Returns:
+        Iterator of UTF-8 encoded chunks, or None if the item isn't indexed
+    """
+    pool = get_db_pool()
+    conn = pool.acquire()
+
+    try:
+        row = conn.execute(
+            "SELECT rowid, body IS NOT NULL FROM content_items WHERE id = ?", (content_id,)
+        ).fetchone()
+    except Exception:
+        pool.release(conn)
+        raise
+
+    if row is None:
+        pool.release(conn)
+        return None
+
+    def read_chunks() -> Iterator[bytes]:
+        try:
+            if not row[1]:
+                return
+            with conn.blobopen("content_items", "body", row[0], readonly=True) as blob:
+                while chunk := blob.read(BODY_CHUNK_SIZE):
+                    yield chunk
+        finally:
+            pool.release(conn)
+
+    return read_chunks()
+
+
+def _load_junction_values(
+    cursor: sqlite3.Cursor,
+    table: str,
+    column: str,
+    content_ids: List[str]
+) -> Dict[str, List[str]]:
+    """
+    Load tag or category lists for a set of content items.
+
+    Args:
+        cursor: Open database cursor
+        table: Junction table name
+        column: Value column in the junction table
+        content_ids: Content item IDs to load values for
+
+    Returns:
+        Mapping of content ID to its values in original order
+    """
+    values: Dict[str, List[str]] = {}
+    for start in range(0, len(content_ids), SQLITE_MAX_PARAMS):
+        batch = content_ids[start:start + SQLITE_MAX_PARAMS]
+        # Padding the IN list keeps the number of distinct statements (and
+        # prepared statement cache entries) to a handful of sizes
+        slots = min(_in_slots(batch), SQLITE_MAX_PARAMS)
+        cursor.execute(_junction_sql(table, column, slots), _pad(batch, slots))
+        for content_id, value in cursor.fetchall():
+            values.setdefault(content_id, []).append(value)
+    return values
+
+
+@lru_cache(maxsize=64)
+def _junction_sql(table: str, column: str, id_slots: int) -> str:
+    """Build the SQL loading junction values for ``id_slots`` content IDs."""
+    return (
+        f"SELECT content_id, {column} FROM {table}"
+        f" WHERE content_id IN ({','.join('?' * id_slots)}) ORDER BY content_id, position"
+    )
+
+
+def encode_cursor(item: ContentHit) -> str:
+    """Build a keyset pagination cursor pointing just past ``item``."""
+    return f"{_date_param(item.updated_date)},{item.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Parse a keyset pagination cursor.
+
+    Args:
+        cursor: Cursor string in ``<updated_date>,<id>`` form
+
+    Returns:
+        Tuple of (updated_date, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    updated_date, sep, content_id = cursor.partition(',')
+    if not sep or not content_id:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    date.fromisoformat(updated_date)
+    return updated_date, content_id
+
+
+def _count_cache_key(*filters) -> tuple:
+    """Build a hashable count-cache key for a database and filter combination."""
+    return (settings.DATABASE_URL,) + tuple(
+        tuple(value) if isinstance(value, list) else value for value in filters
+    )
+
+
+def _invalidate_count_cache() -> None:
+    """Drop cached counts, filter values and result IDs after the index changes."""
+    global _index_generation
+    with _count_cache_lock:
+        _count_cache.clear()
+        _unique_values_cache.clear()
+        _recent_search_ids.clear()
+        _index_generation += 1
+
+
+def index_generation() -> int:
+    """Get a counter that changes whenever the index is written.
+
+    Returns:
+        Current index generation for this process
+    """
+    return _index_generation
+
+
+def _normalize_filter(values: Optional[List[str]]) -> Optional[List[str]]:
+    """Canonicalize an IN-list filter (deduplicated, sorted; None when empty).
+
+    Filter order and repeats don't change which rows match, so equivalent
+    requests share a count-cache entry and a statement shape.
+    """
+    return sorted(set(values)) if values else None
+
+
+def _in_slots(values: Optional[List[str]]) -> int:
+    """Round an IN-list length up to a power of two (0 when the filter is unused)."""
+    if not values:
+        return 0
+    slots = 1
+    while slots < len(values):
+        slots *= 2
+    return slots
+
+
+def _pad(values: Optional[List[str]], slots: int) -> List[Optional[str]]:
+    """Pad IN-list values with NULLs (which never match) up to ``slots``."""
+    if not slots:
+        return []
+    return list(values) + [None] * (slots - len(values))
+
+
+# Double quotes are the only special character inside an FTS5 string
+_FTS_QUOTE = str.maketrans({'"': '""'})
+
+
+@lru_cache(maxsize=1024)
+def _fts_query(query: str) -> Optional[str]:
+    """
+    Escape a user search string into a safe FTS5 MATCH expression.
+
+    Each whitespace-separated term becomes a quoted phrase (ANDed together),
+    so punctuation and words like AND/NOT/NEAR are searched literally rather
+    than parsed as query syntax. A trailing ``*`` keeps prefix matching.
+
+    Args:
+        query: Raw search string
+
+    Returns:
+        MATCH expression, or None when the query has no terms
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*") and term.rstrip("*")
+        phrase = f'"{(prefix or term).translate(_FTS_QUOTE)}"'
+        terms.append(f"{phrase}*" if prefix else phrase)
+    return " ".join(terms) or None
+
+
+def _match_expression(query: str, tags: Optional[List[str]]) -> str:
+    """
+    Narrow a full-text query to rows whose indexed tags mention a filter tag.
+
+    content_fts tokenizes the space-joined tags, so the ``tags`` column
+    filter is a superset of the exact match; the content_tags condition
+    still decides membership. It only shrinks the FTS candidate set.
+    Tags without any word characters tokenize to nothing and can't be
+    expressed, so the query is left as is.
+
+    Args:
+        query: Escaped FTS5 query from ``_fts_query``
+        tags: Normalized tag filter
+
+    Returns:
+        MATCH expression to bind
+    """
+    if not tags or not all(any(ch.isalnum() for ch in tag) for tag in tags):
+        return query
+    phrases = " OR ".join('"' + tag.replace('"', '""') + '"' for tag in tags)
+    return f"({query}) AND tags : ({phrases})"
+
+
+@lru_cache(maxsize=256)
+def _search_sql(
+    has_query: bool,
+    type_slots: int,
+    status_slots: int,
+    tag_slots: int,
+    has_client: bool,
+    has_date_from: bool,
+    has_date_to: bool,
+    select_columns: Tuple[str, ...],
+    ranked: bool = False
+) -> Tuple[str, str, str]:
+    """
+    Build the SQL for one filter shape and column projection.
+
+    When ``ranked`` (and there is a query), the offset-paged SQL joins the
+    FTS matches with their bm25() score and orders by relevance; the count
+    and keyset SQL are unaffected.
+
+    Returns:
+        Tuple of (count SQL, offset-paged SQL, keyset-paged SQL)
+    """
+    conditions = []
+
+    if has_query:
+        # Use FTS for full-text search
+        conditions.append("rowid IN (SELECT rowid FROM content_fts WHERE content_fts MATCH ?)")
+
+    if type_slots:
+        conditions.append(f"content_type IN ({','.join('?' * type_slots)})")
+
+    if status_slots:
+        conditions.append(f"status IN ({','.join('?' * status_slots)})")
+
+    if tag_slots:
+        # Match any tag (OR logic). An uncorrelated list subquery probes the
+        # tag index once; a correlated EXISTS would be evaluated per row.
+        conditions.append(
+            "id IN (SELECT content_id FROM content_tags"
+            f" WHERE tag IN ({','.join('?' * tag_slots)}))"
+        )
+
+    if has_client:
+        conditions.append("client = ?")
+
+    if has_date_from:
+        conditions.append("created_date >= ?")
+
+    if has_date_to:
+        conditions.append("created_date <= ?")
+
+    where = " AND ".join(conditions) or "1=1"
+    select = f"SELECT {', '.join(select_columns)} FROM content_items"
+    page_sql = f"{select} WHERE {where} ORDER BY updated_date DESC, id DESC LIMIT ? OFFSET ?"
+
+    if has_query and ranked:
+        # The MATCH moves into a joined subquery (still bound first) so each
+        # match carries its score; bm25() is lower for better matches
+        ranked_where = " AND ".join(conditions[1:]) or "1=1"
+        page_sql = (
+            f"{select} JOIN (SELECT rowid AS match_rowid, bm25(content_fts) AS match_rank"
+            " FROM content_fts WHERE content_fts MATCH ?) AS matches"
+            f" ON content_items.rowid = matches.match_rowid WHERE {ranked_where}"
+            " ORDER BY matches.match_rank, updated_date DESC, id DESC LIMIT ? OFFSET ?"
+        )
+
+    # With no filters, leave out the WHERE entirely: only a bare COUNT(*)
+    # gets SQLite's count optimization (even "WHERE 1=1" makes it step
+    # through every row of an index)
+    count_sql = "SELECT COUNT(*) FROM content_items"
+    if conditions:
+        count_sql += f" WHERE {where}"
+
+    return (
+        count_sql,
+        page_sql,
+        f"{select} WHERE {where} AND (updated_date, id) < (?, ?)"
+        " ORDER BY updated_date DESC, id DESC LIMIT ?",
+    )
+
+
+@lru_cache(maxsize=64)
+def _ids_sql(id_slots: int, select_columns: Tuple[str, ...]) -> str:
+    """Build the SQL that re-reads known result IDs in search order."""
+    return (
+        f"SELECT {', '.join(select_columns)} FROM content_items"
+        f" WHERE id IN ({','.join('?' * id_slots)})"
+        " ORDER BY updated_date DESC, id DESC LIMIT ?"
+    )
+
+
+def _search_params(
+    query: Optional[str],
+    content_types: Optional[List[str]],
+    statuses: Optional[List[str]],
+    tags: Optional[List[str]],
+    client: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    select_columns: Tuple[str, ...],
+    ranked: bool = False
+) -> Tuple[Tuple[str, str, str], List]:
+    """
+    Resolve the cached SQL and bound parameters for a set of filters.
+
+    Returns:
+        Tuple of ((count SQL, offset-paged SQL, keyset-paged SQL), filter params)
+    """
+    # Statement text depends only on the filter shape and projection, so
+    # repeated searches reuse the connection's prepared statement cache
+    type_slots = _in_slots(content_types)
+    status_slots = _in_slots(statuses)
+    tag_slots = _in_slots(tags)
+    sql = _search_sql(
+        bool(query), type_slots, status_slots, tag_slots,
+        bool(client), bool(date_from), bool(date_to), select_columns, ranked,
+    )
+
+    params = []
+    if query:
+        params.append(_match_expression(query, tags))
+    params.extend(_pad(content_types, type_slots))
+    params.extend(_pad(statuses, status_slots))
+    params.extend(_pad(tags, tag_slots))
+    if client:
+        params.append(client)
+    if date_from:
+        params.append(date_from)
+    if date_to:
+        params.append(date_to)
+
+    return sql, params
+
+
+def _projection(columns: Optional[List[str]]) -> Tuple[set, List[str], Tuple[str, ...]]:
+    """
+    Resolve requested result fields to the columns that must be selected.
+
+    Returns:
+        Tuple of (wanted field names, optional fields to read, SELECT columns)
+    """
+    if columns is None:
+        # Default listings (every field) reuse the projection built at import
+        return _FULL_PROJECTION
+    wanted = set(columns)
+    optional_fields = [field for field in OPTIONAL_COLUMNS if field in wanted]
+    select_columns = REQUIRED_COLUMNS + tuple(OPTIONAL_COLUMNS[field] for field in optional_fields)
+    return wanted, optional_fields, select_columns
+
+
+# Shared by every default call; callers only read it
+_FULL_PROJECTION = _projection([*OPTIONAL_COLUMNS, "tags", "categories"])
+
+
+# Stored dates are ISO strings with few distinct values, and dates are
+# immutable, so each string is parsed once and the object shared by rows
+_iso_date = lru_cache(maxsize=8192)(date.fromisoformat)
+
+
+def _rows_to_content(
+    cursor: sqlite3.Cursor,
+    rows: List[tuple],
+    wanted: set,
+    optional_fields: List[str]
+) -> List[ContentHit]:
+    """
+    Convert selected content_items rows to ContentHit objects.
+
+    Args:
+        cursor: Cursor used to load tags/categories for these rows
+        rows: Tuple rows selected with the columns from ``_projection``
+        wanted: Requested field names
+        optional_fields: Optional fields present in the rows
+
+    Returns:
+        Content items (rows that fail to parse are skipped)
+    """
+    # Tags/categories come from the junction tables, not the JSON columns
+    row_ids = [row[0] for row in rows]
+    item_tags = (
+        _load_junction_values(cursor, "content_tags", "tag", row_ids)
+        if "tags" in wanted else {}
+    )
+    item_categories = (
+        _load_junction_values(cursor, "content_categories", "category", row_ids)
+        if "categories" in wanted else {}
+    )
+
+    # Rows are plain tuples: REQUIRED_COLUMNS first, then the optional
+    # fields in order. Lookups are bound to locals for the loop. Items are
+    # slotted dataclasses rather than pydantic models: index values were
+    # validated when saved, and rows whose dates or custom fields fail to
+    # parse are still skipped.
+    optional_positions = tuple(enumerate(optional_fields, len(REQUIRED_COLUMNS)))
+    has_publish_date = 'publish_date' in optional_fields
+    has_custom_fields = 'custom_fields' in optional_fields
+    from_iso = _iso_date
+    loads = orjson.loads
+    today = date.today()
+    no_values: List[str] = []
+    get_tags = item_tags.get
+    get_categories = item_categories.get
+
+    results = []
+    append = results.append
+    for row in rows:
+        content_id, file_path, title, content_type, status, created, updated = row[:7]
+        try:
+            fields = {field: row[position] for position, field in optional_positions}
+            if has_publish_date and fields['publish_date']:
+                fields['publish_date'] = from_iso(fields['publish_date'])
+            if has_custom_fields:
+                custom_fields = fields['custom_fields']
+                # '{}' is what older index versions stored for no fields
+                fields['custom_fields'] = loads(custom_fields) if custom_fields and custom_fields != '{}' else {}
+
+            append(ContentHit(
+                id=content_id,
+                file_path=file_path,
+                title=title,
+                content_type=content_type,
+                # The column is nullable; match the model's default
+                status=status or "draft",
+                created_date=from_iso(created) if created else today,
+                updated_date=from_iso(updated) if updated else today,
+                categories=get_categories(content_id, no_values),
+                tags=get_tags(content_id, no_values),
+                **fields,
+            ))
+        except Exception as e:
+            logger.warning("Error parsing row %s: %s", content_id, e)
+            continue
+
+    return results
 
 
 def search_content(
@@ -105,8 +777,11 @@ def search_content(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0
-) -> Tuple[List[ContentResponse], int]:
+    offset: int = 0,
+    cursor: Optional[Tuple[str, str]] = None,
+    columns: Optional[List[str]] = None,
+    ranked: bool = False
+) -> Tuple[List[ContentHit], int]:
     """
     Search and filter content items.
 
@@ -119,139 +794,228 @@ def search_content(
         date_from: Filter by created_date >= this date
         date_to: Filter by created_date <= this date
         limit: Maximum results to return
-        offset: Pagination offset
+        offset: Pagination offset (ignored when ``cursor`` is given)
+        cursor: Keyset position (updated_date, id) from ``decode_cursor``;
+            returns rows after it without scanning past an OFFSET
+        columns: Result fields to load (None = all). Required fields are
+            always returned; other unselected fields keep their defaults and
+            are neither read from SQLite nor parsed
+        ranked: Order query matches by bm25 relevance instead of most
+            recently updated (offset pagination only; ignored without a query)
 
     Returns:
         Tuple of (list of matching content items, total count)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    query = _fts_query(query) if query else None
+    content_types, statuses, tags = map(_normalize_filter, (content_types, statuses, tags))
+    wanted, optional_fields, select_columns = _projection(columns)
+    (count_sql, page_sql, keyset_sql), params = _search_params(
+        query, content_types, statuses, tags, client, date_from, date_to, select_columns, ranked
+    )
+
+    pool = get_db_pool()
+    conn = pool.acquire()
+    db_cursor = conn.cursor()
+    db_cursor.row_factory = None  # plain tuples; columns are known by position
 
     try:
-        # Build query
-        sql = "SELECT * FROM content_items WHERE 1=1"
-        count_sql = "SELECT COUNT(*) FROM content_items WHERE 1=1"
-        params = []
-
-        if query:
-            # Use FTS for full-text search
-            sql += " AND id IN (SELECT id FROM content_fts WHERE content_fts MATCH ?)"
-            count_sql += " AND id IN (SELECT id FROM content_fts WHERE content_fts MATCH ?)"
-            params.append(query)
-
-        if content_types:
-            placeholders = ','.join('?' * len(content_types))
-            sql += f" AND content_type IN ({placeholders})"
-            count_sql += f" AND content_type IN ({placeholders})"
-            params.extend(content_types)
-
-        if statuses:
-            placeholders = ','.join('?' * len(statuses))
-            sql += f" AND status IN ({placeholders})"
-            count_sql += f" AND status IN ({placeholders})"
-            params.extend(statuses)
-
-        if tags:
-            # Match any tag (OR logic)
-            tag_conditions = ' OR '.join([f"tags_json LIKE ?" for _ in tags])
-            sql += f" AND ({tag_conditions})"
-            count_sql += f" AND ({tag_conditions})"
-            params.extend([f'%"{tag}"%' for tag in tags])
-
-        if client:
-            sql += " AND client = ?"
-            count_sql += " AND client = ?"
-            params.append(client)
-
-        if date_from:
-            sql += " AND created_date >= ?"
-            count_sql += " AND created_date >= ?"
-            params.append(date_from)
-
-        if date_to:
-            sql += " AND created_date <= ?"
-            count_sql += " AND created_date <= ?"
-            params.append(date_to)
-
-        # Get total count
-        cursor.execute(count_sql, params)
-        total = cursor.fetchone()[0]
+        cache_key = _count_cache_key(query, content_types, statuses, tags, client, date_from, date_to)
+        with _count_cache_lock:
+            total = _count_cache.get(cache_key)
+            generation = _index_generation
 
         # Get paginated results
-        sql += " ORDER BY updated_date DESC LIMIT ? OFFSET ?"
-        cursor.execute(sql, params + [limit, offset])
-        rows = cursor.fetchall()
-
-        # Convert rows to ContentResponse objects
-        results = []
-        for row in rows:
-            try:
-                results.append(ContentResponse(
-                    id=row['id'],
-                    file_path=row['file_path'],
-                    title=row['title'],
-                    content_type=row['content_type'],
-                    status=row['status'],
-                    created_date=date.fromisoformat(row['created_date']) if row['created_date'] else date.today(),
-                    updated_date=date.fromisoformat(row['updated_date']) if row['updated_date'] else date.today(),
-                    publish_date=date.fromisoformat(row['publish_date']) if row['publish_date'] else None,
-                    author=row['author'],
-                    client=row['client'],
-                    url=row['url'],
-                    description=row['description'],
-                    categories=json.loads(row['categories_json']) if row['categories_json'] else [],
-                    tags=json.loads(row['tags_json']) if row['tags_json'] else [],
-                    custom_fields=json.loads(row['custom_fields_json']) if row['custom_fields_json'] else {},
-                ))
-            except Exception as e:
-                print(f"Error parsing row {row['id']}: {e}")
-                continue
-
-        return results, total
+        if cursor:
+            db_cursor.execute(keyset_sql, params + [cursor[0], cursor[1], limit])
+        else:
+            db_cursor.execute(page_sql, params + [limit, offset])
+        rows = db_cursor.fetchall()
+
+        # Get total count (cached briefly per filter combination). A short
+        # offset page ends the result set, so its total needs no COUNT query.
+        if total is None:
+            if not cursor and len(rows) < limit and (rows or not offset):
+                total = offset + len(rows)
+            else:
+                db_cursor.execute(count_sql, params)
+                total = db_cursor.fetchone()[0]
+            with _count_cache_lock:
+                if _index_generation == generation:
+                    _count_cache[cache_key] = total
+
+        # A first page holding every match is the full result set
+        if not cursor and not offset and len(rows) == total and total <= SQLITE_MAX_PARAMS:
+            with _count_cache_lock:
+                if _index_generation == generation:
+                    _recent_search_ids[cache_key] = tuple(row[0] for row in rows)
+
+        return _rows_to_content(db_cursor, rows, wanted, optional_fields), total
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+def iter_search_content(
+    query: Optional[str] = None,
+    content_types: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    client: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = 50,
+    columns: Optional[List[str]] = None,
+    chunk_size: int = 100
+) -> Iterator[ContentHit]:
+    """
+    Stream matching content items in chunks instead of building one list.
+
+    Takes the same filters as ``search_content`` but skips the total count.
+    When a recent ``search_content`` call with the same filters returned the
+    complete result set, its IDs are re-read by primary key instead of
+    evaluating the filters again. A pooled connection is held until the
+    iterator is exhausted or closed.
+
+    Args:
+        query: Full-text search query
+        content_types: Filter by content type(s)
+        statuses: Filter by status(es)
+        tags: Filter by tag(s)
+        client: Filter by client
+        date_from: Filter by created_date >= this date
+        date_to: Filter by created_date <= this date
+        limit: Maximum results to yield
+        columns: Result fields to load (None = all)
+        chunk_size: Rows fetched (and converted) per round trip
+
+    Yields:
+        Matching content items in search order
+    """
+    query = _fts_query(query) if query else None
+    content_types, statuses, tags = map(_normalize_filter, (content_types, statuses, tags))
+    wanted, optional_fields, select_columns = _projection(columns)
+    (_, page_sql, _), params = _search_params(
+        query, content_types, statuses, tags, client, date_from, date_to, select_columns
+    )
+
+    # Reuse the result IDs of a matching recent search when available
+    cache_key = _count_cache_key(query, content_types, statuses, tags, client, date_from, date_to)
+    with _count_cache_lock:
+        known_ids = _recent_search_ids.get(cache_key)
+    if known_ids is not None:
+        if not known_ids:
+            return
+        id_slots = _in_slots(list(known_ids))
+        page_sql = _ids_sql(id_slots, select_columns)
+        params = _pad(list(known_ids), id_slots)
+
+    pool = get_db_pool()
+    conn = pool.acquire()
+    rows_cursor = conn.cursor()
+    rows_cursor.row_factory = None
+
+    try:
+        if known_ids is not None:
+            rows_cursor.execute(page_sql, params + [limit])
+        else:
+            rows_cursor.execute(page_sql, params + [limit, 0])
+        junction_cursor = conn.cursor()
+        while True:
+            rows = rows_cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from _rows_to_content(junction_cursor, rows, wanted, optional_fields)
+    finally:
+        # Finalize the statement even if iteration stopped early
+        rows_cursor.close()
+        pool.release(conn)
+
+
+def _load_for_index(md_file: str) -> Optional[ContentResponse]:
+    """Parse a markdown file into an indexable item (None if it can't be parsed)."""
+    try:
+        data = read_content_file(md_file)
+        return ContentResponse(file_path=md_file, **data)
+    except Exception as e:
+        logger.warning("Error indexing %s: %s", md_file, e)
+        return None
 
 
 def rebuild_index_from_files() -> int:
     """
     Rebuild entire SQLite index from markdown files.
 
+    All files are parsed first, then the index is cleared and repopulated
+    with batched multi-row inserts inside a single transaction. Large
+    libraries are parsed across worker processes; all SQLite writes stay in
+    this process.
+
     Returns:
         Number of files indexed
     """
-    conn = get_db_connection()
+    content_library = Path(settings.CONTENT_LIBRARY_PATH)
+    md_files = [str(md_file) for md_file in content_library.rglob("*.md")]
+
+    workers = settings.INDEX_PARSE_WORKERS or os.cpu_count() or 1
+    if workers > 1 and len(md_files) >= PARALLEL_PARSE_MIN_FILES:
+        # YAML parsing and model validation are CPU-bound. spawn: forking a
+        # process that holds threads and SQLite connections isn't safe.
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            loaded = list(executor.map(_load_for_index, md_files, chunksize=PARSE_CHUNK_SIZE))
+    else:
+        # Reading files concurrently still overlaps their I/O
+        with ThreadPoolExecutor(max_workers=BULK_READ_CONCURRENCY) as executor:
+            loaded = list(executor.map(_load_for_index, md_files))
+
+    return bulk_reindex([item for item in loaded if item is not None])
+
+
+def bulk_reindex(items: List[ContentResponse]) -> int:
+    """
+    Replace the whole index with the given items.
+
+    Secondary indexes and the content_fts sync triggers are dropped before
+    the bulk insert and recreated afterwards, so each row costs one table
+    write instead of one per index, and the old rows are never re-tokenized
+    just to be removed from the FTS index. The FTS index is then rebuilt
+    from content_items in a single pass.
+
+    Args:
+        items: Complete set of content items to index
+
+    Returns:
+        Number of items indexed
+    """
+    pool = get_db_pool()
+    conn = pool.acquire_writer()
     cursor = conn.cursor()
 
     try:
+        cursor.execute("BEGIN IMMEDIATE")
+
         # Clear existing index
+        drop_content_indexes(cursor)
+        drop_fts_triggers(cursor)
         cursor.execute("DELETE FROM content_items")
-        cursor.execute("DELETE FROM content_fts")
-        conn.commit()
-
-        # Scan content library
-        content_library = Path(settings.CONTENT_LIBRARY_PATH)
-        count = 0
+        for table, _, _ in JUNCTION_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
 
-        for md_file in content_library.rglob("*.md"):
-            try:
-                data = read_content_file(str(md_file))
-
-                # Convert string dates to date objects if needed
-                for key in ['created_date', 'updated_date', 'publish_date']:
-                    if key in data and data[key] is not None:
-                        if isinstance(data[key], str):
-                            data[key] = date.fromisoformat(data[key])
-
-                content = ContentResponse(file_path=str(md_file), **data)
-                index_content_item(content)
-                count += 1
-            except Exception as e:
-                print(f"Error indexing {md_file}: {e}")
-                continue
+        count = index_batch(items, conn, commit=False, fresh=True)
 
+        cursor.execute("INSERT INTO content_fts (content_fts) VALUES ('rebuild')")
+        create_fts_triggers(cursor)
+        create_content_indexes(cursor)
+        # Every row changed, so refresh the planner's index statistics
+        cursor.execute("ANALYZE content_items")
+        conn.commit()
+        _invalidate_count_cache()
         return count
+    except Exception:
+        conn.rollback()
+        raise
     finally:
-        conn.close()
+        pool.release_writer(conn)
 
 
 def get_unique_values(field: str) -> List[str]:
@@ -264,14 +1028,28 @@ def get_unique_values(field: str) -> List[str]:
     Returns:
         List of unique values
     """
-    conn = get_db_connection()
+    if field not in ['content_type', 'status', 'author', 'client']:
+        return []
+
+    cache_key = (settings.DATABASE_URL, field)
+    with _count_cache_lock:
+        values = _unique_values_cache.get(cache_key)
+    if values is not None:
+        return list(values)
+
+    pool = get_db_pool()
+    conn = pool.acquire()
     cursor = conn.cursor()
+    cursor.row_factory = None
 
     try:
-        if field in ['content_type', 'status', 'author', 'client']:
-            cursor.execute(f"SELECT DISTINCT {field} FROM content_items WHERE {field} IS NOT NULL ORDER BY {field}")
-            return [row[0] for row in cursor.fetchall()]
-        else:
-            return []
+        # DISTINCT and ORDER BY both come from the field's index; the rows
+        # are already the final sorted, de-duplicated list
+        cursor.execute(f"SELECT DISTINCT {field} FROM content_items WHERE {field} IS NOT NULL ORDER BY {field}")
+        values = [value for value, in cursor]
     finally:
-        conn.close()
+        pool.release(conn)
+
+    with _count_cache_lock:
+        _unique_values_cache[cache_key] = values
+    return list(values)
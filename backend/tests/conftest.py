@@ -1,21 +1,73 @@
 """Pytest configuration and shared fixtures for backend tests."""
 
+import asyncio
 import os
 import tempfile
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
-from app.config import Settings, settings
+from app.config import Settings, get_settings, settings
 from app.main import app
 
 
+@pytest.fixture(scope="session")
+def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """One event loop for the session, shared by async tests and sync fixtures."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def fast_pwd_context():
+    """Argon2id context at minimum cost, for tests that don't test hashing.
+
+    Hashes keep the production format (and still verify), but cost well
+    under a millisecond instead of tens of milliseconds each.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["argon2"],
+        argon2__type="ID",
+        argon2__time_cost=1,
+        argon2__memory_cost=8,
+        argon2__parallelism=1,
+    )
+
+
+@pytest.fixture
+def fast_password_hashing(fast_pwd_context, monkeypatch):
+    """Use the cheap password context in auth_service for one test."""
+    monkeypatch.setattr("app.services.auth_service.pwd_context", fast_pwd_context)
+
+
+@pytest.fixture(scope="session")
+def make_aged_file():
+    """Factory creating an empty file whose mtime lies ``age_hours`` in the past.
+
+    Opens with O_CREAT and sets the timestamp once, instead of
+    Path.touch() followed by a second os.utime() call.
+    """
+    def make(path: Path, age_hours: float = 0) -> Path:
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+        if age_hours:
+            timestamp = time.time() - age_hours * 3600
+            os.utime(path, (timestamp, timestamp))
+        return path
+
+    return make
+
+
 @pytest.fixture(scope="session")
 def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for test data."""
-    with tempfile.TemporaryDirectory() as tmpdir:
+    """Create a temporary directory for test data (one per xdist worker)."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    with tempfile.TemporaryDirectory(prefix=f"content_tracker_{worker}_") as tmpdir:
         yield Path(tmpdir)
 
 
@@ -28,6 +80,8 @@ def test_settings(temp_dir: Path) -> Settings:
         DATABASE_URL=f"sqlite:///{temp_dir}/test_content_index.db",
         USERS_DATABASE_URL=f"sqlite:///{temp_dir}/test_users.db",
         DEBUG=True,
+        # Test files are throwaway, so skip the per-file fsync
+        DURABLE_WRITES=False,
     )
 
     # Create test directories
@@ -47,15 +101,26 @@ def client(test_settings: Settings, monkeypatch) -> Generator[TestClient, None,
     monkeypatch.setattr("app.services.export_service.settings", test_settings)
     monkeypatch.setattr("app.services.auth_service.settings", test_settings)
     monkeypatch.setattr("app.db.init_db.settings", test_settings)
+    app.dependency_overrides[get_settings] = lambda: test_settings
 
-    # Initialize test database (after settings are patched)
-    from app.db.init_db import create_content_index_db, create_users_db
-    create_content_index_db()
-    create_users_db()
-
+    # Entering the client runs the app lifespan, which initializes the test
+    # databases (after settings are patched)
     with TestClient(app) as test_client:
         yield test_client
 
+    app.dependency_overrides.pop(get_settings, None)
+
+
+@pytest.fixture
+async def async_client(client: TestClient) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Async HTTP client calling the app in-process on the test event loop.
+
+    Builds on ``client`` for the patched settings and the app lifespan.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+
 
 @pytest.fixture
 def sample_content_data() -> dict:
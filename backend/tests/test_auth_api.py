@@ -9,6 +9,9 @@ from app.services import auth_service
 
 client = TestClient(app)
 
+# These tests cover the endpoints, not hashing strength (see test_auth_service)
+pytestmark = pytest.mark.usefixtures("fast_password_hashing")
+
 
 @pytest.fixture
 async def test_admin_user(monkeypatch):
@@ -2,6 +2,7 @@
 
 import pytest
 import uuid
+from datetime import datetime, timedelta
 
 from app.models.user import UserCreate, UserRole
 from app.services import auth_service
@@ -50,6 +51,25 @@ async def test_create_duplicate_user():
         await auth_service.create_user(user_data)
 
 
+@pytest.mark.asyncio
+async def test_create_user_with_precomputed_hash(monkeypatch):
+    """Test that a precomputed password hash is stored without rehashing."""
+    email = unique_email("prehashed")
+    password_hash = auth_service.get_password_hash("prehashed123")
+
+    def fail_hash(password):
+        raise AssertionError("password hashed again")
+
+    monkeypatch.setattr(auth_service, "get_password_hash", fail_hash)
+    await auth_service.create_user(
+        UserCreate(email=email, password="prehashed123", role=UserRole.VIEWER),
+        password_hash,
+    )
+
+    assert (await auth_service.get_user_by_email(email)).password_hash == password_hash
+    assert await auth_service.authenticate_user(email, "prehashed123") is not None
+
+
 @pytest.mark.asyncio
 async def test_authenticate_user_success():
     """Test successful user authentication."""
@@ -118,6 +138,98 @@ def test_password_hashing():
     # Verify incorrect password
     assert auth_service.verify_password("wrongpassword", hashed) is False
 
+    # New hashes use Argon2id with the configured cost
+    settings = auth_service.settings
+    assert hashed.startswith(
+        f"$argon2id$v=19$m={settings.ARGON2_MEMORY_COST},"
+        f"t={settings.ARGON2_TIME_COST},p={settings.ARGON2_PARALLELISM}$"
+    )
+
+
+@pytest.mark.asyncio
+async def test_authenticate_upgrades_legacy_bcrypt_hash():
+    """Test that logging in with a bcrypt hash rehashes it with Argon2id."""
+    from passlib.context import CryptContext
+
+    email = unique_email("legacy")
+    user = await auth_service.create_user(UserCreate(
+        email=email,
+        password="legacypass123",
+        role=UserRole.VIEWER,
+    ))
+
+    legacy_hash = CryptContext(schemes=["bcrypt"]).hash("legacypass123")
+    conn = auth_service.get_users_db_connection()
+    try:
+        conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (legacy_hash, user.id))
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert await auth_service.authenticate_user(email, "legacypass123") is not None
+
+    upgraded = await auth_service.get_user_by_email(email)
+    assert upgraded.password_hash.startswith("$argon2id$")
+
+
+@pytest.mark.asyncio
+async def test_authenticate_defers_last_login_to_background_task():
+    """Test that the last_login write is queued when background tasks are given."""
+    from fastapi import BackgroundTasks
+
+    email = unique_email("deferred")
+    await auth_service.create_user(UserCreate(
+        email=email,
+        password="deferredpass123",
+        role=UserRole.VIEWER,
+    ))
+
+    background_tasks = BackgroundTasks()
+    user = await auth_service.authenticate_user(email, "deferredpass123", background_tasks)
+    assert user is not None
+    assert (await auth_service.get_user_by_email(email)).last_login is None
+
+    await background_tasks()
+    assert (await auth_service.get_user_by_email(email)).last_login is not None
+
+    # A repeat login right away doesn't queue another write
+    repeat_tasks = BackgroundTasks()
+    assert await auth_service.authenticate_user(email, "deferredpass123", repeat_tasks) is not None
+    assert repeat_tasks.tasks == []
+
+
+def test_email_lookup_uses_unique_index():
+    """Test that email lookups use the UNIQUE index without a duplicate."""
+    from app.db.init_db import create_users_db
+
+    # Re-running schema setup removes the redundant index from existing DBs
+    create_users_db()
+
+    conn = auth_service.get_users_db_connection()
+    try:
+        index_names = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'users'"
+        )}
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM users WHERE email = ?", ("a@example.com",)
+        ))
+    finally:
+        conn.close()
+
+    assert "idx_user_email" not in index_names
+    assert "sqlite_autoindex_users" in plan
+
+
+def test_uuid7_is_time_ordered(monkeypatch):
+    """Test that user IDs are version 7 UUIDs ordered by creation time."""
+    first = auth_service.uuid7()
+    assert first.version == 7
+    assert first.variant == uuid.RFC_4122
+
+    later_ns = auth_service.time.time_ns() + 5_000_000
+    monkeypatch.setattr(auth_service.time, "time_ns", lambda: later_ns)
+    assert str(auth_service.uuid7()) > str(first)
+
 
 def test_create_and_decode_token():
     """Test JWT token creation and decoding."""
@@ -141,6 +253,35 @@ def test_decode_invalid_token():
     assert result is None
 
 
+def test_decode_token_cached_until_expiry(monkeypatch):
+    """Test that decoded tokens are cached but expire with the token."""
+    token = auth_service.create_access_token({"sub": "cached"}, timedelta(minutes=5))
+    assert auth_service.decode_access_token(token)["sub"] == "cached"
+    cache_key = (auth_service.settings.SECRET_KEY, auth_service.settings.ALGORITHM, token)
+    assert cache_key in auth_service._token_cache
+
+    # Cache hit must not re-verify the signature
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("jwt.decode called on cache hit")
+
+    monkeypatch.setattr(auth_service.jwt, "decode", fail_decode)
+    assert auth_service.decode_access_token(token)["sub"] == "cached"
+
+    # Once the token's exp has passed the cached payload is rejected
+    monkeypatch.setattr(auth_service.time, "time", lambda: 10**12)
+    assert auth_service.decode_access_token(token) is None
+    assert cache_key not in auth_service._token_cache
+
+
+def test_decode_token_cache_respects_key_rotation(monkeypatch):
+    """Test that cached tokens stop validating once SECRET_KEY changes."""
+    token = auth_service.create_access_token({"sub": "rotated"})
+    assert auth_service.decode_access_token(token) is not None
+
+    monkeypatch.setattr(auth_service.settings, "SECRET_KEY", "rotated-secret-key")
+    assert auth_service.decode_access_token(token) is None
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_email():
     """Test retrieving user by email."""
@@ -200,6 +341,11 @@ async def test_list_users():
     assert len(users) >= 3
     assert all(user.email for user in users)
 
+    # Rows are converted to model types without validation
+    assert all(isinstance(user.created_at, datetime) for user in users)
+    assert all(user.is_active is True for user in users)
+    assert users[0].model_dump(mode="json")["created_at"]
+
 
 @pytest.mark.asyncio
 async def test_delete_user():
@@ -244,3 +390,37 @@ async def test_update_user():
     assert updated_user is not None
     assert updated_user.role == UserRole.EDITOR
     assert updated_user.full_name == "Updated Name"
+
+
+@pytest.mark.asyncio
+async def test_user_queries_run_off_event_loop(monkeypatch):
+    """Test that pooled users-database calls never block the event loop thread."""
+    import threading
+
+    pool = auth_service.get_users_db_pool()
+    acquiring_threads = []
+
+    def record(acquire):
+        def wrapper(*args, **kwargs):
+            acquiring_threads.append(threading.current_thread())
+            return acquire(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(pool, "acquire", record(pool.acquire))
+    monkeypatch.setattr(pool, "acquire_writer", record(pool.acquire_writer))
+
+    email = unique_email("offloop")
+    user = await auth_service.create_user(UserCreate(
+        email=email,
+        password="offlooppass123",
+        role=UserRole.VIEWER,
+    ))
+    await auth_service.get_user_by_email(email)
+    await auth_service.get_user_by_id(user.id)
+    await auth_service.authenticate_user(email, "offlooppass123")
+    await auth_service.update_user(user.id, full_name="Off Loop")
+    await auth_service.list_users()
+    await auth_service.delete_user(user.id)
+
+    assert len(acquiring_threads) >= 7
+    assert threading.current_thread() not in acquiring_threads
@@ -3,25 +3,30 @@
 Tests the REST API endpoints for content CRUD operations.
 """
 
+import httpx
 import pytest
+import uuid
 from fastapi.testclient import TestClient
 from datetime import date
 
-from app.main import app
 from app.services.markdown_service import create_content_item
 from app.models.content import ContentCreate
 
 
-client = TestClient(app)
-
-
 @pytest.fixture
-def mock_settings(tmp_path, monkeypatch):
-    """Mock settings to use temporary directory."""
-    content_dir = tmp_path / "content_library"
-    content_dir.mkdir()
-    monkeypatch.setattr("app.services.markdown_service.settings.CONTENT_LIBRARY_PATH", content_dir)
-    return content_dir
+def mock_settings(client, test_settings, tmp_path, monkeypatch):
+    """Mock settings to use a temporary content index.
+
+    Files go to the worker's content library (created once in
+    ``test_settings``); they are named by UUID, so tests never collide.
+    """
+    # A per-test index keeps items created here out of other tests' results
+    monkeypatch.setattr(
+        "app.services.search_service.settings.DATABASE_URL", f"sqlite:///{tmp_path / 'content_index.db'}"
+    )
+    from app.db.init_db import create_content_index_db
+    create_content_index_db()
+    return test_settings.CONTENT_LIBRARY_PATH
 
 
 @pytest.fixture
@@ -37,15 +42,7 @@ async def created_content_id(mock_settings):
     return created.id
 
 
-def test_health_endpoint():
-    """Test that health check endpoint works."""
-    response = client.get("/health")
-    assert response.status_code == 200
-    data = response.json()
-    assert data["status"] == "healthy"
-
-
-def test_create_content(mock_settings):
+def test_create_content(client: TestClient, mock_settings):
     """Test POST /content endpoint."""
     response = client.post("/content", json={
         "title": "API Test Post",
@@ -63,7 +60,7 @@ def test_create_content(mock_settings):
     assert "updated_date" in data
 
 
-def test_create_content_with_all_fields(mock_settings):
+def test_create_content_with_all_fields(client: TestClient, mock_settings):
     """Test creating content with all optional fields."""
     response = client.post("/content", json={
         "title": "Complete Content",
@@ -87,7 +84,7 @@ def test_create_content_with_all_fields(mock_settings):
     assert data["custom_fields"]["duration"] == "10:30"
 
 
-def test_create_content_missing_required_fields():
+def test_create_content_missing_required_fields(client: TestClient):
     """Test that creating content without required fields fails."""
     response = client.post("/content", json={
         "status": "draft"
@@ -97,16 +94,60 @@ def test_create_content_missing_required_fields():
 
 
 @pytest.mark.asyncio
-async def test_get_content(mock_settings, created_content_id):
+async def test_get_content(async_client: httpx.AsyncClient, mock_settings, created_content_id):
     """Test GET /content/{id} endpoint."""
-    response = client.get(f"/content/{created_content_id}")
+    response = await async_client.get(f"/content/{created_content_id}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == created_content_id
     assert data["title"] == "Test Content for API"
 
 
-def test_get_nonexistent_content(mock_settings):
+def test_list_content(client: TestClient, mock_settings):
+    """Test GET /content returns serialized items with pagination metadata."""
+    # A unique search term keeps the result independent of other indexed rows
+    marker = f"listing{uuid.uuid4().hex}"
+    created = client.post("/content", json={
+        "title": f"Listing {marker}",
+        "content_type": "blog",
+        "body": "Listed body"
+    }).json()
+
+    response = client.get("/content", params={"q": marker, "per_page": 100})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [created["id"]]
+    assert isinstance(data["items"][0]["created_date"], str)
+    assert data["pagination"]["total"] == 1
+    assert data["pagination"]["per_page"] == 100
+
+
+@pytest.mark.asyncio
+async def test_get_content_body_stream(async_client: httpx.AsyncClient, mock_settings, created_content_id):
+    """Test GET /content/{id}?stream=true returns just the markdown body."""
+    response = await async_client.get(f"/content/{created_content_id}", params={"stream": "true"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/markdown")
+    assert response.text == "Test body content"
+
+
+def test_get_content_body_stream_not_found(client: TestClient, mock_settings):
+    """Test streaming the body of content that doesn't exist."""
+    response = client.get("/content/nonexistent-id", params={"stream": "true"})
+    assert response.status_code == 404
+
+
+def test_list_content_no_matches(client: TestClient, mock_settings):
+    """Test GET /content with filters that match nothing."""
+    response = client.get("/content", params={"content_type": "nonexistent-type"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == []
+    assert data["pagination"]["total"] == 0
+    assert data["pagination"]["pages"] == 0
+
+
+def test_get_nonexistent_content(client: TestClient, mock_settings):
     """Test getting content that doesn't exist."""
     response = client.get("/content/nonexistent-id")
     assert response.status_code == 404
@@ -114,9 +155,9 @@ def test_get_nonexistent_content(mock_settings):
 
 
 @pytest.mark.asyncio
-async def test_update_content(mock_settings, created_content_id):
+async def test_update_content(async_client: httpx.AsyncClient, mock_settings, created_content_id):
     """Test PUT /content/{id} endpoint."""
-    response = client.put(f"/content/{created_content_id}", json={
+    response = await async_client.put(f"/content/{created_content_id}", json={
         "title": "Updated Title",
         "status": "published"
     })
@@ -128,9 +169,9 @@ async def test_update_content(mock_settings, created_content_id):
 
 
 @pytest.mark.asyncio
-async def test_update_content_body(mock_settings, created_content_id):
+async def test_update_content_body(async_client: httpx.AsyncClient, mock_settings, created_content_id):
     """Test updating content body."""
-    response = client.put(f"/content/{created_content_id}", json={
+    response = await async_client.put(f"/content/{created_content_id}", json={
         "body": "# Updated Content\n\nNew body text."
     })
     assert response.status_code == 200
@@ -138,7 +179,7 @@ async def test_update_content_body(mock_settings, created_content_id):
     assert "Updated Content" in data["body"]
 
 
-def test_update_nonexistent_content(mock_settings):
+def test_update_nonexistent_content(client: TestClient, mock_settings):
     """Test updating content that doesn't exist."""
     response = client.put("/content/nonexistent-id", json={
         "title": "Updated Title"
@@ -147,27 +188,27 @@ def test_update_nonexistent_content(mock_settings):
 
 
 @pytest.mark.asyncio
-async def test_delete_content(mock_settings, created_content_id):
+async def test_delete_content(async_client: httpx.AsyncClient, mock_settings, created_content_id):
     """Test DELETE /content/{id} endpoint."""
-    response = client.delete(f"/content/{created_content_id}")
+    response = await async_client.delete(f"/content/{created_content_id}")
     assert response.status_code == 204
 
     # Verify deletion
-    response = client.get(f"/content/{created_content_id}")
+    response = await async_client.get(f"/content/{created_content_id}")
     assert response.status_code == 404
 
 
-def test_delete_nonexistent_content(mock_settings):
+def test_delete_nonexistent_content(client: TestClient, mock_settings):
     """Test deleting content that doesn't exist."""
     response = client.delete("/content/nonexistent-id")
     assert response.status_code == 404
 
 
 @pytest.mark.asyncio
-async def test_content_lifecycle(mock_settings):
+async def test_content_lifecycle(async_client: httpx.AsyncClient, mock_settings):
     """Test full CRUD lifecycle."""
     # Create
-    create_response = client.post("/content", json={
+    create_response = await async_client.post("/content", json={
         "title": "Lifecycle Test",
         "content_type": "blog",
         "body": "Original content"
@@ -176,12 +217,12 @@ async def test_content_lifecycle(mock_settings):
     content_id = create_response.json()["id"]
 
     # Read
-    get_response = client.get(f"/content/{content_id}")
+    get_response = await async_client.get(f"/content/{content_id}")
     assert get_response.status_code == 200
     assert get_response.json()["title"] == "Lifecycle Test"
 
     # Update
-    update_response = client.put(f"/content/{content_id}", json={
+    update_response = await async_client.put(f"/content/{content_id}", json={
         "title": "Updated Lifecycle Test",
         "body": "Updated content"
     })
@@ -189,9 +230,26 @@ async def test_content_lifecycle(mock_settings):
     assert update_response.json()["title"] == "Updated Lifecycle Test"
 
     # Delete
-    delete_response = client.delete(f"/content/{content_id}")
+    delete_response = await async_client.delete(f"/content/{content_id}")
     assert delete_response.status_code == 204
 
     # Verify deletion
-    final_get = client.get(f"/content/{content_id}")
+    final_get = await async_client.get(f"/content/{content_id}")
     assert final_get.status_code == 404
+
+
+def test_search_endpoint(client: TestClient, mock_settings):
+    """Test GET /search returns matching items serialized as JSON."""
+    marker = f"searchable{uuid.uuid4().hex}"
+    created = client.post("/content", json={
+        "title": f"Search {marker}",
+        "content_type": "blog",
+        "publish_date": "2024-01-15",
+        "body": "Body"
+    }).json()
+
+    response = client.get("/search", params={"q": marker})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [created["id"]]
+    assert data[0]["publish_date"] == "2024-01-15"
@@ -3,6 +3,7 @@
 Tests the REST API endpoints for DOCX and PDF export operations.
 """
 
+import asyncio
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
@@ -11,42 +12,61 @@ from app.services import auth_service, markdown_service
 from app.models.content import ContentCreate
 from app.models.user import UserCreate
 
+# Users here only authorize requests; password hashing is tested elsewhere
+pytestmark = pytest.mark.usefixtures("fast_password_hashing")
 
-@pytest.fixture
-def admin_token(client):
-    """Create admin user and return auth token."""
+
+def _create_user_token(test_settings, event_loop, fast_pwd_context, role):
+    """Create a user with the given role and return its auth token.
+
+    The user lives in the session's test users database, so it outlives the
+    per-test ``client``; settings are patched here only while creating it.
+    """
     import uuid
-    import asyncio
+    from app.db.init_db import create_users_db
 
     # Use unique email to avoid conflicts
-    email = f"admin_export_{uuid.uuid4().hex[:8]}@test.com"
-
-    # Create admin user (run async function in sync context)
-    loop = asyncio.get_event_loop()
-    user = loop.run_until_complete(auth_service.create_user(
-        UserCreate(
-            email=email,
-            password="adminpass123",
-            full_name="Admin User",
-            role="admin"
-        )
-    ))
+    email = f"{role}_export_{uuid.uuid4().hex[:8]}@test.com"
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.db.init_db.settings", test_settings)
+        mp.setattr("app.services.auth_service.settings", test_settings)
+        mp.setattr("app.services.auth_service.pwd_context", fast_pwd_context)
+        create_users_db()
+
+        # Create user (run async function on the session loop)
+        user = event_loop.run_until_complete(auth_service.create_user(
+            UserCreate(
+                email=email,
+                password=f"{role}pass123",
+                full_name=f"{role.title()} User",
+                role=role
+            )
+        ))
 
-    # Get token
-    token = auth_service.create_access_token(data={"sub": user.id, "role": user.role})
+        # Get token
+        token = auth_service.create_access_token(data={"sub": user.id, "role": user.role})
     return token
 
 
+@pytest.fixture(scope="session")
+def admin_token(test_settings, event_loop, fast_pwd_context):
+    """Create one admin user for the session and return its auth token."""
+    return _create_user_token(test_settings, event_loop, fast_pwd_context, "admin")
+
+
+@pytest.fixture(scope="session")
+def editor_token(test_settings, event_loop, fast_pwd_context):
+    """Create one editor user for the session and return its auth token."""
+    return _create_user_token(test_settings, event_loop, fast_pwd_context, "editor")
+
+
 @pytest.fixture
-def sample_content_for_export(client, test_settings):
+def sample_content_for_export(client, test_settings, event_loop):
     """Create sample content items for export testing."""
-    import asyncio
-
-    # Create test content items
-    items = []
-    loop = asyncio.get_event_loop()
-    for i in range(3):
-        content = loop.run_until_complete(markdown_service.create_content_item(
+    # Create test content items concurrently (gather keeps input order)
+    items = event_loop.run_until_complete(asyncio.gather(*(
+        markdown_service.create_content_item(
             ContentCreate(
                 title=f"Test Content {i+1}",
                 content_type="blog" if i == 0 else "video",
@@ -56,8 +76,9 @@ def sample_content_for_export(client, test_settings):
                 categories=["Testing"],
                 body=f"Content body {i+1}"
             )
-        ))
-        items.append(content)
+        )
+        for i in range(3)
+    )))
 
     return items
 
@@ -80,6 +101,7 @@ def test_export_pdf_requires_auth(client):
     assert response.status_code == 401
 
 
+@pytest.mark.slow
 def test_export_docx_success(client, admin_token, sample_content_for_export, test_settings):
     """Test successful DOCX export."""
 
@@ -115,6 +137,7 @@ def test_export_docx_success(client, admin_token, sample_content_for_export, tes
     assert file_path.exists()
 
 
+@pytest.mark.slow
 def test_export_pdf_success(client, admin_token, sample_content_for_export, test_settings):
     """Test successful PDF export."""
 
@@ -141,6 +164,51 @@ def test_export_pdf_success(client, admin_token, sample_content_for_export, test
     assert file_path.exists()
 
 
+def test_export_docx_stream(client, admin_token, sample_content_for_export, test_settings):
+    """Test DOCX export returned directly in the response body."""
+    from io import BytesIO
+    from docx import Document
+
+    response = client.post(
+        "/export/docx/stream",
+        json={"title": "Streamed Report"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+    assert 'filename="Streamed_Report.docx"' in response.headers["content-disposition"]
+    assert "Streamed Report" in Document(BytesIO(response.content)).paragraphs[0].text
+
+
+def test_export_pdf_stream(client, admin_token, sample_content_for_export, test_settings):
+    """Test PDF export returned directly in the response body."""
+    response = client.post(
+        "/export/pdf/stream",
+        json={"title": "Streamed PDF"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    # PDF export may fall back to HTML if WeasyPrint is not available
+    assert response.headers["content-type"].split(";")[0] in ("application/pdf", "text/html")
+    assert len(response.content) > 0
+
+
+def test_export_stream_no_matching_content(client, admin_token, test_settings):
+    """Test streamed export when no content matches filters."""
+    response = client.post(
+        "/export/docx/stream",
+        json={"content_types": ["nonexistent"]},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.slow
 def test_export_with_filters(client, admin_token, sample_content_for_export, test_settings):
     """Test export with content filters."""
 
@@ -161,6 +229,55 @@ def test_export_with_filters(client, admin_token, sample_content_for_export, tes
     assert data["item_count"] >= 1
 
 
+@pytest.mark.asyncio
+async def test_export_reuses_cached_file(async_client, admin_token, sample_content_for_export):
+    """Test that repeat exports reuse the file until the index changes."""
+    request = {"title": "Cached Report", "tags": ["export"]}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first = (await async_client.post("/export/docx", json=request, headers=headers)).json()
+    second = (await async_client.post("/export/docx", json=request, headers=headers)).json()
+    assert second["file_path"] == first["file_path"]
+    assert second["item_count"] == first["item_count"]
+
+    # Different options render a separate file
+    other = (await async_client.post("/export/docx", json={**request, "title": "Other"}, headers=headers)).json()
+    assert other["file_path"] != first["file_path"]
+
+    # Indexing new content invalidates the cached export
+    await markdown_service.create_content_item(
+        ContentCreate(title="Late Addition", content_type="blog", tags=["export"], body="New")
+    )
+    third = (await async_client.post("/export/docx", json=request, headers=headers)).json()
+    assert third["file_path"] != first["file_path"]
+    assert third["item_count"] == first["item_count"] + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_export_served_after_complete_render(
+    async_client, admin_token, sample_content_for_export, test_settings
+):
+    """Test that concurrent identical exports leave one complete file for cache hits."""
+    from docx import Document
+
+    request = {"title": "Atomic Report", "tags": ["export"]}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first, second = await asyncio.gather(
+        async_client.post("/export/docx", json=request, headers=headers),
+        async_client.post("/export/docx", json=request, headers=headers),
+    )
+    assert first.json()["file_path"] == second.json()["file_path"]
+
+    cached = (await async_client.post("/export/docx", json=request, headers=headers)).json()
+    file_path = Path(cached["file_path"])
+    assert file_path == Path(first.json()["file_path"])
+
+    # The cache hit points at a whole document, and no temp files linger
+    assert Document(str(file_path)).paragraphs[0].text == "Atomic Report"
+    assert not list(test_settings.EXPORTS_PATH.glob(f"{file_path.name}.*.tmp"))
+
+
 def test_export_no_matching_content(client, admin_token, test_settings):
     """Test export when no content matches filters."""
 
@@ -187,23 +304,45 @@ def test_download_export_file(client, admin_token, test_settings):
     test_file = test_settings.EXPORTS_PATH / "test-export.docx"
     test_file.write_text("test content")
 
-    response = client.get(
+    # Stream so only the headers are read; the body is never buffered
+    with client.stream(
+        "GET",
         "/export/download/test-export.docx",
         headers={"Authorization": f"Bearer {admin_token}"}
-    )
-
-    assert response.status_code == 200
-    assert response.headers["content-type"] == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 
 
 def test_download_nonexistent_file(client, admin_token):
     """Test downloading a file that doesn't exist."""
-    response = client.get(
+    with client.stream(
+        "GET",
         "/export/download/nonexistent.docx",
         headers={"Authorization": f"Bearer {admin_token}"}
+    ) as response:
+        assert response.status_code == 404
+
+
+def test_download_rejects_paths_outside_exports(client, admin_token, test_settings):
+    """Test that links escaping the exports directory are refused."""
+    # A sibling directory sharing the exports prefix defeated the old
+    # string-prefix check
+    evil_dir = Path(f"{test_settings.EXPORTS_PATH}_evil")
+    evil_dir.mkdir(exist_ok=True)
+    secret = evil_dir / "secret.docx"
+    secret.write_text("secret")
+
+    link = test_settings.EXPORTS_PATH / "escape.docx"
+    if not link.exists():
+        link.symlink_to(secret)
+
+    response = client.get(
+        "/export/download/escape.docx",
+        headers={"Authorization": f"Bearer {admin_token}"}
     )
 
-    assert response.status_code == 404
+    assert response.status_code == 403
 
 
 def test_download_requires_auth(client):
@@ -213,15 +352,11 @@ def test_download_requires_auth(client):
     assert response.status_code == 401
 
 
-def test_cleanup_exports_admin_only(client, admin_token, test_settings):
+@pytest.mark.slow
+def test_cleanup_exports_admin_only(client, admin_token, test_settings, make_aged_file):
     """Test that cleanup is admin-only."""
     # Create old test files
-    old_file = test_settings.EXPORTS_PATH / "old_export.docx"
-    old_file.touch()
-
-    import time, os
-    old_time = time.time() - (2 * 3600)
-    os.utime(old_file, (old_time, old_time))
+    make_aged_file(test_settings.EXPORTS_PATH / "old_export.docx", age_hours=2)
 
     response = client.delete(
         "/export/cleanup?max_age_hours=1",
@@ -233,27 +368,11 @@ def test_cleanup_exports_admin_only(client, admin_token, test_settings):
     assert data["deleted_count"] == 1
 
 
-def test_cleanup_exports_non_admin_forbidden(client):
+def test_cleanup_exports_non_admin_forbidden(client, editor_token):
     """Test that non-admin users cannot cleanup exports."""
-    import uuid
-    import asyncio
-
-    # Create editor user with unique email
-    email = f"editor_export_{uuid.uuid4().hex[:8]}@test.com"
-    loop = asyncio.get_event_loop()
-    user = loop.run_until_complete(auth_service.create_user(
-        UserCreate(
-            email=email,
-            password="editorpass123",
-            role="editor"
-        )
-    ))
-
-    token = auth_service.create_access_token(data={"sub": user.id, "role": user.role})
-
     response = client.delete(
         "/export/cleanup?max_age_hours=1",
-        headers={"Authorization": f"Bearer {token}"}
+        headers={"Authorization": f"Bearer {editor_token}"}
     )
 
     assert response.status_code == 403
@@ -3,8 +3,11 @@
 Tests DOCX and PDF export functionality.
 """
 
+import asyncio
+import functools
 import pytest
 import os
+import time
 from pathlib import Path
 from datetime import date
 from docx import Document
@@ -12,11 +15,28 @@ from docx import Document
 from app.services import export_service
 from app.models.content import ContentResponse
 
+# Real PDF rendering needs WeasyPrint and its system libraries (Pango)
+HAS_WEASYPRINT = export_service._load_weasyprint()
+requires_weasyprint = pytest.mark.skipif(not HAS_WEASYPRINT, reason="WeasyPrint unavailable")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module", autouse=True)
+def exports_dir(tmp_path_factory):
+    """Point EXPORTS_PATH at one temporary directory for the whole module."""
+    path = tmp_path_factory.mktemp("exports")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.export_service.settings.EXPORTS_PATH", str(path))
+        yield path
+
+
+@pytest.fixture(scope="session")
 def sample_content_items():
-    """Sample content items for export testing."""
-    return [
+    """Sample content items for export testing (shared; tests must not modify them).
+
+    Returned as a tuple so an accidental append or reorder fails loudly
+    instead of leaking into later tests.
+    """
+    return (
         ContentResponse(
             id="test-1",
             file_path="/tmp/test1.md",
@@ -66,77 +86,198 @@ def sample_content_items():
             custom_fields={},
             body="Episode notes and timestamps..."
         ),
-    ]
+    )
+
+
+@pytest.fixture(scope="session")
+def docx_exports(sample_content_items, tmp_path_factory, event_loop):
+    """
+    Export each DOCX variant once for the module's assertion-only tests.
+
+    Returns:
+        Dict of variant name -> file path
+    """
+    variants = {
+        "subset": (sample_content_items, "Test Export Report",
+                   ["title", "content_type", "status", "author", "tags"]),
+        "all_fields": (sample_content_items, "Complete Export", None),
+        "empty": ([], "Empty Report", None),
+    }
+
+    async def export_all():
+        return await asyncio.gather(*(
+            export_service.export_to_docx(content_items=items, title=title, include_fields=fields)
+            for items, title, fields in variants.values()
+        ))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.export_service.settings.EXPORTS_PATH",
+                   str(tmp_path_factory.mktemp("docx_exports")))
+        paths = event_loop.run_until_complete(export_all())
+
+    return dict(zip(variants, paths))
+
+
+@functools.lru_cache(maxsize=32)
+def _docx_text(path, mtime):
+    """
+    Parse a DOCX file and join the text of every paragraph and table cell.
+
+    Cached so each export is unzipped and parsed once; mtime is part of the
+    key so a rewritten file is parsed again.
+    """
+    doc = Document(path)
+    text = [paragraph.text for paragraph in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            text.extend(cell.text for cell in row.cells)
+    return "\n".join(text)
+
+
+DOCX_CASES = [
+    ("subset", "Test Export Report", [
+        "Total Items: 3",
+        "Blog Post: SEO Best Practices",
+        "Video: Product Demo",
+        "Podcast Episode: Industry Trends",
+    ]),
+    # Detailed fields and the per-type summary counts
+    ("all_fields", "Complete Export", [
+        "John Doe",
+        "https://example.com/seo-best-practices",
+        "seo, marketing, tutorial",
+        "Blog: 1",
+        "Video: 1",
+        "Podcast: 1",
+    ]),
+    ("empty", "Empty Report", ["Total Items: 0"]),
+]
+
+
+@pytest.mark.parametrize("variant,title,expected", DOCX_CASES, ids=[case[0] for case in DOCX_CASES])
+def test_export_to_docx(docx_exports, variant, title, expected):
+    """Test DOCX export generation for each field selection."""
+    file_path = docx_exports[variant]
+
+    assert os.path.exists(file_path)
+    assert file_path.endswith(".docx")
+
+    text_content = _docx_text(file_path, os.path.getmtime(file_path))
+    # The first paragraph is the report title
+    assert title in text_content.split("\n", 1)[0]
+    for substring in expected:
+        assert substring in text_content
 
 
 @pytest.mark.asyncio
-async def test_export_to_docx(sample_content_items, tmp_path, monkeypatch):
-    """Test DOCX export generation."""
-    # Set temporary export path
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
+async def test_export_to_docx_buffer(sample_content_items, exports_dir):
+    """Test in-memory DOCX export writes nothing to the exports directory."""
+    before = set(exports_dir.iterdir())
 
-    # Export to DOCX
-    file_path = await export_service.export_to_docx(
+    buffer = await export_service.export_to_docx_buffer(
         content_items=sample_content_items,
-        title="Test Export Report",
-        include_fields=["title", "content_type", "status", "author", "tags"]
+        title="Buffered Report"
     )
 
-    # Verify file created
-    assert os.path.exists(file_path)
-    assert file_path.endswith(".docx")
+    doc = Document(buffer)
+    assert "Buffered Report" in doc.paragraphs[0].text
+    assert set(exports_dir.iterdir()) == before
 
-    # Verify DOCX structure
-    doc = Document(file_path)
 
-    # Check title is in document
-    assert "Test Export Report" in doc.paragraphs[0].text
+def test_docx_built_from_cached_styled_template(sample_content_items):
+    """Test that reports reuse one pre-styled template with the report fonts."""
+    from docx.shared import Pt
 
-    # Check summary includes item count
-    text_content = "\n".join([p.text for p in doc.paragraphs])
-    assert "Total Items: 3" in text_content
-    assert "Blog Post: SEO Best Practices" in text_content
-    assert "Video: Product Demo" in text_content
-    assert "Podcast Episode: Industry Trends" in text_content
+    assert export_service._styled_template() is export_service._styled_template()
 
+    doc = export_service._build_docx(sample_content_items, "Styled", None)
+    assert doc.styles['Normal'].font.name == 'Calibri'
+    assert doc.styles['Heading 1'].font.size == Pt(18)
+    assert doc.styles['Heading 2'].font.size == Pt(14)
 
-@pytest.mark.asyncio
-async def test_export_to_docx_with_all_fields(sample_content_items, tmp_path, monkeypatch):
-    """Test DOCX export with all fields included."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
 
-    file_path = await export_service.export_to_docx(
-        content_items=sample_content_items,
-        title="Complete Export",
-        include_fields=None  # Include all fields
+def test_docx_renders_in_process_by_default(monkeypatch):
+    """Test that large reports don't start the render pool unless configured."""
+    from app.config import Settings
+
+    assert Settings.model_fields["DOCX_RENDER_WORKERS"].default == 1
+    monkeypatch.setattr(export_service.settings, "DOCX_RENDER_WORKERS", 1)
+    monkeypatch.setattr(export_service, "DOCX_CHUNK_SIZE", 2)
+
+    items = (
+        ContentResponse(
+            id=f"inline-{i}",
+            file_path=f"/tmp/inline{i}.md",
+            title=f"Inline {i}",
+            content_type="blog",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+        )
+        for i in range(5)
     )
+    export_service._build_docx(items, "Inline", None)
 
-    assert os.path.exists(file_path)
+    assert export_service._render_pool is None
 
-    doc = Document(file_path)
 
-    # Get all text from paragraphs and tables
-    all_text = []
-    for paragraph in doc.paragraphs:
-        all_text.append(paragraph.text)
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                all_text.append(cell.text)
+def test_docx_items_rendered_in_worker_processes(monkeypatch):
+    """Test that chunked worker rendering matches in-process rendering."""
+    from lxml import etree
+
+    items = [
+        ContentResponse(
+            id=f"chunk-{i}",
+            file_path=f"/tmp/chunk{i}.md",
+            title=f"Chunked {i}",
+            content_type="blog" if i % 2 else "video",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            tags=["tag"],
+            body="Body"
+        )
+        for i in range(7)
+    ]
+    monkeypatch.setattr(export_service, "DOCX_CHUNK_SIZE", 3)
 
-    text_content = "\n".join(all_text)
+    def render(workers):
+        monkeypatch.setattr(export_service.settings, "DOCX_RENDER_WORKERS", workers)
+        doc = export_service._build_docx(iter(items), "Chunks", None)
+        doc.paragraphs[1].text = ""  # generation timestamp
+        return etree.tostring(doc.element)
 
-    # Verify detailed fields are present
-    assert "John Doe" in text_content
-    assert "https://example.com/seo-best-practices" in text_content
-    assert "seo, marketing, tutorial" in text_content
+    try:
+        serial = render(1)
+        parallel = render(2)
+        assert export_service._render_pool is not None
+    finally:
+        export_service.shutdown_render_pool()
+
+    assert parallel == serial
+    assert b"7. Chunked 6" in parallel
 
 
 @pytest.mark.asyncio
-async def test_export_to_pdf(sample_content_items, tmp_path, monkeypatch):
-    """Test PDF export generation."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
+async def test_export_buffer_spills_and_streams_in_chunks(sample_content_items, monkeypatch):
+    """Test that large exports spill to disk and are read back in fixed chunks."""
+    monkeypatch.setattr(export_service, "EXPORT_SPOOL_MAX_BYTES", 1024)
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_SIZE", 4096)
+
+    buffer = await export_service.export_to_docx_buffer(sample_content_items)
+    assert buffer._rolled
+    expected = buffer.read()
+    buffer.seek(0)
 
+    chunks = list(export_service.iter_export_chunks(buffer))
+    assert all(len(chunk) == 4096 for chunk in chunks[:-1])
+    assert b"".join(chunks) == expected
+    assert buffer.closed
+
+
+@requires_weasyprint
+@pytest.mark.asyncio
+async def test_export_to_pdf(sample_content_items):
+    """Test PDF export generation."""
     # Export to PDF
     file_path = await export_service.export_to_pdf(
         content_items=sample_content_items,
@@ -144,9 +285,8 @@ async def test_export_to_pdf(sample_content_items, tmp_path, monkeypatch):
         include_fields=["title", "content_type", "status", "description"]
     )
 
-    # Verify file created (may be .pdf or .html depending on WeasyPrint availability)
     assert os.path.exists(file_path)
-    assert file_path.endswith(".pdf") or file_path.endswith(".html")
+    assert file_path.endswith(".pdf")
 
     # Verify file is not empty
     file_size = os.path.getsize(file_path)
@@ -154,29 +294,26 @@ async def test_export_to_pdf(sample_content_items, tmp_path, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_export_empty_content_list(tmp_path, monkeypatch):
-    """Test export with empty content list."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
+async def test_export_to_pdf_html_fallback(sample_content_items, monkeypatch):
+    """Test that PDF export saves HTML when WeasyPrint cannot be loaded."""
+    monkeypatch.setattr(export_service, "WEASYPRINT_AVAILABLE", False)
 
-    # Export empty list to DOCX
-    file_path = await export_service.export_to_docx(
-        content_items=[],
-        title="Empty Report"
+    file_path = await export_service.export_to_pdf(
+        content_items=sample_content_items,
+        title="Fallback Report",
+        template_name="nonexistent_template"
     )
 
-    assert os.path.exists(file_path)
-
-    doc = Document(file_path)
-    text_content = "\n".join([p.text for p in doc.paragraphs])
-
-    assert "Total Items: 0" in text_content
+    assert file_path.endswith(".html")
+    html = Path(file_path).read_text(encoding="utf-8")
+    assert "Fallback Report" in html
+    assert "Blog Post: SEO Best Practices" in html
 
 
+@requires_weasyprint
 @pytest.mark.asyncio
-async def test_export_with_custom_template_fallback(sample_content_items, tmp_path, monkeypatch):
+async def test_export_with_custom_template_fallback(sample_content_items):
     """Test PDF export falls back to default template when custom doesn't exist."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
-
     # Request non-existent template
     file_path = await export_service.export_to_pdf(
         content_items=sample_content_items,
@@ -184,31 +321,91 @@ async def test_export_with_custom_template_fallback(sample_content_items, tmp_pa
         template_name="nonexistent_template"
     )
 
-    # Should still generate using default template (may be .pdf or .html)
+    # Should still generate using default template
     assert os.path.exists(file_path)
-    assert file_path.endswith(".pdf") or file_path.endswith(".html")
+    assert file_path.endswith(".pdf")
+
+
+def test_report_templates_compiled_once(exports_dir):
+    """Test that custom report templates are loaded once and escaped."""
+    templates_dir = exports_dir / "templates"
+    templates_dir.mkdir(exist_ok=True)
+    (templates_dir / "brief.html").write_text("<h1>{{ title }}</h1>", encoding="utf-8")
+
+    template = export_service._get_report_template("brief")
+    assert export_service._get_report_template("brief") is template
+    assert template.render(title="<b>R&D</b>") == "<h1>&lt;b&gt;R&amp;D&lt;/b&gt;</h1>"
+
+    # Missing and path-escaping names use the built-in layout
+    assert export_service._get_report_template("missing") is export_service._DEFAULT_TEMPLATE
+    assert export_service._get_report_template("../brief") is export_service._DEFAULT_TEMPLATE
+
+
+def test_report_css_limited_to_rendered_elements(sample_content_items):
+    """Test that the built-in report only ships CSS for elements it renders."""
+    full_html = "".join(export_service._stream_report_html(
+        sample_content_items, "Full", None, None
+    ))
+    assert ".metadata-table th" in full_html
+    assert ".tags, .categories" in full_html
+    assert ".divider {" in full_html
+
+    brief_html = "".join(export_service._stream_report_html(
+        sample_content_items[:1], "Brief", ["title"], None
+    ))
+    assert "@page" in brief_html
+    assert ".metadata-table th" not in brief_html
+    assert ".tags, .categories" not in brief_html
+    assert ".description {" not in brief_html
+    assert ".divider {" not in brief_html
 
 
 @pytest.mark.asyncio
-async def test_cleanup_old_exports(tmp_path, monkeypatch):
-    """Test cleanup of old export files."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
+async def test_pdf_renders_from_spooled_html(sample_content_items, monkeypatch):
+    """Test that WeasyPrint reads the report from a temporary HTML file."""
+    sources = []
 
-    # Create test export files
-    old_file1 = tmp_path / "old_export.docx"
-    old_file2 = tmp_path / "old_export.pdf"
-    old_file1.touch()
-    old_file2.touch()
+    class FakeHTML:
+        def __init__(self, filename):
+            sources.append(filename)
+            self.markup = Path(filename).read_bytes()
 
-    # Modify timestamps to simulate old files (older than 1 hour)
-    import time
-    old_time = time.time() - (2 * 3600)  # 2 hours ago
-    os.utime(old_file1, (old_time, old_time))
-    os.utime(old_file2, (old_time, old_time))
+        def write_pdf(self, target):
+            target.write(b"%PDF-" + self.markup)
+
+    monkeypatch.setattr(export_service, "WEASYPRINT_AVAILABLE", True)
+    monkeypatch.setattr(export_service, "HTML", FakeHTML, raising=False)
+
+    buffer, extension = await export_service.export_to_pdf_buffer(
+        sample_content_items, title="Spooled Report"
+    )
+
+    assert extension == "pdf"
+    pdf = buffer.read()
+    assert pdf.startswith(b"%PDF-")
+    assert b"Spooled Report" in pdf
+    assert b"Total Items:</strong> 3" in pdf
+    # The intermediate HTML file is removed
+    assert not os.path.exists(sources[0])
+
+
+@pytest.mark.asyncio
+async def test_cleanup_old_exports(exports_dir, make_aged_file):
+    """Test cleanup of old export files."""
+    # Create test export files older than 1 hour (2 hours ago)
+    old_file1 = make_aged_file(exports_dir / "old_export.docx", age_hours=2)
+    old_file2 = make_aged_file(exports_dir / "old_export.pdf", age_hours=2)
 
     # Create recent file
-    recent_file = tmp_path / "recent_export.docx"
-    recent_file.touch()
+    recent_file = make_aged_file(exports_dir / "recent_export.docx")
+
+    # Old files that aren't exports are left alone
+    old_other = make_aged_file(exports_dir / "notes.txt", age_hours=2)
+    (exports_dir / "templates").mkdir(exist_ok=True)
+    old_dir = exports_dir / "archive.pdf"
+    old_dir.mkdir()
+    old_time = time.time() - (2 * 3600)
+    os.utime(old_dir, (old_time, old_time))
 
     # Run cleanup (max age 1 hour)
     deleted_count = await export_service.cleanup_old_exports(max_age_hours=1)
@@ -218,22 +415,123 @@ async def test_cleanup_old_exports(tmp_path, monkeypatch):
     assert not old_file1.exists()
     assert not old_file2.exists()
     assert recent_file.exists()
+    assert old_other.exists()
+    assert old_dir.is_dir()
 
 
 @pytest.mark.asyncio
-async def test_export_type_counts(sample_content_items, tmp_path, monkeypatch):
-    """Test that export includes correct content type counts."""
-    monkeypatch.setattr("app.services.export_service.settings.EXPORTS_PATH", str(tmp_path))
+async def test_export_to_docx_from_iterator(sample_content_items):
+    """Test that a one-pass iterator produces the same summary as a list."""
+    file_path = await export_service.export_to_docx(
+        content_items=iter(sample_content_items),
+        title="Streamed Export"
+    )
+
+    paragraphs = [p.text for p in Document(file_path).paragraphs]
+    total_index = paragraphs.index("Total Items: 3")
+    by_type_index = paragraphs.index("Content by Type:")
+
+    # Summary precedes the per-type bullets, which precede the items
+    assert total_index < by_type_index
+    assert paragraphs[by_type_index + 1:by_type_index + 4] == [
+        "  • Blog: 1", "  • Podcast: 1", "  • Video: 1"
+    ]
+    assert paragraphs.index("Content Items") > by_type_index + 3
+
+
+def test_export_libraries_imported_lazily():
+    """Test that starting the app doesn't import python-docx or WeasyPrint."""
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys, app.main; "
+            "print('docx' in sys.modules, 'weasyprint' in sys.modules)"
+        )],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_weasyprint_missing_falls_back(monkeypatch):
+    """Test that a failed WeasyPrint import disables PDF rendering."""
+    import builtins
+
+    real_import = builtins.__import__
+
+    def failing_import(name, *args, **kwargs):
+        if name == "weasyprint":
+            raise OSError("cannot load library 'pango-1.0-0'")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(export_service, "WEASYPRINT_AVAILABLE", True)
+    monkeypatch.setattr(export_service, "HTML", None)
+    monkeypatch.setattr(builtins, "__import__", failing_import)
 
+    assert export_service._load_weasyprint() is False
+    assert export_service.WEASYPRINT_AVAILABLE is False
+
+
+@pytest.mark.asyncio
+async def test_export_written_atomically(sample_content_items, exports_dir, monkeypatch):
+    """Test that a failed render leaves the previous export intact and no temp file."""
     file_path = await export_service.export_to_docx(
-        content_items=sample_content_items,
-        title="Type Counts Test"
+        sample_content_items, title="Atomic", export_id="atomic-export"
     )
+    original = Path(file_path).read_bytes()
+
+    def failing_save(*args):
+        args[-1].write(b"partial")
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(export_service, "_save_docx", failing_save)
+    with pytest.raises(RuntimeError):
+        await export_service.export_to_docx(
+            sample_content_items, title="Atomic", export_id="atomic-export"
+        )
+
+    assert Path(file_path).read_bytes() == original
+    assert not list(Path(exports_dir).glob("atomic-export.docx.*"))
+
+
+@pytest.mark.asyncio
+async def test_export_recreates_removed_dir(sample_content_items, tmp_path, monkeypatch):
+    """Test that the exports directory is created once and recreated if removed."""
+    import shutil
+    from app import config
+
+    exports = tmp_path / "exports"
+    monkeypatch.setattr(export_service.settings, "EXPORTS_PATH", exports)
+
+    first = await export_service.export_to_docx(sample_content_items, export_id="first")
+    assert os.path.exists(first)
+
+    # str and Path spellings share the memoized entry: no second mkdir
+    def fail_makedirs(*args, **kwargs):
+        raise AssertionError("directory created again")
+
+    with monkeypatch.context() as mp:
+        mp.setattr(config.os, "makedirs", fail_makedirs)
+        assert export_service._get_export_path("again", "docx") == str(exports / "again.docx")
+        assert config.ensure_dir(str(exports)) == str(exports)
+
+    shutil.rmtree(exports)
+    second = await export_service.export_to_docx(sample_content_items, export_id="second")
+
+    assert second == str(exports / "second.docx")
+    assert os.path.exists(second)
+
 
-    doc = Document(file_path)
-    text_content = "\n".join([p.text for p in doc.paragraphs])
+def test_export_cache_key_is_order_independent():
+    """Test that cache keys ignore field order but track values and generation."""
+    request = {"format": "docx", "title": "Report", "start_date": date(2024, 1, 1), "tags": ["a"]}
+    reordered = dict(reversed(list(request.items())))
 
-    # Should show counts by type
-    assert "Blog: 1" in text_content or "blog: 1" in text_content.lower()
-    assert "Video: 1" in text_content or "video: 1" in text_content.lower()
-    assert "Podcast: 1" in text_content or "podcast: 1" in text_content.lower()
+    key = export_service.export_cache_key(request, 1)
+    assert export_service.export_cache_key(reordered, 1) == key
+    assert export_service.export_cache_key(request, 2) != key
+    assert export_service.export_cache_key({**request, "tags": ["b"]}, 1) != key
@@ -1,5 +1,10 @@
 """Tests for main application endpoints."""
 
+import asyncio
+import sqlite3
+import threading
+
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -24,3 +29,58 @@ def test_health_check(client: TestClient):
     assert data["status"] == "healthy"
     assert "database" in data
     assert "content_library" in data
+
+
+@pytest.mark.asyncio
+async def test_periodic_optimize_survives_failures(monkeypatch):
+    """Test that a failed optimize run is logged off the loop and retried."""
+    from app import main
+
+    calls = []
+
+    def flaky_optimize():
+        calls.append(threading.current_thread())
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(main, "OPTIMIZE_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(main, "optimize_databases", flaky_optimize)
+
+    task = asyncio.create_task(main._periodic_optimize())
+    while len(calls) < 2:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert threading.current_thread() not in calls
+
+
+@pytest.mark.asyncio
+async def test_periodic_export_cleanup_survives_failures(monkeypatch, caplog):
+    """Test that a failed export sweep is logged and the schedule continues."""
+    from app import main
+    from app.services import export_service
+
+    calls = []
+
+    async def flaky_cleanup(max_age_hours):
+        calls.append(max_age_hours)
+        if len(calls) == 1:
+            raise OSError("permission denied")
+        return 2
+
+    monkeypatch.setattr(main.settings, "EXPORT_CLEANUP_HOURS", 0)
+    monkeypatch.setattr(export_service, "cleanup_old_exports", flaky_cleanup)
+
+    with caplog.at_level("INFO", logger="app.main"):
+        task = asyncio.create_task(main._periodic_export_cleanup())
+        while len(calls) < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert "Periodic export cleanup failed" in caplog.text
+    assert "Removed 2 expired export files" in caplog.text
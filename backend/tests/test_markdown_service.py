@@ -15,6 +15,8 @@ from app.services.markdown_service import (
     write_content_file,
     create_content_item,
     get_content_item,
+    bulk_get_content_items,
+    bulk_create_content_items,
     update_content_item,
     delete_content_item,
 )
@@ -33,6 +35,7 @@ def temp_content_dir(tmp_path):
 def mock_settings(temp_content_dir, monkeypatch):
     """Mock settings to use temporary directory."""
     monkeypatch.setattr("app.services.markdown_service.settings.CONTENT_LIBRARY_PATH", temp_content_dir)
+    monkeypatch.setattr("app.services.markdown_service.settings.DURABLE_WRITES", False)
 
 
 @pytest.mark.asyncio
@@ -141,6 +144,34 @@ async def test_delete_content(mock_settings):
     assert retrieved is None
 
 
+@pytest.mark.asyncio
+async def test_get_content_uses_indexed_file_path(mock_settings, monkeypatch):
+    """Test that lookups use the index and fall back to scanning directories."""
+    from app.services import markdown_service, search_service
+
+    created = await create_content_item(ContentCreate(
+        title="Indexed Lookup",
+        content_type="video",
+        body="Body"
+    ))
+    assert search_service.get_file_path(created.id) == created.file_path
+
+    # Indexed items don't probe the content type directories
+    original_path_for = markdown_service._get_content_file_path
+    monkeypatch.setattr(
+        markdown_service, "_get_content_file_path",
+        lambda *args: pytest.fail("content directories probed")
+    )
+    found = await get_content_item(created.id)
+    assert found.file_path == created.file_path
+    monkeypatch.setattr(markdown_service, "_get_content_file_path", original_path_for)
+
+    # Items missing from the index are still found on disk
+    search_service.remove_from_index(created.id)
+    assert search_service.get_file_path(created.id) is None
+    assert (await get_content_item(created.id)).title == "Indexed Lookup"
+
+
 @pytest.mark.asyncio
 async def test_delete_nonexistent_content(mock_settings):
     """Test deleting content that doesn't exist."""
@@ -155,6 +186,157 @@ async def test_get_nonexistent_content(mock_settings):
     assert retrieved is None
 
 
+@pytest.mark.asyncio
+async def test_bulk_get_content_items(mock_settings):
+    """Test that bulk lookups return items in request order."""
+    first = await create_content_item(ContentCreate(title="First", content_type="blog"))
+    second = await create_content_item(ContentCreate(title="Second", content_type="video"))
+
+    items = await bulk_get_content_items([second.id, "nonexistent-id", first.id])
+
+    assert items[0].title == "Second"
+    assert items[1] is None
+    assert items[2].title == "First"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_content_items(mock_settings):
+    """Test that bulk creates write every file and index them in order."""
+    from app.services import search_service
+
+    created = await bulk_create_content_items([
+        ContentCreate(title=f"Bulk {i}", content_type="blog", body=f"Body {i}")
+        for i in range(5)
+    ])
+
+    assert [item.title for item in created] == [f"Bulk {i}" for i in range(5)]
+    assert all(os.path.exists(item.file_path) for item in created)
+    assert search_service.get_file_path(created[3].id) == created[3].file_path
+    assert (await get_content_item(created[0].id)).body == "Body 0"
+
+
+@pytest.mark.asyncio
+async def test_content_writes_run_off_event_loop(mock_settings, monkeypatch):
+    """Test that create/update write files in a worker thread."""
+    import threading
+    from app.services import markdown_service
+
+    writer_threads = []
+    real_write = markdown_service.write_content_file
+
+    def recording_write(*args):
+        writer_threads.append(threading.current_thread())
+        return real_write(*args)
+
+    monkeypatch.setattr(markdown_service, "write_content_file", recording_write)
+
+    created = await create_content_item(ContentCreate(title="Threaded", content_type="blog"))
+    await update_content_item(created.id, ContentUpdate(title="Threaded again"))
+
+    assert len(writer_threads) == 2
+    assert threading.current_thread() not in writer_threads
+    assert (await get_content_item(created.id)).title == "Threaded again"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_index_off_event_loop(mock_settings, monkeypatch):
+    """Test that gathered creates all reach the index from worker threads."""
+    import asyncio
+    import threading
+    from app.services import search_service
+
+    index_threads = []
+    real_index = search_service.index_content_item
+
+    def recording_index(content):
+        index_threads.append(threading.current_thread())
+        real_index(content)
+
+    monkeypatch.setattr(search_service, "index_content_item", recording_index)
+
+    created = await asyncio.gather(*(
+        create_content_item(ContentCreate(title=f"Gathered {i}", content_type="blog"))
+        for i in range(4)
+    ))
+
+    assert len(index_threads) == 4
+    assert threading.current_thread() not in index_threads
+    assert all(search_service.get_file_path(item.id) == item.file_path for item in created)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_keep_every_change(mock_settings):
+    """Test that concurrent partial updates to one item don't overwrite each other."""
+    import asyncio
+    from app.services import markdown_service, search_service
+
+    created = await create_content_item(ContentCreate(title="Original", content_type="blog"))
+
+    await asyncio.gather(
+        update_content_item(created.id, ContentUpdate(title="Quokka title")),
+        update_content_item(created.id, ContentUpdate(status="published")),
+        update_content_item(created.id, ContentUpdate(author="Someone")),
+    )
+
+    stored = await get_content_item(created.id)
+    assert (stored.title, stored.status, stored.author) == ("Quokka title", "published", "Someone")
+    indexed, _ = search_service.search_content(query="Quokka", statuses=["published"])
+    assert created.id in {item.id for item in indexed}
+    # Locks are dropped once nothing holds them
+    assert created.id not in markdown_service._item_locks
+
+
+@pytest.mark.asyncio
+async def test_delete_during_update_stays_deleted(mock_settings, monkeypatch):
+    """Test that a delete racing an update isn't undone by the update's write."""
+    import asyncio
+    from app.services import markdown_service, search_service
+
+    created = await create_content_item(ContentCreate(title="Doomed", content_type="blog"))
+
+    # Hold the update between its read and its write until the delete has
+    # been issued
+    delete_issued = asyncio.Event()
+    real_read = markdown_service._locate_and_read
+    loop = asyncio.get_running_loop()
+
+    def slow_read(content_id):
+        found = real_read(content_id)
+        asyncio.run_coroutine_threadsafe(delete_issued.wait(), loop).result()
+        return found
+
+    monkeypatch.setattr(markdown_service, "_locate_and_read", slow_read)
+
+    async def delete_after_update_started():
+        await asyncio.sleep(0.01)
+        task = asyncio.ensure_future(delete_content_item(created.id))
+        await asyncio.sleep(0.01)
+        delete_issued.set()
+        return await task
+
+    updated, deleted = await asyncio.gather(
+        update_content_item(created.id, ContentUpdate(title="Revived")),
+        delete_after_update_started(),
+    )
+
+    assert updated.title == "Revived"
+    assert deleted is True
+    assert not os.path.exists(created.file_path)
+    assert search_service.get_file_path(created.id) is None
+
+
+def test_replace_only_write_skips_deleted_file(tmp_path):
+    """Test that a replace-only write doesn't recreate a file deleted meanwhile."""
+    file_path = tmp_path / "gone.md"
+
+    assert write_content_file(str(file_path), {'title': 'Gone'}, "Body", replace_only=True) is False
+    assert list(tmp_path.iterdir()) == []
+
+    write_content_file(str(file_path), {'title': 'Here'}, "Body")
+    assert write_content_file(str(file_path), {'title': 'Kept'}, "Body", replace_only=True) is True
+    assert read_content_file(str(file_path))['title'] == 'Kept'
+
+
 @pytest.mark.asyncio
 async def test_update_nonexistent_content(mock_settings):
     """Test updating content that doesn't exist."""
@@ -186,6 +368,260 @@ def test_read_write_content_file(tmp_path):
     assert data['body'] == "# Test Heading\n\nTest body content."
 
 
+def test_dates_stored_as_iso_strings(tmp_path):
+    """Test that dates are written quoted and always read back as strings."""
+    file_path = tmp_path / "dated.md"
+    write_content_file(str(file_path), {'publish_date': date(2024, 1, 15)}, "Body")
+    assert 'publish_date: "2024-01-15"' in file_path.read_text()
+    assert read_content_file(str(file_path))['publish_date'] == '2024-01-15'
+
+    # Unquoted (hand-edited) dates are normalized too
+    file_path.write_text("---\ncreated_date: 2024-02-01\n---\n\nBody")
+    assert read_content_file(str(file_path))['created_date'] == '2024-02-01'
+
+
+def test_frontmatter_emitter_round_trips(tmp_path):
+    """Test that hand-emitted frontmatter parses back to the same values."""
+    tricky = [
+        "yes", "Off", "null", "~", "123", "2024-01-15", "a: b", "#hash", " lead",
+        "trail ", "it's", 'quo"te', "multi\nline", "ünïcode", "emoji 🎉", "\x85",
+        "-dash", "@at", "*star", "[a]", "{b}", "http://x.com/a?b=c#d", "", "back\\slash",
+    ]
+    frontmatter = {
+        'id': 'round-trip',
+        'title': 'Plain Title',
+        'publish_date': None,
+        'tags': tricky,
+        'categories': [],
+        'custom_fields': {'client': 'Acme', 'nested': {'ids': [1, 2]}},
+        'flat_fields': {**{value: value for value in tricky}, 'score': 3, 'missing': None},
+    }
+    frontmatter.update({f'field_{i}': value for i, value in enumerate(tricky)})
+
+    file_path = str(tmp_path / "round_trip.md")
+    write_content_file(file_path, frontmatter, "Body")
+
+    data = read_content_file(file_path)
+    data.pop('body')
+    assert data == frontmatter
+
+
+@pytest.mark.parametrize("value", [
+    "Line one\nLine two \U0001f389",
+    "tab\there \U0001f389",
+    "\x00\x07\x1f",
+    "\x7f",
+    "\x85",
+    "\x9f",
+    "a\u2028b\u2029",
+    "\ufeffbom",
+    "\ufffe\uffff",
+    "\U0001d11e clef\r\n",
+])
+def test_frontmatter_round_trips_unicode_and_controls(tmp_path, value):
+    """Test that astral characters and control characters survive a write/read."""
+    from app.services.markdown_service import _dump_frontmatter
+
+    assert "\\ud8" not in _dump_frontmatter({'description': value})
+
+    file_path = str(tmp_path / "unicode.md")
+    write_content_file(file_path, {'description': value, 'tags': [value]}, "Body")
+
+    data = read_content_file(file_path)
+    assert data['description'] == value
+    assert data['tags'] == [value]
+
+
+def test_custom_fields_round_trip_unicode(tmp_path):
+    """Test that flat custom_fields with emoji values and non-ASCII keys survive a write/read."""
+    from app.services.markdown_service import _dump_frontmatter
+
+    custom_fields = {
+        'notes': "First line\nSecond line \U0001f389",
+        'catégorie': "Événements \U0001f3b6",
+        '\U0001f511 key': "tab\tvalue\x85",
+    }
+    # Written as a flat block by the emitter, not by yaml.dump
+    assert "custom_fields:\n  " in _dump_frontmatter({'custom_fields': custom_fields})
+
+    file_path = str(tmp_path / "custom.md")
+    write_content_file(file_path, {'custom_fields': custom_fields}, "Body")
+
+    assert read_content_file(file_path)['custom_fields'] == custom_fields
+
+
+@pytest.mark.asyncio
+async def test_create_content_with_emoji_description(mock_settings):
+    """Test that a multi-line emoji description can be read back after creation."""
+    created = await create_content_item(ContentCreate(
+        title="Party",
+        content_type="blog",
+        description="Line one\nLine two \U0001f389",
+    ))
+
+    retrieved = await get_content_item(created.id)
+    assert retrieved.description == "Line one\nLine two \U0001f389"
+
+
+def test_write_content_file_replaces_atomically(tmp_path, monkeypatch):
+    """Test that a failed write leaves the previous file intact."""
+    from app.services import markdown_service
+
+    file_path = tmp_path / "atomic.md"
+    write_content_file(str(file_path), {'title': 'Original'}, "Original body")
+    reference = tmp_path / "reference.md"
+    reference.write_text("x")
+    assert file_path.stat().st_mode == reference.stat().st_mode
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(markdown_service.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        write_content_file(str(file_path), {'title': 'Changed'}, "Changed body")
+
+    assert read_content_file(str(file_path))['title'] == 'Original'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["atomic.md", "reference.md"]
+
+
+@pytest.mark.parametrize("durable", [True, False])
+def test_write_content_file_fsync_follows_setting(tmp_path, monkeypatch, durable):
+    """Test that content files are fsynced only when durable writes are on."""
+    from app.services import markdown_service
+
+    synced = []
+    monkeypatch.setattr(markdown_service.settings, "DURABLE_WRITES", durable)
+    monkeypatch.setattr(markdown_service.os, "fsync", synced.append)
+
+    file_path = str(tmp_path / "synced.md")
+    write_content_file(file_path, {'title': 'Synced'}, "Body")
+
+    assert len(synced) == (1 if durable else 0)
+    assert read_content_file(file_path)['title'] == 'Synced'
+
+
+def test_write_recreates_removed_content_dir(tmp_path, monkeypatch):
+    """Test that writes still succeed after a cached content directory is removed."""
+    import shutil
+    from app import config
+    from app.services.markdown_service import _get_content_file_path
+
+    monkeypatch.setattr(config.settings, "CONTENT_LIBRARY_PATH", tmp_path)
+    write_content_file(_get_content_file_path("first", "video"), {'title': 'First'}, "Body")
+
+    shutil.rmtree(tmp_path / "video")
+    file_path = _get_content_file_path("second", "video")
+    write_content_file(file_path, {'title': 'Second'}, "Body")
+
+    assert read_content_file(file_path)['title'] == 'Second'
+
+
+def test_read_content_file_cached_per_version(tmp_path, monkeypatch):
+    """Test that unchanged files aren't re-parsed and writes are picked up."""
+    from app.services import markdown_service
+
+    file_path = str(tmp_path / "cached.md")
+    write_content_file(file_path, {
+        'title': 'First',
+        'tags': ['a'],
+        'custom_fields': {'client': 'Acme', 'owners': {'lead': 'Ann'}},
+    }, "Body")
+
+    data = read_content_file(file_path)
+    data['tags'].append('mutated')
+    data['custom_fields']['client'] = 'mutated'
+    data['custom_fields']['owners']['lead'] = 'mutated'
+
+    # A cache hit returns a fresh copy without parsing again
+    def fail_load(*args, **kwargs):
+        raise AssertionError("frontmatter parsed again")
+
+    monkeypatch.setattr(markdown_service.yaml, "load", fail_load)
+    fresh = read_content_file(file_path)
+    assert fresh['tags'] == ['a']
+    assert fresh['custom_fields'] == {'client': 'Acme', 'owners': {'lead': 'Ann'}}
+    monkeypatch.undo()
+
+    write_content_file(file_path, {'title': 'Second, longer title', 'tags': ['b']}, "Body")
+    assert read_content_file(file_path)['title'] == 'Second, longer title'
+
+
+def test_parse_cache_bounded_by_file_bytes(tmp_path, monkeypatch):
+    """Test that the parse cache keeps one entry per path within its byte budget."""
+    from app.services import markdown_service
+
+    monkeypatch.setattr(markdown_service, "_parse_cache", markdown_service.OrderedDict())
+    monkeypatch.setattr(markdown_service, "_parse_cache_bytes", 0)
+    monkeypatch.setattr(markdown_service, "PARSE_CACHE_MAX_BYTES", 2000)
+    monkeypatch.setattr(markdown_service, "PARSE_CACHE_MAX_FILE_BYTES", 800)
+
+    paths = [str(tmp_path / f"budget{i}.md") for i in range(4)]
+    for path in paths:
+        write_content_file(path, {'title': 'Budget'}, "x" * 500)
+        read_content_file(path)
+        # Rewrites replace the cached version instead of adding another
+        write_content_file(path, {'title': 'Budget again'}, "y" * 500)
+        read_content_file(path)
+
+    cache = markdown_service._parse_cache
+    assert list(cache) == paths[-3:]
+    assert markdown_service._parse_cache_bytes == sum(os.path.getsize(p) for p in paths[-3:])
+    assert markdown_service._parse_cache_bytes <= 2000
+
+    # Files over the per-file limit are read without being kept
+    big = str(tmp_path / "big.md")
+    write_content_file(big, {'title': 'Big'}, "z" * 1000)
+    assert read_content_file(big)['title'] == 'Big'
+    assert big not in cache
+
+
+def test_read_content_file_sees_same_size_rewrite(tmp_path):
+    """Test that a same-size rewrite with an unchanged mtime isn't served stale."""
+    file_path = str(tmp_path / "same_size.md")
+    write_content_file(file_path, {'title': 'AAAA'}, "Body")
+    before = os.stat(file_path)
+    assert read_content_file(file_path)['title'] == 'AAAA'
+
+    write_content_file(file_path, {'title': 'BBBB'}, "Body")
+    os.utime(file_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert os.path.getsize(file_path) == before.st_size
+
+    assert read_content_file(file_path)['title'] == 'BBBB'
+
+
+def test_read_json_frontmatter(tmp_path, monkeypatch):
+    """Test that JSON frontmatter is parsed without the YAML loader."""
+    from app.services import markdown_service
+
+    json_path = tmp_path / "json.md"
+    json_path.write_text(
+        '---\n{"title": "JSON Item", "tags": ["a", "b"], "created_date": "2024-01-15"}\n---\n\nBody',
+        encoding='utf-8'
+    )
+    flow_path = tmp_path / "flow.md"
+    flow_path.write_text('---\n{title: Flow Item}\n---\n\nBody', encoding='utf-8')
+
+    yaml_loads = []
+    real_load = markdown_service.yaml.load
+
+    def recording_load(*args, **kwargs):
+        yaml_loads.append(args[0])
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(markdown_service.yaml, "load", recording_load)
+
+    data = read_content_file(str(json_path))
+    assert data['title'] == "JSON Item"
+    assert data['tags'] == ["a", "b"]
+    assert data['created_date'] == "2024-01-15"
+    assert data['body'] == "Body"
+    assert yaml_loads == []
+
+    # Flow-style YAML that isn't strict JSON still parses
+    assert read_content_file(str(flow_path))['title'] == "Flow Item"
+    assert len(yaml_loads) == 1
+
+
 def test_read_file_without_frontmatter(tmp_path):
     """Test reading markdown file without frontmatter."""
     file_path = tmp_path / "no_frontmatter.md"
@@ -198,6 +634,20 @@ def test_read_file_without_frontmatter(tmp_path):
     assert "Just Content" in data['body']
 
 
+def test_read_frontmatter_containing_dashes(tmp_path):
+    """Test that only a delimiter line, not "---" inside a value, closes frontmatter."""
+    file_path = tmp_path / "dashes.md"
+    file_path.write_text(
+        "---\ntitle: Before --- after\ntags: [a]\n---\n\nBody with --- inside\n\n---\n\nMore",
+        encoding='utf-8'
+    )
+
+    data = read_content_file(str(file_path))
+    assert data['title'] == "Before --- after"
+    assert data['tags'] == ["a"]
+    assert data['body'] == "Body with --- inside\n\n---\n\nMore"
+
+
 @pytest.mark.asyncio
 async def test_create_content_with_client(mock_settings):
     """Test creating content with client field."""
@@ -247,3 +697,41 @@ async def test_create_content_without_client(mock_settings):
 
     created = await create_content_item(content_data)
     assert created.client is None
+
+
+@pytest.mark.asyncio
+async def test_update_reads_file_once(mock_settings, monkeypatch):
+    """Test that updating an item parses its file a single time."""
+    from app.services import markdown_service
+
+    created = await create_content_item(ContentCreate(title="Once", content_type="blog"))
+
+    reads = []
+    original_read = markdown_service.read_content_file
+
+    def counting_read(file_path):
+        reads.append(file_path)
+        return original_read(file_path)
+
+    monkeypatch.setattr(markdown_service, "read_content_file", counting_read)
+    updated = await update_content_item(created.id, ContentUpdate(title="Twice?"))
+
+    assert updated.title == "Twice?"
+    assert reads == [created.file_path]
+
+
+def test_content_dirs_created_once(tmp_path, monkeypatch):
+    """Test that content type directories are only created on first use."""
+    from app import config
+    from app.services.markdown_service import _get_content_file_path
+
+    monkeypatch.setattr(config.settings, "CONTENT_LIBRARY_PATH", tmp_path)
+    path = _get_content_file_path("abc", "blog")
+    assert (tmp_path / "blog").is_dir()
+    assert path == str(tmp_path / "blog" / "abc.md")
+
+    def fail_makedirs(*args, **kwargs):
+        raise AssertionError("directory created again")
+
+    monkeypatch.setattr(config.os, "makedirs", fail_makedirs)
+    assert _get_content_file_path("def", "blog") == str(tmp_path / "blog" / "def.md")
@@ -0,0 +1,95 @@
+"""Tests for the SQLite connection pool."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from app.db.pool import ConnectionPool, close_pool, close_pools, get_pool
+
+
+def test_reader_connections_are_reused(tmp_path):
+    """Test that released reader connections are handed out again."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=2)
+
+    conn = pool.acquire()
+    pool.release(conn)
+
+    assert pool.acquire() is conn
+    pool.close()
+
+
+def test_pool_closes_connections_beyond_size(tmp_path):
+    """Test that the pool keeps at most `size` idle connections."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=1)
+
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.acquire() is first
+    pool.close()
+
+
+def test_reader_connections_refuse_writes(tmp_path):
+    """Test that reader connections are query-only and see the writer's data."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE items (value INTEGER)")
+        conn.execute("INSERT INTO items VALUES (1)")
+        conn.commit()
+
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT value FROM items").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items VALUES (2)")
+    pool.close()
+
+
+def test_writer_is_serialized(tmp_path):
+    """Test that only one thread holds the writer connection at a time."""
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE counter (value INTEGER)")
+        conn.execute("INSERT INTO counter VALUES (0)")
+        conn.commit()
+
+    def increment():
+        for _ in range(50):
+            with pool.writer() as conn:
+                value = conn.execute("SELECT value FROM counter").fetchone()[0]
+                conn.execute("UPDATE counter SET value = ?", (value + 1,))
+                conn.commit()
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT value FROM counter").fetchone()[0] == 200
+    pool.close()
+
+
+def test_get_pool_returns_shared_instance(tmp_path):
+    """Test that pools are shared per database path."""
+    db_path = str(tmp_path / "shared.db")
+
+    assert get_pool(db_path) is get_pool(db_path)
+    close_pools()
+
+
+def test_close_pool_forgets_one_database(tmp_path):
+    """Test that closing one pool leaves the others shared."""
+    first_path = str(tmp_path / "first.db")
+    second_path = str(tmp_path / "second.db")
+    first, second = get_pool(first_path), get_pool(second_path)
+
+    close_pool(first_path)
+    close_pool(first_path)  # already closed: no-op
+
+    assert get_pool(first_path) is not first
+    assert get_pool(second_path) is second
+    close_pools()
@@ -10,17 +10,30 @@ from datetime import date
 from pathlib import Path
 
 from app.services.search_service import (
+    bulk_reindex,
+    decode_cursor,
+    encode_cursor,
+    get_db_connection,
+    index_batch,
     index_content_item,
+    iter_search_content,
     search_content,
     get_unique_values,
     remove_from_index,
+    _junction_sql,
 )
+from app.db.init_db import create_content_index_db
+from app.db.pool import close_pool
 from app.models.content import ContentResponse
 
 
 @pytest.fixture
 def temp_db(tmp_path, monkeypatch):
-    """Create temporary database for testing."""
+    """Create temporary database for testing.
+
+    The service's pooled connections for it are shared within the test and
+    closed afterwards.
+    """
     db_file = tmp_path / "test_content_index.db"
     db_url = f"sqlite:///{db_file}"
 
@@ -28,45 +41,10 @@ def temp_db(tmp_path, monkeypatch):
     monkeypatch.setattr("app.services.search_service.settings.DATABASE_URL", db_url)
 
     # Initialize database schema
-    conn = sqlite3.connect(db_file)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS content_items (
-            id TEXT PRIMARY KEY,
-            file_path TEXT UNIQUE NOT NULL,
-            title TEXT NOT NULL,
-            content_type TEXT NOT NULL,
-            status TEXT,
-            created_date DATE,
-            updated_date DATE,
-            publish_date DATE,
-            author TEXT,
-            client TEXT,
-            url TEXT,
-            description TEXT,
-            categories_json TEXT,
-            tags_json TEXT,
-            custom_fields_json TEXT,
-            body_preview TEXT,
-            last_indexed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    cursor.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
-            id UNINDEXED,
-            title,
-            description,
-            body,
-            tags
-        )
-    """)
-
-    conn.commit()
-    conn.close()
+    create_content_index_db()
 
-    return db_file
+    yield db_file
+    close_pool(str(db_file))
 
 
 def test_index_content_with_client(temp_db):
@@ -95,6 +73,93 @@ def test_index_content_with_client(temp_db):
     assert results[0].client == "ClientA"
 
 
+def test_custom_fields_stored_only_when_present(temp_db):
+    """Test that empty custom fields are stored as NULL and read back as {}."""
+    def make_item(content_id, custom_fields):
+        return ContentResponse(
+            id=content_id,
+            file_path=f"/tmp/{content_id}.md",
+            title=content_id,
+            content_type="blog",
+            status="draft",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            custom_fields=custom_fields,
+        )
+
+    index_batch([make_item("plain", {}), make_item("custom", {"channel": "email", "score": 3})])
+
+    with get_db_connection() as conn:
+        stored = dict(conn.execute("SELECT id, custom_fields_json FROM content_items").fetchall())
+    assert stored["plain"] is None
+
+    results, _ = search_content()
+    assert {item.id: item.custom_fields for item in results} == {
+        "plain": {},
+        "custom": {"channel": "email", "score": 3},
+    }
+
+
+def test_index_batch_chunks_in_power_of_two_sizes(temp_db, monkeypatch):
+    """Test that multi-row inserts reuse a few statement shapes and keep every row."""
+    from app.services import search_service
+
+    row_counts = []
+    real_sql = search_service._multi_row_sql
+
+    def recording_sql(insert_sql, row_sql, row_count, suffix_sql):
+        row_counts.append(row_count)
+        return real_sql(insert_sql, row_sql, row_count, suffix_sql)
+
+    # 15 parameters per content row -> 4 rows per full statement
+    monkeypatch.setattr(search_service, "SQLITE_MAX_PARAMS", 60)
+    monkeypatch.setattr(search_service, "_multi_row_sql", recording_sql)
+
+    index_batch(
+        ContentResponse(
+            id=f"chunk-{i}",
+            file_path=f"/tmp/chunk{i}.md",
+            title=f"Chunk {i}",
+            content_type="blog",
+            status="draft",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+        )
+        for i in range(11)
+    )
+
+    assert row_counts == [4, 4, 2, 1]
+    assert search_content(limit=50)[1] == 11
+
+
+def test_search_hits_serialize_like_content_response(temp_db):
+    """Test that search hits produce the same JSON as the API model."""
+    import orjson
+
+    content = ContentResponse(
+        id="hit-1",
+        file_path="/tmp/hit.md",
+        title="Hit",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 20),
+        publish_date=date(2024, 1, 16),
+        client="Acme",
+        tags=["a", "b"],
+        categories=["News"],
+        custom_fields={"channel": "email"},
+        body="Body",
+    )
+    index_content_item(content)
+
+    (hit,), _ = search_content()
+
+    # The index does not store bodies, so hits carry an empty one
+    expected = content.model_copy(update={"body": ""}).model_dump(mode="json")
+    assert orjson.loads(orjson.dumps(hit)) == expected
+
+
 def test_search_by_client(temp_db):
     """Test filtering content by client."""
     # Index content for different clients
@@ -143,9 +208,7 @@ def test_search_by_client(temp_db):
         body="Content without client"
     )
 
-    index_content_item(content1)
-    index_content_item(content2)
-    index_content_item(content3)
+    index_batch([content1, content2, content3])
 
     # Search for ClientA content
     results, total = search_content(client="ClientA")
@@ -169,8 +232,8 @@ def test_get_unique_clients(temp_db):
     # Index content for different clients
     clients_to_index = ["ClientA", "ClientB", "ClientA", "ClientC", None]
 
-    for i, client in enumerate(clients_to_index):
-        content = ContentResponse(
+    index_batch(
+        ContentResponse(
             id=f"test-{i}",
             file_path=f"/tmp/test{i}.md",
             title=f"Test {i}",
@@ -184,7 +247,8 @@ def test_get_unique_clients(temp_db):
             custom_fields={},
             body="Test content"
         )
-        index_content_item(content)
+        for i, client in enumerate(clients_to_index)
+    )
 
     # Get unique clients
     unique_clients = get_unique_values("client")
@@ -194,6 +258,37 @@ def test_get_unique_clients(temp_db):
     assert "ClientA" in unique_clients
     assert "ClientB" in unique_clients
     assert "ClientC" in unique_clients
+    assert unique_clients == sorted(unique_clients)
+
+
+def test_optimize_analyzes_incrementally_filled_index(temp_db, tmp_path, monkeypatch):
+    """Test that maintenance gathers stats for tables never analyzed before."""
+    from app.db.init_db import optimize_databases
+
+    monkeypatch.setattr("app.db.init_db.settings.USERS_DATABASE_URL", f"sqlite:///{tmp_path / 'users.db'}")
+    index_batch(
+        ContentResponse(
+            id=f"stats-{i}",
+            file_path=f"/tmp/stats{i}.md",
+            title=f"Stats {i}",
+            content_type="blog",
+            status="draft",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            client=f"Client{i % 2}",
+        )
+        for i in range(20)
+    )
+
+    optimize_databases()
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        stats = {row[0] for row in conn.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'content_items'")}
+    finally:
+        conn.close()
+    assert "idx_client_updated_type" in stats
+    assert get_unique_values("client") == ["Client0", "Client1"]
 
 
 def test_combined_client_and_type_filter(temp_db):
@@ -244,9 +339,7 @@ def test_combined_client_and_type_filter(temp_db):
         body="Blog content"
     )
 
-    index_content_item(content1)
-    index_content_item(content2)
-    index_content_item(content3)
+    index_batch([content1, content2, content3])
 
     # Filter by ClientA and blog type
     results, total = search_content(client="ClientA", content_types=["blog"])
@@ -287,3 +380,930 @@ def test_remove_from_index(temp_db):
     # Verify it's gone
     results, total = search_content()
     assert total == 0
+
+
+def test_remove_from_index_clears_tags_via_trigger(temp_db):
+    """Test that one DELETE removes an item's tag/category rows, even on upgraded databases."""
+    # Simulate a database created before the delete trigger covered the
+    # junction tables; initializing again must replace it
+    conn = sqlite3.connect(temp_db)
+    conn.executescript("""
+        DROP TRIGGER content_items_ad;
+        CREATE TRIGGER content_items_ad AFTER DELETE ON content_items BEGIN
+            INSERT INTO content_fts (content_fts, rowid, title, description, body, tags)
+            VALUES ('delete', old.rowid, old.title, old.description, old.body, old.tags);
+        END;
+    """)
+    conn.close()
+    create_content_index_db()
+
+    index_content_item(ContentResponse(
+        id="tagged-remove",
+        file_path="/tmp/tagged.md",
+        title="Tagged",
+        content_type="blog",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        tags=["alpha", "beta"],
+        categories=["News"],
+    ))
+
+    remove_from_index("tagged-remove")
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM content_tags").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM content_categories").fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert search_content(tags=["alpha"])[1] == 0
+
+
+def test_db_connection_applies_pragmas(temp_db):
+    """Test that search connections are opened in WAL mode with tuned PRAGMAs."""
+    with get_db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    # The connection went back to the pool instead of being closed
+    with get_db_connection() as again:
+        assert again is conn
+
+
+def test_index_batch_spans_multiple_statements(temp_db):
+    """Test batch indexing more rows than fit in a single multi-row INSERT."""
+    items = [
+        ContentResponse(
+            id=f"batch-{i}",
+            file_path=f"/tmp/batch{i}.md",
+            title=f"Batch Item {i}",
+            content_type="blog" if i % 2 else "video",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            tags=["batch"],
+            body="Batch body"
+        )
+        for i in range(150)
+    ]
+
+    assert index_batch(items) == 150
+
+    results, total = search_content(limit=200)
+    assert total == 150
+
+    results, total = search_content(query="Batch", content_types=["video"])
+    assert total == 75
+
+
+def test_index_batch_accepts_generator(temp_db):
+    """Test that a one-shot iterable is indexed with its tags and categories."""
+    items = (
+        ContentResponse(
+            id=f"gen-{i}",
+            file_path=f"/tmp/gen{i}.md",
+            title=f"Generated {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            categories=["Streamed"],
+            tags=["gen", f"gen-{i}"],
+            body="Body"
+        )
+        for i in range(3)
+    )
+
+    assert index_batch(items) == 3
+
+    results, total = search_content(tags=["gen"])
+    assert total == 3
+    assert all(item.categories == ["Streamed"] for item in results)
+
+
+def test_bulk_reindex_replaces_index(temp_db):
+    """Test bulk reindex clears old rows and leaves secondary indexes in place."""
+    def make_item(item_id):
+        return ContentResponse(
+            id=item_id,
+            file_path=f"/tmp/{item_id}.md",
+            title=f"Item {item_id}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            body="Body"
+        )
+
+    index_content_item(make_item("stale"))
+
+    assert bulk_reindex([make_item("fresh-1"), make_item("fresh-2")]) == 2
+
+    results, total = search_content()
+    assert total == 2
+    assert {item.id for item in results} == {"fresh-1", "fresh-2"}
+
+    # The full-text index was rebuilt from the new rows only
+    assert search_content(query="stale")[1] == 0
+    assert search_content(query="fresh")[1] == 2
+
+    # Sync triggers are back, so later writes still reach content_fts
+    index_content_item(make_item("later"))
+    assert search_content(query="later")[1] == 1
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        index_names = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'content_items'"
+        )}
+        conn.execute("INSERT INTO content_fts (content_fts) VALUES ('integrity-check')")
+    finally:
+        conn.close()
+    assert {"idx_updated", "idx_content_type_updated", "idx_status_updated", "idx_client_updated_type"} <= index_names
+    assert not {"idx_content_type", "idx_status", "idx_client", "idx_client_updated"} & index_names
+
+
+def test_short_page_skips_count_query(temp_db):
+    """Test that a page shorter than the limit supplies the total itself."""
+    for i in range(3):
+        index_content_item(ContentResponse(
+            id=f"short-{i}",
+            file_path=f"/tmp/short{i}.md",
+            title=f"Short {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            body="Body"
+        ))
+
+    statements = []
+    with get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        results, total = search_content(limit=10)
+        assert (len(results), total) == (3, 3)
+        assert not any("COUNT(*)" in sql for sql in statements)
+
+        # Past the end there's no page to infer from, so it is counted
+        results, total = search_content(statuses=["published"], limit=10, offset=5)
+        assert (results, total) == ([], 3)
+        assert any("COUNT(*)" in sql for sql in statements)
+    finally:
+        with get_db_connection() as conn:
+            conn.set_trace_callback(None)
+
+
+def test_unfiltered_count_has_no_where_clause(temp_db):
+    """Test that the unfiltered total is a bare COUNT(*) and still correct."""
+    from app.services.search_service import _projection, _search_params
+
+    for i in range(4):
+        index_content_item(ContentResponse(
+            id=f"count-{i}",
+            file_path=f"/tmp/count{i}.md",
+            title=f"Count {i}",
+            content_type="blog",
+            status="draft" if i else "published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            body="Body"
+        ))
+
+    select_columns = _projection(None)[2]
+    (count_sql, _, _), _ = _search_params(None, None, None, None, None, None, None, select_columns)
+    assert count_sql == "SELECT COUNT(*) FROM content_items"
+
+    # Full pages need the COUNT query
+    assert search_content(limit=2)[1] == 4
+    assert search_content(statuses=["draft"], limit=2)[1] == 3
+
+
+def test_search_sql_shared_across_values():
+    """Test that searches differing only in values bind into the same statements."""
+    from app.services.search_service import _projection, _search_params
+
+    select_columns = _projection(None)[2]
+    first_sql, first_params = _search_params(
+        "Test", ["blog"], None, None, "Acme", None, None, select_columns
+    )
+    second_sql, second_params = _search_params(
+        "Other words", ["video"], None, None, "Globex", None, None, select_columns
+    )
+
+    assert first_sql == second_sql
+    assert first_params != second_params
+    # The MATCH text is a bound parameter, never spliced into the SQL
+    assert not any("Test" in sql for sql in first_sql)
+
+
+def test_listing_pages_walk_updated_index(temp_db):
+    """Test that listing pages read the (updated_date, id) indexes instead of sorting."""
+    from app.services.search_service import _projection, _search_params
+
+    select_columns = _projection(None)[2]
+    conn = sqlite3.connect(temp_db)
+    try:
+        for statuses, client, index_name in (
+            (None, None, "idx_updated"),
+            (["draft"], None, "idx_status_updated"),
+            (None, "Acme", "idx_client_updated_type"),
+        ):
+            (_, page_sql, keyset_sql), params = _search_params(
+                None, None, statuses, None, client, None, None, select_columns
+            )
+            for sql, extra in ((page_sql, [50, 0]), (keyset_sql, ["2024-01-01", "x", 50])):
+                plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params + extra))
+                assert index_name in plan
+                assert "TEMP B-TREE" not in plan
+    finally:
+        conn.close()
+
+
+def test_client_and_type_filter_checked_from_index(temp_db):
+    """Test that a client + content type filter is answered from one index."""
+    from app.services.search_service import _projection, _search_params
+
+    select_columns = _projection(None)[2]
+    (count_sql, page_sql, _), params = _search_params(
+        None, ["blog"], None, None, "Acme", None, None, select_columns
+    )
+    conn = sqlite3.connect(temp_db)
+    try:
+        count_plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {count_sql}", params))
+        page_plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {page_sql}", params + [50, 0]))
+    finally:
+        conn.close()
+    assert "COVERING INDEX idx_client_updated_type" in count_plan
+    assert "idx_client_updated_type" in page_plan
+    assert "TEMP B-TREE" not in page_plan
+
+
+def test_result_dates_parsed_once_per_value(temp_db):
+    """Test that rows sharing a date string share one parsed date object."""
+    for i in range(3):
+        index_content_item(ContentResponse(
+            id=f"dated-{i}",
+            file_path=f"/tmp/dated{i}.md",
+            title=f"Dated {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 2, i + 1),
+            publish_date=date(2024, 3, 1) if i else None,
+            body="Body"
+        ))
+
+    results, _ = search_content()
+    assert [item.updated_date for item in results] == [date(2024, 2, 3), date(2024, 2, 2), date(2024, 2, 1)]
+    assert [item.publish_date for item in results] == [date(2024, 3, 1), date(2024, 3, 1), None]
+    assert results[0].created_date is results[1].created_date is results[2].created_date
+
+
+def test_keyset_pagination(temp_db):
+    """Test walking results with a keyset cursor matches offset pagination."""
+    for i in range(5):
+        index_content_item(ContentResponse(
+            id=f"page-{i}",
+            file_path=f"/tmp/page{i}.md",
+            title=f"Page {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 10),
+            updated_date=date(2024, 1, 10 + i // 2),
+            body="Body"
+        ))
+
+    first_page, total = search_content(limit=2)
+    assert total == 5
+
+    second_page, total = search_content(limit=2, cursor=decode_cursor(encode_cursor(first_page[-1])))
+    offset_page, _ = search_content(limit=2, offset=2)
+
+    assert total == 5
+    assert [item.id for item in second_page] == [item.id for item in offset_page]
+
+
+def test_decode_cursor_rejects_malformed_values():
+    """Test that malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor("2024-13-40,some-id")
+
+
+def test_count_cache_invalidated_on_write(temp_db):
+    """Test that cached totals are refreshed after indexing new content."""
+    _, total = search_content(content_types=["blog"])
+    assert total == 0
+
+    index_content_item(ContentResponse(
+        id="count-1",
+        file_path="/tmp/count1.md",
+        title="Counted",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        body="Body"
+    ))
+
+    _, total = search_content(content_types=["blog"])
+    assert total == 1
+
+
+def test_tags_filter_and_order_from_junction_table(temp_db):
+    """Test tag filtering and that tags/categories keep their original order."""
+    index_content_item(ContentResponse(
+        id="tagged",
+        file_path="/tmp/tagged.md",
+        title="Tagged",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        tags=["zeta", "alpha", "mid"],
+        categories=["Second", "First"],
+        body="Body"
+    ))
+    index_content_item(ContentResponse(
+        id="untagged",
+        file_path="/tmp/untagged.md",
+        title="Untagged",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        body="Body"
+    ))
+
+    results, total = search_content(tags=["alpha", "missing"])
+    assert total == 1
+    assert results[0].tags == ["zeta", "alpha", "mid"]
+    assert results[0].categories == ["Second", "First"]
+
+
+def test_tags_filter_probes_tag_index(temp_db):
+    """Test that the tag filter is an uncorrelated list subquery, counted once per item."""
+    from app.services.search_service import _projection, _search_params
+
+    index_content_item(ContentResponse(
+        id="both-tags",
+        file_path="/tmp/both-tags.md",
+        title="Both",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        tags=["one", "two"],
+        body="Body"
+    ))
+    assert search_content(tags=["one", "two"])[1] == 1
+
+    (count_sql, _, _), params = _search_params(
+        None, None, None, ["one", "two"], None, None, None, _projection(None)[2]
+    )
+    conn = sqlite3.connect(temp_db)
+    try:
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {count_sql}", params))
+    finally:
+        conn.close()
+    assert "LIST SUBQUERY" in plan
+    assert "CORRELATED" not in plan
+
+
+def test_junction_tables_backfilled_from_json(temp_db):
+    """Test that existing rows get tag/category rows when the schema is initialized."""
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("""
+            INSERT INTO content_items (id, file_path, title, content_type, status,
+                created_date, updated_date, categories_json, tags_json)
+            VALUES ('legacy', '/tmp/legacy.md', 'Legacy', 'blog', 'draft',
+                '2024-01-15', '2024-01-15', '["Old"]', '["one", "two"]')
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+    create_content_index_db()
+
+    results, total = search_content(tags=["two"])
+    assert total == 1
+    assert results[0].tags == ["one", "two"]
+    assert results[0].categories == ["Old"]
+
+
+def test_malformed_row_skipped_with_warning(temp_db, caplog):
+    """Test that an unparseable index row is logged and left out of results."""
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("""
+            INSERT INTO content_items (id, file_path, title, content_type, status,
+                created_date, updated_date, custom_fields_json)
+            VALUES ('broken', '/tmp/broken.md', 'Broken', 'blog', 'draft',
+                '2024-01-15', '2024-01-15', 'not json')
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+    with caplog.at_level("WARNING", logger="app.services.search_service"):
+        results, total = search_content()
+
+    assert results == [] and total == 1
+    assert "Error parsing row broken" in caplog.text
+
+
+def test_null_status_defaults_to_draft(temp_db):
+    """Test that a row with a NULL status is returned as a draft."""
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("""
+            INSERT INTO content_items (id, file_path, title, content_type, status,
+                created_date, updated_date)
+            VALUES ('no-status', '/tmp/no-status.md', 'No Status', 'blog', NULL,
+                '2024-01-15', '2024-01-15')
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+    results, total = search_content()
+
+    assert total == 1
+    assert results[0].id == "no-status"
+    assert results[0].status == "draft"
+
+
+def test_tags_and_categories_not_duplicated_as_json(temp_db):
+    """Test that indexing stores tags/categories only in the junction tables."""
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("""
+            INSERT INTO content_items (id, file_path, title, content_type, status,
+                created_date, updated_date, categories_json, tags_json)
+            VALUES ('dup', '/tmp/dup.md', 'Dup', 'blog', 'draft',
+                '2024-01-15', '2024-01-15', '["Old"]', '["old"]')
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+    for item_id in ("dup", "new"):
+        index_content_item(ContentResponse(
+            id=item_id,
+            file_path=f"/tmp/{item_id}.md",
+            title="Stored once",
+            content_type="blog",
+            status="draft",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            categories=["Fresh"],
+            tags=["alpha", "beta"],
+            body="Body"
+        ))
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM content_items WHERE tags_json IS NOT NULL OR categories_json IS NOT NULL"
+        ).fetchone()[0] == 0
+    finally:
+        conn.close()
+
+    results, _ = search_content(query="beta")
+    assert {item.id for item in results} == {"dup", "new"}
+    assert all(item.tags == ["alpha", "beta"] and item.categories == ["Fresh"] for item in results)
+
+
+def test_fts_follows_content_updates(temp_db):
+    """Test that trigger-maintained FTS reflects updates and removals."""
+    content = ContentResponse(
+        id="fts-1",
+        file_path="/tmp/fts1.md",
+        title="Original Headline",
+        content_type="blog",
+        status="draft",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        body="Zebra crossing"
+    )
+    index_content_item(content)
+
+    content.title = "Revised Headline"
+    content.body = "Giraffe crossing"
+    index_content_item(content)
+
+    assert search_content(query="Original")[1] == 0
+    assert search_content(query="Zebra")[1] == 0
+    assert search_content(query="Giraffe")[1] == 1
+
+    remove_from_index("fts-1")
+    assert search_content(query="Giraffe")[1] == 0
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("INSERT INTO content_fts (content_fts) VALUES ('integrity-check')")
+    finally:
+        conn.close()
+
+
+def test_standalone_fts_table_is_migrated(tmp_path, monkeypatch):
+    """Test that a database with the old standalone FTS table is upgraded in place."""
+    db_file = tmp_path / "legacy_index.db"
+    monkeypatch.setattr("app.services.search_service.settings.DATABASE_URL", f"sqlite:///{db_file}")
+
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE content_items (
+            id TEXT PRIMARY KEY, file_path TEXT UNIQUE NOT NULL, title TEXT NOT NULL,
+            content_type TEXT NOT NULL, status TEXT, created_date DATE, updated_date DATE,
+            publish_date DATE, author TEXT, client TEXT, url TEXT, description TEXT,
+            categories_json TEXT, tags_json TEXT, custom_fields_json TEXT, body_preview TEXT,
+            last_indexed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE VIRTUAL TABLE content_fts USING fts5(id UNINDEXED, title, description, body, tags);
+        INSERT INTO content_items (id, file_path, title, content_type, status, created_date,
+            updated_date, tags_json)
+        VALUES ('old-1', '/tmp/old.md', 'Old Title', 'blog', 'draft', '2024-01-15', '2024-01-15',
+            '["legacy"]');
+        INSERT INTO content_fts (id, title, description, body, tags)
+        VALUES ('old-1', 'Old Title', '', 'Platypus notes', 'legacy');
+    """)
+    conn.commit()
+    conn.close()
+
+    create_content_index_db()
+
+    results, total = search_content(query="Platypus")
+    assert total == 1
+    assert results[0].id == "old-1"
+    assert search_content(query="legacy")[1] == 1
+
+    # The unused preview column is dropped; body text is stored once
+    with get_db_connection() as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(content_items)")}
+    assert "body_preview" not in columns
+    assert "body" in columns
+
+
+@pytest.mark.parametrize("field", ["content_type", "status", "author", "client"])
+def test_unique_values_read_from_index(temp_db, field):
+    """Test that every filter dropdown is answered from an index."""
+    with get_db_connection() as conn:
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT DISTINCT {field} FROM content_items"
+            f" WHERE {field} IS NOT NULL ORDER BY {field}"
+        ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "COVERING INDEX" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_client_migration_copies_custom_field(tmp_path, monkeypatch):
+    """Test that adding the client column backfills it from custom fields."""
+    db_file = tmp_path / "pre_client.db"
+    monkeypatch.setattr("app.services.search_service.settings.DATABASE_URL", f"sqlite:///{db_file}")
+
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE content_items (
+            id TEXT PRIMARY KEY, file_path TEXT UNIQUE NOT NULL, title TEXT NOT NULL,
+            content_type TEXT NOT NULL, status TEXT, created_date DATE, updated_date DATE,
+            publish_date DATE, author TEXT, url TEXT, description TEXT,
+            categories_json TEXT, tags_json TEXT, custom_fields_json TEXT, body_preview TEXT,
+            last_indexed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO content_items (id, file_path, title, content_type, custom_fields_json)
+        VALUES ('c-1', '/tmp/c1.md', 'One', 'blog', '{"client": "Acme"}'),
+               ('c-2', '/tmp/c2.md', 'Two', 'blog', '{"client": 7}'),
+               ('c-3', '/tmp/c3.md', 'Three', 'blog', NULL);
+    """)
+    conn.commit()
+    conn.close()
+
+    from app.db.migrate_add_client import migrate_add_client_column
+    migrate_add_client_column()
+
+    conn = sqlite3.connect(db_file)
+    clients = dict(conn.execute("SELECT id, client FROM content_items").fetchall())
+    conn.close()
+    assert clients == {"c-1": "Acme", "c-2": None, "c-3": None}
+
+
+def test_in_filters_padded_to_shared_shape(temp_db):
+    """Test that padded IN lists still match exactly the requested values."""
+    for i, content_type in enumerate(["blog", "video", "podcast"]):
+        index_content_item(ContentResponse(
+            id=f"shape-{i}",
+            file_path=f"/tmp/shape{i}.md",
+            title=f"Shape {i}",
+            content_type=content_type,
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            body="Body"
+        ))
+
+    # Three values are padded to four slots with NULLs
+    _, total = search_content(content_types=["blog", "video", "podcast"])
+    assert total == 3
+
+    _, total = search_content(content_types=["blog", "video", "social"])
+    assert total == 2
+
+
+def test_junction_lookups_share_padded_statements(temp_db):
+    """Test that tag/category lookups reuse padded statements per page size."""
+    for i in range(5):
+        index_content_item(ContentResponse(
+            id=f"junction-{i}",
+            file_path=f"/tmp/junction{i}.md",
+            title=f"Junction {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            categories=[f"cat-{i}"],
+            tags=[f"tag-{i}", "shared"],
+            body="Body"
+        ))
+
+    _junction_sql.cache_clear()
+    for limit in (5, 6, 7, 8):
+        results, _ = search_content(limit=limit)
+        assert {tuple(item.tags) for item in results} == {(f"tag-{i}", "shared") for i in range(5)}
+        assert {tuple(item.categories) for item in results} == {(f"cat-{i}",) for i in range(5)}
+
+    # Five rows pad to eight slots: one statement per junction table
+    assert _junction_sql.cache_info().currsize == 2
+
+
+def test_search_projects_requested_columns(temp_db):
+    """Test that unselected fields are skipped and keep their defaults."""
+    index_content_item(ContentResponse(
+        id="custom-1",
+        file_path="/tmp/custom1.md",
+        title="Custom",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        author="Alice",
+        tags=["seo"],
+        categories=["Marketing"],
+        custom_fields={"campaign": "spring", "priority": 2},
+        body="Body"
+    ))
+
+    results, _ = search_content()
+    assert results[0].custom_fields == {"campaign": "spring", "priority": 2}
+    assert results[0].author == "Alice"
+
+    results, total = search_content(columns=["title", "tags"])
+    assert total == 1
+    assert results[0].title == "Custom"
+    assert results[0].tags == ["seo"]
+    assert results[0].author is None
+    assert results[0].categories == []
+    assert results[0].custom_fields == {}
+
+
+def test_unique_values_cached_until_write(temp_db):
+    """Test that filter values are cached and refreshed after indexing."""
+    def make_item(item_id, author):
+        return ContentResponse(
+            id=item_id,
+            file_path=f"/tmp/{item_id}.md",
+            title=f"Item {item_id}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            author=author,
+            body="Body"
+        )
+
+    index_content_item(make_item("author-1", "Alice"))
+    assert get_unique_values("author") == ["Alice"]
+
+    # A raw write bypasses invalidation, so the cached values are served
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("UPDATE content_items SET author = 'Carol'")
+        conn.commit()
+    finally:
+        conn.close()
+    assert get_unique_values("author") == ["Alice"]
+
+    index_content_item(make_item("author-2", "Bob"))
+    assert get_unique_values("author") == ["Bob", "Carol"]
+
+
+def test_iter_search_content_streams_in_chunks(temp_db):
+    """Test that streamed results match search order across chunks."""
+    index_batch([
+        ContentResponse(
+            id=f"stream-{i:02d}",
+            file_path=f"/tmp/stream{i}.md",
+            title=f"Stream {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 1 + i),
+            tags=[f"tag{i}"],
+            body="Body"
+        )
+        for i in range(7)
+    ])
+
+    expected, _ = search_content(limit=5)
+    streamed = list(iter_search_content(limit=5, chunk_size=2))
+    assert [item.id for item in streamed] == [item.id for item in expected]
+    assert streamed[0].tags == ["tag6"]
+
+    # Closing early still returns the connection to the pool
+    items = iter_search_content(chunk_size=2)
+    next(items)
+    items.close()
+    assert search_content()[1] == 7
+
+
+def test_equivalent_filters_share_count_cache(temp_db):
+    """Test that filter order and duplicates don't create new cache entries."""
+    from app.services import search_service
+
+    for i, content_type in enumerate(["blog", "video"]):
+        index_content_item(ContentResponse(
+            id=f"norm-{i}",
+            file_path=f"/tmp/norm{i}.md",
+            title=f"Norm {i}",
+            content_type=content_type,
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            body="Body"
+        ))
+
+    assert search_content(content_types=["video", "blog"])[1] == 2
+    cached = len(search_service._count_cache)
+    assert search_content(content_types=["blog", "video", "blog"])[1] == 2
+    assert len(search_service._count_cache) == cached
+
+
+def test_iter_search_reuses_recent_search_ids(temp_db):
+    """Test that exports re-read a recent complete search by ID."""
+    for i in range(3):
+        index_content_item(ContentResponse(
+            id=f"recent-{i}",
+            file_path=f"/tmp/recent{i}.md",
+            title=f"Recent {i}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 1 + i),
+            body="Body"
+        ))
+
+    results, total = search_content(content_types=["blog"], limit=10)
+    assert total == 3
+
+    # A raw write bypasses invalidation: the cached IDs are still used, but
+    # the rows themselves are read fresh
+    conn = sqlite3.connect(temp_db)
+    try:
+        conn.execute("UPDATE content_items SET content_type = 'video', title = 'Moved' WHERE id = 'recent-0'")
+        conn.commit()
+    finally:
+        conn.close()
+
+    streamed = list(iter_search_content(content_types=["blog"], limit=10))
+    assert [item.id for item in streamed] == [item.id for item in results]
+    assert streamed[-1].title == "Moved"
+
+    # Indexing through the service drops the cached IDs
+    index_content_item(ContentResponse(
+        id="recent-3",
+        file_path="/tmp/recent3.md",
+        title="Recent 3",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        body="Body"
+    ))
+    streamed = list(iter_search_content(content_types=["blog"], limit=10))
+    assert [item.id for item in streamed] == ["recent-3", "recent-2", "recent-1"]
+
+
+def test_query_with_tags_narrows_fts_match(temp_db):
+    """Test that tag filters are pushed into MATCH without loosening exactness."""
+    from app.services import search_service
+
+    for item_id, tags in (("exact", ["web"]), ("partial", ["web-design"]), ("other", ["misc"])):
+        index_content_item(ContentResponse(
+            id=item_id,
+            file_path=f"/tmp/{item_id}.md",
+            title=f"Guide {item_id}",
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 15),
+            updated_date=date(2024, 1, 15),
+            tags=tags,
+            body="Python body"
+        ))
+
+    assert search_service._match_expression("python", ["web"]) == '(python) AND tags : ("web")'
+    # Tags the tokenizer can't express leave the query unchanged
+    assert search_service._match_expression("python", ["web", "++"]) == "python"
+
+    # "web-design" tokenizes to "web design" and passes the FTS narrowing;
+    # the junction table still requires an exact tag
+    results, total = search_content(query="python", tags=["web"])
+    assert total == 1
+    assert [item.id for item in results] == ["exact"]
+
+    results, total = search_content(query="python", tags=["web-design", "misc"])
+    assert total == 2
+    assert {item.id for item in results} == {"partial", "other"}
+
+
+def test_ranked_search_orders_by_relevance(temp_db):
+    """Test that ranked searches put the best bm25 match first."""
+    for item_id, updated, title, body in (
+        ("passing", date(2024, 3, 1), "Weekly notes", "One mention of sourdough among much else " * 20),
+        ("focused", date(2024, 1, 1), "Sourdough sourdough", "Sourdough starter and sourdough loaves"),
+        ("unrelated", date(2024, 2, 1), "Other", "Nothing relevant"),
+    ):
+        index_content_item(ContentResponse(
+            id=item_id,
+            file_path=f"/tmp/{item_id}.md",
+            title=title,
+            content_type="blog",
+            status="published",
+            created_date=date(2024, 1, 1),
+            updated_date=updated,
+            body=body
+        ))
+
+    # Default order is most recently updated; ranked order is by relevance
+    results, total = search_content(query="sourdough")
+    assert [item.id for item in results] == ["passing", "focused"]
+    results, ranked_total = search_content(query="sourdough", ranked=True, content_types=["blog"])
+    assert [item.id for item in results] == ["focused", "passing"]
+    assert ranked_total == total == 2
+
+
+def test_query_syntax_is_searched_literally(temp_db):
+    """Test that FTS5 operators and punctuation in queries don't raise."""
+    index_content_item(ContentResponse(
+        id="syntax",
+        file_path="/tmp/syntax.md",
+        title="C++ and pre-release notes",
+        content_type="blog",
+        status="published",
+        created_date=date(2024, 1, 15),
+        updated_date=date(2024, 1, 15),
+        body="Body"
+    ))
+
+    for query in ['c++', 'pre-release', 'AND', 'notes"', 'rel*', 'NOT c++']:
+        search_content(query=query)
+
+    assert search_content(query="c++ notes")[1] == 1
+    assert search_content(query="pre-release")[1] == 1
+    assert search_content(query="AND")[1] == 1
+    assert search_content(query="releas*")[1] == 1
+    assert search_content(query='notes"')[1] == 1
+    assert search_content(query="   ")[1] == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rebuild_index_from_files(temp_db, tmp_path, monkeypatch, workers):
+    """Test rebuilding from markdown files, in-process and across worker processes."""
+    from app.services import search_service
+    from app.services.markdown_service import write_content_file
+
+    library = tmp_path / "library"
+    for i in range(3):
+        write_content_file(str(library / "blog" / f"item-{i}.md"), {
+            'id': f"file-{i}",
+            'title': f"File {i}",
+            'content_type': "blog",
+            'status': "draft",
+            'created_date': "2024-01-15",
+            'updated_date': "2024-01-15",
+            'tags': ["rebuilt"],
+        }, "Rebuilt body")
+    (library / "blog" / "broken.md").write_text("---\ntitle: [unclosed\n---\n")
+
+    monkeypatch.setattr(search_service.settings, "CONTENT_LIBRARY_PATH", library)
+    monkeypatch.setattr(search_service.settings, "INDEX_PARSE_WORKERS", workers)
+    monkeypatch.setattr(search_service, "PARALLEL_PARSE_MIN_FILES", 1)
+
+    assert search_service.rebuild_index_from_files() == 3
+    results, total = search_content(tags=["rebuilt"])
+    assert total == 3
+    assert {item.id for item in results} == {"file-0", "file-1", "file-2"}
@@ -13,7 +13,13 @@ export function ContentList() {
   const [content, setContent] = useState<ContentItem[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
-  const [pagination, setPagination] = useState({ page: 1, per_page: 50, total: 0, pages: 0 })
+  const [pagination, setPagination] = useState({
+    page: 1,
+    per_page: 50,
+    total: 0,
+    pages: 0,
+    next_cursor: null as string | null,
+  })
 
   useEffect(() => {
     async function fetchContent() {
@@ -23,17 +29,18 @@ export function ContentList() {
         // Build filter object from search params
         const filters: any = {}
         searchParams.forEach((value, key) => {
-          if (key !== "page" && key !== "per_page") {
+          if (key !== "page" && key !== "per_page" && key !== "cursor") {
             filters[key] = value
           }
         })
 
         const page = parseInt(searchParams.get("page") || "1")
         const per_page = parseInt(searchParams.get("per_page") || "50")
+        const cursor = searchParams.get("cursor")
 
-        const data = await api.content.list(filters, page, per_page)
+        const data = await api.content.list(filters, page, per_page, cursor)
         setContent(data.items || [])
-        setPagination(data.pagination || { page: 1, per_page: 50, total: 0, pages: 0 })
+        setPagination(data.pagination || { page: 1, per_page: 50, total: 0, pages: 0, next_cursor: null })
         setError(null)
       } catch (err) {
         console.error("Failed to fetch content:", err)
@@ -153,6 +160,7 @@ export function ContentList() {
               disabled={pagination.page <= 1}
               onClick={() => {
                 const params = new URLSearchParams(searchParams.toString())
+                params.delete("cursor")
                 params.set("page", String(pagination.page - 1))
                 window.location.href = `/content?${params.toString()}`
               }}
@@ -165,6 +173,10 @@ export function ContentList() {
               disabled={pagination.page >= pagination.pages}
               onClick={() => {
                 const params = new URLSearchParams(searchParams.toString())
+                // Seek past the last row shown rather than skipping an OFFSET
+                if (pagination.next_cursor) {
+                  params.set("cursor", pagination.next_cursor)
+                }
                 params.set("page", String(pagination.page + 1))
                 window.location.href = `/content?${params.toString()}`
               }}
@@ -34,6 +34,9 @@ export function FilterPanel() {
     } else {
       params.delete(key)
     }
+    // New filters start again from the first page
+    params.delete("page")
+    params.delete("cursor")
     router.push(`/content?${params.toString()}`)
   }
 
@@ -42,7 +45,7 @@ export function FilterPanel() {
   }
 
   const activeFilters = Array.from(searchParams.entries()).filter(
-    ([key]) => key !== "page" && key !== "per_page"
+    ([key]) => key !== "page" && key !== "per_page" && key !== "cursor"
   )
 
   return (
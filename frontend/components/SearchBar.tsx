@@ -19,6 +19,9 @@ export function SearchBar() {
     } else {
       params.delete("q")
     }
+    // A new search starts again from the first page
+    params.delete("page")
+    params.delete("cursor")
 
     router.push(`/content?${params.toString()}`)
   }
@@ -27,6 +30,8 @@ export function SearchBar() {
     setQuery("")
     const params = new URLSearchParams(searchParams.toString())
     params.delete("q")
+    params.delete("page")
+    params.delete("cursor")
     router.push(`/content?${params.toString()}`)
   }
 
@@ -42,10 +42,14 @@ export const api = {
 
   // Content endpoints
   content: {
-    list: async (filters?: any, page = 1, perPage = 50) => {
+    list: async (filters?: any, page = 1, perPage = 50, cursor?: string | null) => {
       const queryParams = new URLSearchParams()
       queryParams.set("page", page.toString())
       queryParams.set("per_page", perPage.toString())
+      // Keyset cursor from the previous page; the backend seeks to it instead of using OFFSET
+      if (cursor) {
+        queryParams.set("cursor", cursor)
+      }
 
       // Add all filter parameters
       if (filters) {
@@ -63,6 +67,7 @@ export const api = {
           per_page: number
           total: number
           pages: number
+          next_cursor: string | null
         }
       }>(`/content?${queryParams}`)
     },